@@ -1,6 +1,6 @@
 import logging
+import time
 from datetime import timedelta
-from numbers import Number
 from typing import Final, Any
 
 import voluptuous as vol
@@ -13,9 +13,10 @@ from homeassistant.const import (
     CONF_PASSWORD,
     CONF_MODE,
     EVENT_HOMEASSISTANT_STARTED,
+    EVENT_HOMEASSISTANT_STOP,
     Platform, EntityCategory
 )
-from homeassistant.core import HomeAssistant, CoreState
+from homeassistant.core import HomeAssistant, CoreState, callback
 from homeassistant.exceptions import ConfigEntryNotReady
 from homeassistant.helpers import entity_registry, device_registry as device_reg
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
@@ -23,7 +24,6 @@ from homeassistant.helpers.entity import EntityDescription
 from homeassistant.helpers.event import async_track_time_interval, async_call_later
 from homeassistant.helpers.typing import UNDEFINED
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
-from smllib.sml import ObisCode
 
 from .const import (
     DOMAIN,
@@ -43,9 +43,24 @@ from .const import (
     DATA_KEY,
     METRICS_KEY,
 
+    SENSOR_TYPES,
+    PUBLISH_FILTER_CLASSES,
+    PUBLISH_FILTER_OPTIONS,
+    CONF_NOTIFY_INTERVAL,
+    CONF_NOTIFY_LEADING_EDGE,
+    CONF_NOTIFY_TRAILING_EDGE,
+    DEFAULT_NOTIFY_INTERVAL,
+    DEFAULT_NOTIFY_LEADING_EDGE,
+    DEFAULT_NOTIFY_TRAILING_EDGE,
+    CONF_MAX_CONCURRENT_REQUESTS,
+
     UNKNOWN_SERIAL
 )
+from .capability_profile import BridgeCapabilityProfile, BridgeCapabilityProfileStore
 from .entity import CustomFriendlyNameEntity
+from .snapshot_store import MeterSnapshotStore, SNAPSHOT_SAVE_INTERVAL, build_snapshot_data, restore_snapshot_data
+from .obis_codes import intern_obis_code
+from .sensor_accessors import SENSOR_ACCESSORS, METRICS_SENSOR_KEYS
 from .tibber_client import TibberLocalBridge
 
 _LOGGER = logging.getLogger(__name__)
@@ -54,12 +69,28 @@ CONFIG_SCHEMA = vol.Schema({DOMAIN: vol.Schema({})}, extra=vol.ALLOW_EXTRA)
 PLATFORMS: Final = [Platform.SENSOR]
 WEBSOCKET_WATCHDOG_INTERVAL: Final = timedelta(seconds=64)
 MASKED_KEYS: Final = ("host", "password")
+_NOT_PUBLISHED: Final = object()
+# the capability profile is written (at the latest) this many seconds after the setup - so the frame interval
+# and the parse strategy of this run are included
+PROFILE_SAVE_DELAY: Final = 300
 
 def mask_map(d: dict) -> dict:
     # returns a copy - so we will never modify the data of the config_entry itself
     return {k: mask_map(v) if isinstance(v, dict) else ("<MASKED>" if k.lower() in MASKED_KEYS else v)
             for k, v in d.items()}
 
+def get_publish_filters(options: dict) -> dict[str, tuple]:
+    # sensor key -> (deadband_abs, deadband_rel [as fraction], min_publish_interval, max_publish_interval)
+    filters = {}
+    for a_desc in SENSOR_TYPES:
+        a_class = PUBLISH_FILTER_CLASSES.get(a_desc.device_class)
+        if a_class is not None:
+            values = [float(options.get(f"{a_class}_{an_option}", 0) or 0) for an_option in PUBLISH_FILTER_OPTIONS]
+            if any(values):
+                values[1] = values[1] / 100
+                filters[a_desc.key] = tuple(values)
+    return filters
+
 async def async_migrate_entry(hass: HomeAssistant, config_entry: ConfigEntry):
     if config_entry.version < CONFIG_VERSION:
         if config_entry.data is not None and len(config_entry.data) > 0:
@@ -123,6 +154,8 @@ async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry):
         raise ConfigEntryNotReady
     else:
         hass.data[DOMAIN][config_entry.entry_id] = coordinator
+        # the polling will be scheduled, when the sensors are added
+        coordinator.apply_poll_phase()
         await hass.config_entries.async_forward_entry_setups(config_entry, PLATFORMS)
 
         if use_websocket:
@@ -132,6 +165,11 @@ async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry):
             else:
                 hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STARTED, coordinator.start_watchdog)
 
+        coordinator.start_publish_heartbeat()
+        coordinator.bridge.start_metrics_refresher()
+        coordinator.start_background_init(use_websocket)
+        coordinator.start_snapshot_saver()
+
         config_entry.async_on_unload(config_entry.add_update_listener(entry_update_listener))
         return True
 
@@ -141,11 +179,19 @@ async def async_unload_entry(hass: HomeAssistant, config_entry: ConfigEntry):
     if unload_ok:
         if DOMAIN in hass.data and config_entry.entry_id in hass.data[DOMAIN]:
             coordinator = hass.data[DOMAIN][config_entry.entry_id]
+            coordinator.bridge.stop_metrics_refresher()
+            await coordinator.async_save_profile()
+            await coordinator.async_save_snapshot()
             await coordinator.bridge.ws_close_and_prepare_to_terminate()
             coordinator.stop_watchdog()
+            coordinator.bridge._request_scheduler.release(config_entry.entry_id)
             hass.data[DOMAIN].pop(config_entry.entry_id)
     return unload_ok
 
+async def async_remove_entry(hass: HomeAssistant, config_entry: ConfigEntry):
+    await BridgeCapabilityProfileStore(hass, config_entry.entry_id).async_remove()
+    await MeterSnapshotStore(hass, config_entry.entry_id).async_remove()
+
 async def entry_update_listener(hass: HomeAssistant, config_entry: ConfigEntry) -> None:
     _LOGGER.debug(f"entry_update_listener(): called for entry: {config_entry.entry_id}")
     await hass.config_entries.async_reload(config_entry.entry_id)
@@ -173,8 +219,16 @@ class TibberLocalDataUpdateCoordinator(DataUpdateCoordinator):
 
             self.bridge = TibberLocalBridge(host=self._host, pwd=the_pwd, websession=async_get_clientsession(hass),
                                             node_num=self.node_num, com_mode=com_mode,
-                                            options={"ignore_parse_errors": ignore_parse_errors},
+                                            options={"ignore_parse_errors": ignore_parse_errors,
+                                                     CONF_NOTIFY_INTERVAL: config_entry.options.get(CONF_NOTIFY_INTERVAL, DEFAULT_NOTIFY_INTERVAL),
+                                                     CONF_NOTIFY_LEADING_EDGE: config_entry.options.get(CONF_NOTIFY_LEADING_EDGE, DEFAULT_NOTIFY_LEADING_EDGE),
+                                                     CONF_NOTIFY_TRAILING_EDGE: config_entry.options.get(CONF_NOTIFY_TRAILING_EDGE, DEFAULT_NOTIFY_TRAILING_EDGE)},
                                             coordinator=self)
+            # the (shared) scheduler of the bridge is released, when the entry is unloaded - and only an explicitly
+            # configured limit is applied to it
+            self.bridge._request_scheduler.add_entry(config_entry.entry_id)
+            if CONF_MAX_CONCURRENT_REQUESTS in config_entry.options:
+                self.bridge._request_scheduler.set_limit(config_entry.entry_id, config_entry.options[CONF_MAX_CONCURRENT_REQUESTS])
 
             self.name = config_entry.title
             self._config_entry = config_entry
@@ -187,7 +241,35 @@ class TibberLocalDataUpdateCoordinator(DataUpdateCoordinator):
             self._device_info_model_raw = None
             self._update_device_registry_is_running = False
 
-            super().__init__(hass, _LOGGER, name=DOMAIN, update_interval=timedelta(seconds=config_entry.data.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)))
+            # sensor key -> the value the listeners of the key have been called with
+            self._published_values: dict[str, Any] = {}
+            self._published_update_success = None
+            self._published_metrics = None
+            self._state_write_counter = 0
+            self._skipped_state_write_counter = 0
+
+            # deadband & min/max publish interval per sensor class (from the options flow)
+            self._publish_filters = get_publish_filters(config_entry.options)
+            self._published_times: dict[str, float] = {}
+            self._filtered_state_write_counter = 0
+            self._heartbeat_state_write_counter = 0
+
+            # what has been discovered about the bridge in a previous run (see 'init_on_load()')
+            self._profile_store = BridgeCapabilityProfileStore(hass, config_entry.entry_id)
+            self._profile: BridgeCapabilityProfile | None = None
+            self._profile_loaded = False
+            self._background_init_task = None
+
+            # the last reading of the bridge - restored, so the sensors have their values right after the start
+            self._snapshot_store = MeterSnapshotStore(hass, config_entry.entry_id)
+
+            # the polls are moved into the slot of the entry (see 'apply_poll_phase()')
+            self._poll_interval = timedelta(seconds=config_entry.data.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL))
+
+            # the bridge keeps its '_obis_values' when a duplicate payload has been received - so with
+            # 'always_update=False' the listeners will only be called, when there is really new data
+            super().__init__(hass, _LOGGER, name=DOMAIN, update_interval=self._poll_interval,
+                             always_update=False)
 
     async def call_later_update_device_registry(self, now:Any):
         if not self._update_device_registry_is_running:
@@ -282,6 +364,20 @@ class TibberLocalDataUpdateCoordinator(DataUpdateCoordinator):
                     async_call_later(self.hass, 5, self.call_later_update_device_registry)
 
     async def init_on_load(self, use_websocket: bool = False):
+        # with the last snapshot (and the profile) of a previous run, we do not have to wait for the bridge - the
+        # first reading and the check of the profile will be done in the background (see 'start_background_init()')
+        await self._async_restore_snapshot()
+        profile = await self._async_load_profile(use_websocket)
+        if profile is not None:
+            self._profile_loaded = True
+            self.bridge.node_device_id = profile.device_id
+            self.bridge.ws_supported = profile.ws_supported
+            self.bridge.frame_interval = profile.frame_interval
+            if profile.parse_strategy is not None:
+                self.bridge._parse_strategy_selector.prefer(profile.parse_strategy)
+            _LOGGER.info(f"init_on_load(): using stored profile - device_id: {profile.device_id} for node: {self.node_num} with {len(profile.obis_codes)} OBIS codes")
+            return True
+
         if use_websocket:
             try:
                 await self.bridge.get_eui_for_node()
@@ -303,11 +399,159 @@ class TibberLocalDataUpdateCoordinator(DataUpdateCoordinator):
 
         # was the init successful ?!
         if use_websocket:
-            return self.bridge.node_device_id is not None
+            init_succeeded = self.bridge.node_device_id is not None
         else:
-            return len(bridge_data.keys()) > 0
+            init_succeeded = len(bridge_data.keys()) > 0
+        if init_succeeded:
+            self._profile_store.async_delay_save(self._build_profile, PROFILE_SAVE_DELAY)
+        return init_succeeded
+
+    async def _async_load_profile(self, use_websocket: bool) -> BridgeCapabilityProfile | None:
+        try:
+            stored = await self._profile_store.async_load()
+        except BaseException as exception:
+            _LOGGER.warning(f"_async_load_profile(): caused {type(exception).__name__} - {exception}")
+            stored = None
+
+        profile = BridgeCapabilityProfile.from_dict(stored) if stored else None
+        if profile is None:
+            return None
+        # the profile of another host/node (e.g. after the reconfiguration) or a profile without the information
+        # the setup requires, will be discovered again
+        if profile.host != self._host or profile.node_num != self.node_num or len(profile.obis_codes) == 0 or \
+                (use_websocket and profile.device_id is None):
+            _LOGGER.debug(f"_async_load_profile(): stored profile is not usable: {profile}")
+            return None
+        self._profile = profile
+        return profile
+
+    def _build_profile(self) -> dict:
+        profile = self._profile if self._profile is not None else BridgeCapabilityProfile(host=self._host, node_num=self.node_num)
+        if self.bridge.node_device_id is not None:
+            profile.device_id = self.bridge.node_device_id
+        profile.com_mode = self.bridge._com_mode
+        profile.ws_supported = self.bridge.ws_supported
+        if self._use_websocket_in_config:
+            # the only firmware hint we have: the websocket endpoint is missing in older bridge firmware versions
+            profile.firmware_hints = {"ws_endpoint_missing": not self.bridge.ws_supported}
+        if len(self.bridge._obis_values) > 0:
+            # like the CONF_OBIS_CODES in the config entry, the OBIS codes will only grow
+            profile.obis_codes = sorted(set(profile.obis_codes) | {str(a_code) for a_code in self.bridge._obis_values.keys()})
+        profile.parse_strategy = self.bridge._parse_strategy_selector.get_preferred()
+        if self.bridge.frame_interval is not None:
+            profile.frame_interval = round(self.bridge.frame_interval, 3)
+        self._profile = profile
+        return profile.as_dict()
+
+    async def async_save_profile(self):
+        if self._profile is not None or len(self.bridge._obis_values) > 0:
+            try:
+                await self._profile_store.async_save(self._build_profile())
+            except BaseException as exception:
+                _LOGGER.warning(f"async_save_profile(): caused {type(exception).__name__} - {exception}")
+
+    def get_profile_obis_codes(self) -> list[str]:
+        return list(self._profile.obis_codes) if self._profile is not None else []
+
+    async def _async_restore_snapshot(self):
+        try:
+            stored = await self._snapshot_store.async_load()
+            age = restore_snapshot_data(self.bridge, stored) if stored else None
+            if age is not None:
+                self.data = {
+                    DATA_KEY: self.bridge._obis_values,
+                    METRICS_KEY: self.bridge._metrics_data,
+                }
+                _LOGGER.info(f"_async_restore_snapshot(): restored {len(self.bridge._obis_values)} OBIS values from {int(age)} sec ago")
+        except BaseException as exception:
+            _LOGGER.warning(f"_async_restore_snapshot(): caused {type(exception).__name__} - {exception}")
+
+    async def async_save_snapshot(self):
+        data = build_snapshot_data(self.bridge)
+        if data is not None:
+            try:
+                await self._snapshot_store.async_save(data)
+            except BaseException as exception:
+                _LOGGER.warning(f"async_save_snapshot(): caused {type(exception).__name__} - {exception}")
+
+    def start_snapshot_saver(self):
+        async def _async_save_snapshot(*_):
+            await self.async_save_snapshot()
+        self._config_entry.async_on_unload(async_track_time_interval(self.hass, _async_save_snapshot, timedelta(seconds=SNAPSHOT_SAVE_INTERVAL)))
+        self._config_entry.async_on_unload(self.hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _async_save_snapshot))
+
+    def start_background_init(self, use_websocket: bool):
+        if self._background_init_task is None or self._background_init_task.done():
+            self._background_init_task = self._config_entry.async_create_background_task(
+                self.hass, self._async_background_init(use_websocket), "background_init")
+
+    async def _async_background_init(self, use_websocket: bool):
+        # the first reading of the bridge (when the setup has been done with a restored snapshot or the profile)
+        if not self.bridge.has_live_data:
+            try:
+                await self.bridge.update()
+                if self.bridge.has_live_data:
+                    self.async_set_updated_data({
+                        DATA_KEY: self.bridge._obis_values,
+                        METRICS_KEY: self.bridge._metrics_data,
+                    })
+            except BaseException as exception:
+                _LOGGER.warning(f"_async_background_init(): first read caused {type(exception).__name__} - {exception}")
+
+        if self._profile_loaded:
+            await self._async_verify_profile(use_websocket)
+
+    async def _async_verify_profile(self, use_websocket: bool):
+        profile_device_id = self._profile.device_id
+        profile_obis_codes = set(self._profile.obis_codes)
+        profile_ws_supported = self._profile.ws_supported
+        if use_websocket:
+            try:
+                await self.bridge.get_eui_for_node()
+            except BaseException as exception:
+                _LOGGER.warning(f"_async_verify_profile(): caused {type(exception).__name__} - {exception}")
+
+        if self.bridge.node_device_id != profile_device_id:
+            _LOGGER.info(f"_async_verify_profile(): device_id changed from {profile_device_id} to {self.bridge.node_device_id}")
+            # the websocket messages must be routed by the new device_id (the shared connection is kept)
+            self.bridge.ws_update_route()
+
+        if use_websocket and not profile_ws_supported:
+            # the bridge firmware might have been updated in the meantime - so the websocket will be tried again
+            self.bridge.ws_supported = True
+            if self._watchdog is None and self.hass.state is CoreState.running:
+                await self.start_watchdog()
+
+        new_obis_codes = set(self.bridge._obis_values.keys()) - profile_obis_codes
+        if len(new_obis_codes) > 0:
+            # there are no sensors for the new codes yet - so the entry must be reloaded (with the updated profile)
+            _LOGGER.info(f"_async_verify_profile(): bridge reports new OBIS codes: {sorted(new_obis_codes)} - reloading")
+            await self.async_save_profile()
+            self.hass.config_entries.async_schedule_reload(self._config_entry.entry_id)
+        else:
+            self._profile_store.async_delay_save(self._build_profile, PROFILE_SAVE_DELAY)
+
+    def apply_poll_phase(self):
+        # the entries of the same bridge should not poll at the same time - so each entry gets its own slot
+        self._apply_next_poll_delay()
+
+    def _apply_next_poll_delay(self):
+        scheduler = self.bridge._request_scheduler
+        # only the entries that are really polling get a slot (a websocket entry polls, when the bridge firmware
+        # does not support the websocket)
+        if not self._use_websocket_in_config or not self.bridge.ws_supported:
+            scheduler.register_poller(self._config_entry.entry_id, int(self._poll_interval.total_seconds()))
+        else:
+            scheduler.remove_poller(self._config_entry.entry_id)
+
+        delay = scheduler.get_next_poll_delay(self._config_entry.entry_id)
+        update_interval = timedelta(seconds=delay) if delay > 0 else self._poll_interval
+        if self.update_interval != update_interval:
+            _LOGGER.debug(f"_apply_next_poll_delay(): next poll in {update_interval.total_seconds()} sec")
+            self.update_interval = update_interval
 
     async def _async_update_data(self):
+        self._apply_next_poll_delay()
         try:
             if self.bridge.ws_connected:
                 _LOGGER.debug("_async_update_data(): called (but websocket is active - no data will be requested!)")
@@ -343,35 +587,96 @@ class TibberLocalDataUpdateCoordinator(DataUpdateCoordinator):
             _LOGGER.warning(f"_async_update_data(): UpdateFailed unexpected: {type(other).__name__} - {other}")
             raise UpdateFailed() from other
 
-    def _get_numeric_value_internal(self, key, divisor: int = 1) -> float|int:
-        if isinstance(key, list):
-            val = None
-            for a_key in key:
-                if val is None:
-                    val = self._get_numeric_value_internal(a_key, divisor)
-            return val
+    @callback
+    def async_update_listeners(self) -> None:
+        # the sensors are registered with their key as context - so only the sensors whose value has changed will
+        # be called (and write their state) - when the availability changes, all listeners will be called
+        notify_all = self.data is None or self._published_update_success != self.last_update_success
+        self._published_update_success = self.last_update_success
+        now = time.monotonic()
+
+        # the metrics object is replaced with every fetch - as long as it is the same, the metrics sensors are unchanged
+        metrics = self.data.get(METRICS_KEY) if self.data is not None else None
+        metrics_unchanged = not notify_all and metrics is self._published_metrics
+        self._published_metrics = metrics
+
+        changed_keys = {}
+        for update_callback, key in list(self._listeners.values()):
+            changed = changed_keys.get(key)
+            if changed is None:
+                accessor = SENSOR_ACCESSORS.get(key) if key is not None else None
+                if metrics_unchanged and key in METRICS_SENSOR_KEYS and key in self._published_values:
+                    changed = False
+                elif accessor is None or self.data is None:
+                    self._published_values.pop(key, None)
+                    changed = True
+                else:
+                    value = accessor(self.data)
+                    prev_value = self._published_values.get(key, _NOT_PUBLISHED)
+                    changed = notify_all or prev_value is _NOT_PUBLISHED or type(prev_value) is not type(value) or prev_value != value
+                    a_filter = self._publish_filters.get(key)
+                    if a_filter is not None:
+                        if not notify_all and prev_value is not _NOT_PUBLISHED:
+                            changed = self._check_publish_filter(a_filter, now - self._published_times.get(key, 0), prev_value, value, changed)
+                        if changed:
+                            self._published_times[key] = now
+                    if changed:
+                        self._published_values[key] = value
+                changed_keys[key] = changed
+
+            if changed:
+                self._state_write_counter = self._state_write_counter + 1
+                update_callback()
+            else:
+                self._skipped_state_write_counter = self._skipped_state_write_counter + 1
+
+    def _check_publish_filter(self, a_filter: tuple, elapsed: float, prev_value, value, changed: bool) -> bool:
+        deadband_abs, deadband_rel, min_interval, max_interval = a_filter
+        if max_interval > 0 and elapsed >= max_interval:
+            # heartbeat - even if the value has not changed
+            self._heartbeat_state_write_counter = self._heartbeat_state_write_counter + 1
+            return True
+        if not changed:
+            return False
+
+        if min_interval > 0 and elapsed < min_interval:
+            self._filtered_state_write_counter = self._filtered_state_write_counter + 1
+            return False
+
+        if type(prev_value) in (int, float) and type(value) in (int, float):
+            if abs(value - prev_value) <= max(deadband_abs, abs(prev_value) * deadband_rel):
+                self._filtered_state_write_counter = self._filtered_state_write_counter + 1
+                return False
+        return True
 
+    def start_publish_heartbeat(self):
+        # when the meter is quiet (or the bridge sends only duplicates), there will be no update that could trigger
+        # the heartbeat of the sensors with a 'max_publish_interval' - so we check them also via a timer
+        max_intervals = [a_filter[3] for a_filter in self._publish_filters.values() if a_filter[3] > 0]
+        if len(max_intervals) > 0:
+            interval = timedelta(seconds=max(1.0, min(max_intervals) / 2))
+            _LOGGER.debug(f"start_publish_heartbeat(): checking the heartbeat of {len(max_intervals)} sensors every {interval}")
+            self._config_entry.async_on_unload(async_track_time_interval(self.hass, self._async_publish_heartbeat, interval))
+
+    @callback
+    def _async_publish_heartbeat(self, *_):
         if self.data is not None:
-            obis_values = self.data.get(DATA_KEY, {})
-            if key in obis_values:
-                a_obis_obj = obis_values.get(key)
-                if isinstance(a_obis_obj.value, Number):
-                    if hasattr(a_obis_obj, 'scaler'):
-                        try:
-                            return a_obis_obj.value * 10 ** int(a_obis_obj.scaler) / divisor
-                        except (TypeError, ValueError):
-                            _LOGGER.info(f"_get_numeric_value_internal(): could not convert scaler to int for key {key} - {a_obis_obj}")
-                            return None
-                    else:
-                        return a_obis_obj.value / divisor
+            self.async_update_listeners()
 
-        return None
+    def get_diagnostics(self) -> dict:
+        return {
+            "state_writes": self._state_write_counter,
+            "skipped_state_writes": self._skipped_state_write_counter,
+            "filtered_state_writes": self._filtered_state_write_counter,
+            "heartbeat_state_writes": self._heartbeat_state_write_counter,
+            "publish_filters": {a_key: list(a_filter) for a_key, a_filter in self._publish_filters.items()},
+        }
 
     def _get_string_internal(self, key) -> str:
         if self.data is not None:
-            obis_values = self.data.get(DATA_KEY, {})
-            if key in obis_values:
-                return obis_values.get(key).value
+            obis_values = self.data.get(DATA_KEY)
+            if obis_values is not None:
+                return obis_values.get_value(key)
 
         return None
 
@@ -404,295 +709,34 @@ class TibberLocalDataUpdateCoordinator(DataUpdateCoordinator):
 
     @property
     def serial(self) -> str:  # XYZ-123a4567
-        if self.attr010060320101 is not None:
-            if self.attr0100605a0201 is not None:
-                return f"{self.attr010060320101}-{self.attr0100605a0201}"
-            elif self.attr0100600100ff is not None:
-                return f"{self.attr010060320101}-{self.attr0100600100ff}"
+        server_id = self._get_string_internal('010060320101')
+        device_id = self._get_string_internal('0100600100ff')
+        property_number = self._get_string_internal('0100605a0201')
+        if server_id is not None:
+            if property_number is not None:
+                return f"{server_id}-{property_number}"
+            elif device_id is not None:
+                return f"{server_id}-{device_id}"
             else:
-                return f"{self.attr010060320101}"
+                return f"{server_id}"
 
-        elif self.attr0100600100ff is not None:
-            return f"{self.attr0100600100ff}"
-        elif self.attr0100605a0201 is not None:
-            return f"{self.attr0100605a0201}"
+        elif device_id is not None:
+            return f"{device_id}"
+        elif property_number is not None:
+            return f"{property_number}"
         else:
             return UNKNOWN_SERIAL
 
-    @property
-    def attrnode_battery_voltage(self):
-        if self.data is not None:
-            obj = self.data.get(METRICS_KEY, {}).get("node_status", {})
-            if len(obj) > 0:
-                return obj.get("battery_voltage",  obj.get("node_battery_voltage", None))
-
-    @property
-    def attrnode_temperature(self):
-        if self.data is not None:
-            obj = self.data.get(METRICS_KEY, {}).get("node_status", {})
-            if len(obj) > 0:
-                return obj.get("temperature",  obj.get("node_temperature", None))
-
-    @property
-    def attrnode_avg_rssi(self):
-        if self.data is not None:
-            obj = self.data.get(METRICS_KEY, {}).get("node_status", {})
-            if len(obj) > 0:
-                return obj.get("avg_rssi",  obj.get("node_avg_rssi", None))
-
-    @property
-    def attrnode_avg_lqi(self):
-        if self.data is not None:
-            obj = self.data.get(METRICS_KEY, {}).get("node_status", {})
-            if len(obj) > 0:
-                return obj.get("avg_lqi", obj.get("node_avg_lqi", None))
-
-    @property
-    def attrnode_radio_tx_power(self):
-        if self.data is not None:
-            return self.data.get(METRICS_KEY, {}).get("node_status", {}).get("radio_tx_power", None)
-
-    @property
-    def attrnode_uptime_ms(self):
-        if self.data is not None:
-            return self.data.get(METRICS_KEY, {}).get("node_status", {}).get("node_uptime_ms", None)
-
-    @property
-    def attrnode_meter_msg_count_sent(self):
-        if self.data is not None:
-            return self.data.get(METRICS_KEY, {}).get("node_status", {}).get("meter_msg_count_sent", None)
-
-    @property
-    def attrnode_meter_pkg_count_sent(self):
-        if self.data is not None:
-            return self.data.get(METRICS_KEY, {}).get("node_status", {}).get("meter_pkg_count_sent", None)
-
-    @property
-    def attrnode_time_in_em0_ms(self):
-        if self.data is not None:
-            return self.data.get(METRICS_KEY, {}).get("node_status", {}).get("time_in_em0_ms", None)
-
-    @property
-    def attrnode_time_in_em1_ms(self):
-        if self.data is not None:
-            return self.data.get(METRICS_KEY, {}).get("node_status", {}).get("time_in_em1_ms", None)
-
-    @property
-    def attrnode_time_in_em2_ms(self):
-        if self.data is not None:
-            return self.data.get(METRICS_KEY, {}).get("node_status", {}).get("time_in_em2_ms", None)
-
-    @property
-    def attrnode_acmp_rx_autolevel_9600(self):
-        if self.data is not None:
-            return self.data.get(METRICS_KEY, {}).get("node_status", {}).get("acmp_rx_autolevel_9600", None)
-
-    @property
-    def attrnode_invalid_meter_readings_count(self):
-        if self.data is not None:
-            return self.data.get(METRICS_KEY, {}).get("node_status", {}).get("invalid_meter_readings_count", None)
-
-    @property
-    def attrhub_meter_pkg_count_recv(self):
-        if self.data is not None:
-            return self.data.get(METRICS_KEY, {}).get("hub_attachments", {}).get("meter_pkg_count_recv", None)
-
-    @property
-    def attrhub_meter_reading_count_recv(self):
-        if self.data is not None:
-            return self.data.get(METRICS_KEY, {}).get("hub_attachments", {}).get("meter_reading_count_recv", None)
-
-    @property
-    def attrhub_meter_corrupt_reading_count_recv(self):
-        if self.data is not None:
-            return self.data.get(METRICS_KEY, {}).get("hub_attachments", {}).get("meter_corrupt_reading_count_recv", None)
-
-    @property
-    def attrhub_compression_error_readings_count(self):
-        if self.data is not None:
-            return self.data.get(METRICS_KEY, {}).get("hub_attachments", {}).get("compression_error_readings_count", None)
-
-    @property
-    def attr010060320101(self) -> str:  # XYZ
-        return self._get_string_internal('010060320101')
-
-    @property
-    def attr0100600100ff(self) -> str:  # 0a123b4c567890d12e34
-        return self._get_string_internal('0100600100ff')
-
-    @property
-    def attr0100010800ff(self) -> float|int:
-        return self._get_numeric_value_internal('0100010800ff')
-
-    @property
-    def attr0100010800ff_in_k(self) -> float|int:
-        return self._get_numeric_value_internal('0100010800ff', divisor=1000)
-
-    @property
-    def attr0100010800ff_status(self):
-        if self.data is not None:
-            obis_values = self.data.get(DATA_KEY, {})
-            if '0100010800ff' in obis_values and hasattr(obis_values.get('0100010800ff'), 'status'):
-                return obis_values.get('0100010800ff').status
-
-    @property
-    def attr0100010801ff(self) -> float|int:
-        return self._get_numeric_value_internal('0100010801ff')
-
-    @property
-    def attr0100010801ff_in_k(self) -> float|int:
-        return self._get_numeric_value_internal('0100010801ff', divisor=1000)
-
-    @property
-    def attr0100010802ff(self) -> float|int:
-        return self._get_numeric_value_internal('0100010802ff')
-
-    @property
-    def attr0100010802ff_in_k(self) -> float|int:
-        return self._get_numeric_value_internal('0100010802ff', divisor=1000)
-
-    @property
-    def attr0100010803ff(self) -> float|int:
-        return self._get_numeric_value_internal('0100010803ff')
-
-    @property
-    def attr0100010803ff_in_k(self) -> float|int:
-        return self._get_numeric_value_internal('0100010803ff', divisor=1000)
-
-    @property
-    def attr0100010804ff(self) -> float|int:
-        return self._get_numeric_value_internal('0100010804ff')
-
-    @property
-    def attr0100010804ff_in_k(self) -> float|int:
-        return self._get_numeric_value_internal('0100010804ff', divisor=1000)
-
-    @property
-    def attr0100020800ff(self) -> float|int:
-        return self._get_numeric_value_internal('0100020800ff')
-
-    @property
-    def attr0100020800ff_in_k(self) -> float|int:
-        return self._get_numeric_value_internal(key='0100020800ff', divisor=1000)
-
-    @property
-    def attr0100020801ff(self) -> float|int:
-        return self._get_numeric_value_internal('0100020801ff')
-
-    @property
-    def attr0100020801ff_in_k(self) -> float|int:
-        return self._get_numeric_value_internal('0100020801ff', divisor=1000)
-
-    @property
-    def attr0100020802ff(self) -> float|int:
-        return self._get_numeric_value_internal('0100020802ff')
-
-    @property
-    def attr0100020802ff_in_k(self) -> float|int:
-        return self._get_numeric_value_internal('0100020802ff', divisor=1000)
-
-    @property
-    def attr0100020803ff(self) -> float|int:
-        return self._get_numeric_value_internal('0100020803ff')
-
-    @property
-    def attr0100020803ff_in_k(self) -> float|int:
-        return self._get_numeric_value_internal('0100020803ff', divisor=1000)
-
-    @property
-    def attr0100020804ff(self) -> float|int:
-        return self._get_numeric_value_internal('0100020804ff')
-
-    @property
-    def attr0100020804ff_in_k(self) -> float|int:
-        return self._get_numeric_value_internal('0100020804ff', divisor=1000)
-
-    @property
-    def attr0100100700ff(self) -> float|int:
-        # search for SUM (0), POS (0), POS (255), NEG (0), ABS (0)
-        return self._get_numeric_value_internal(['0100100700ff', '0100010700ff', '01000107ffff', '0100020700ff', '01000f0700ff'])
-
-    @property
-    def attr0100240700ff(self) -> float|int:
-        # search for SUM (0), POS (0), POS (255), NEG (0), ABS (0)
-        return self._get_numeric_value_internal(['0100240700ff', '0100150700ff', '01001507ffff', '0100160700ff', '0100230700ff'])
-
-    @property
-    def attr0100380700ff(self) -> float|int:
-        # search for SUM (0), POS (0), POS (255), NEG (0), ABS (0)
-        return self._get_numeric_value_internal(['0100380700ff', '0100290700ff', '01002907ffff', '01002a0700ff', '0100370700ff'])
-
-    @property
-    def attr01004c0700ff(self) -> float|int:
-        # search for SUM (0), POS (0), POS (255), NEG (0), ABS (0)
-        return self._get_numeric_value_internal(['01004c0700ff', '01003d0700ff', '01003d07ffff', '01003e0700ff', '01004b0700ff'])
-
-    @property
-    def attr0100200700ff(self) -> float|int:
-        return self._get_numeric_value_internal('0100200700ff')
-
-    @property
-    def attr0100340700ff(self) -> float|int:
-        return self._get_numeric_value_internal('0100340700ff')
-
-    @property
-    def attr0100480700ff(self) -> float|int:
-        return self._get_numeric_value_internal('0100480700ff')
-
-    @property
-    def attr01001f0700ff(self) -> float|int:
-        return self._get_numeric_value_internal('01001f0700ff')
-
-    @property
-    def attr0100330700ff(self) -> float|int:
-        return self._get_numeric_value_internal('0100330700ff')
-
-    @property
-    def attr0100470700ff(self) -> float|int:
-        return self._get_numeric_value_internal('0100470700ff')
-
-    @property
-    def attr0100510701ff(self) -> float|int:
-        return self._get_numeric_value_internal('0100510701ff')
-
-    @property
-    def attr0100510702ff(self) -> float|int:
-        return self._get_numeric_value_internal('0100510702ff')
-
-    @property
-    def attr0100510704ff(self) -> float|int:
-        return self._get_numeric_value_internal('0100510704ff')
-
-    @property
-    def attr010051070fff(self) -> float|int:
-        return self._get_numeric_value_internal('010051070fff')
-
-    @property
-    def attr010051071aff(self) -> float|int:
-        return self._get_numeric_value_internal('010051071aff')
-
-    @property
-    def attr01000e0700ff(self) -> float|int:
-        return self._get_numeric_value_internal('01000e0700ff')
-
-    @property
-    def attr010000020000(self) -> str:  # 01
-        return self._get_string_internal('010000020000')
-
-    @property
-    def attr0100605a0201(self) -> str:  # 123a4567
-        return self._get_string_internal('0100605a0201')
-
-
 class TibberLocalEntity(CustomFriendlyNameEntity):
     _attr_has_entity_name = True
 
     def __init__(
             self, coordinator: TibberLocalDataUpdateCoordinator, description: EntityDescription
     ) -> None:
-        super().__init__(coordinator)
+        # the key is used as listener context - so the coordinator only calls us, when our value has changed
+        super().__init__(coordinator, description.key)
         if description.entity_category != EntityCategory.DIAGNOSTIC:
-            self.obis = ObisCode(description.key)
+            self.obis = intern_obis_code(description.key)
         self.entity_description = description
         self._stitle = coordinator._config_entry.title
         self._state = None
@@ -713,7 +757,7 @@ class TibberLocalEntity(CustomFriendlyNameEntity):
         sensor = self.entity_description.key
         return f"{DOMAIN}.{self._stitle}_{sensor}".lower()
 
-    def _friendly_name_internal(self) -> str | None:
+    def _compute_friendly_name(self) -> str | None:
         """Return the friendly name.
 
         If has_entity_name is False, this returns self.name
@@ -0,0 +1,46 @@
+from dataclasses import dataclass, fields
+from typing import Final
+
+# the metrics sensors: key prefix -> section in the 'metrics.json' of the bridge [the field is the key without the
+# prefix - or (for older bridge firmware) the complete key]
+METRICS_SECTIONS: Final = {
+    "node_": "node_status",
+    "hub_": "hub_attachments",
+}
+
+
+@dataclass(slots=True, frozen=True)
+class BridgeMetrics:
+    """The values of one 'metrics.json' response - the field names are the keys of the metrics sensors."""
+    node_battery_voltage: float | None = None
+    node_temperature: float | None = None
+    node_avg_rssi: float | None = None
+    node_avg_lqi: float | None = None
+    node_radio_tx_power: int | None = None
+    node_uptime_ms: int | None = None
+    node_meter_msg_count_sent: int | None = None
+    node_meter_pkg_count_sent: int | None = None
+    node_time_in_em0_ms: int | None = None
+    node_time_in_em1_ms: int | None = None
+    node_time_in_em2_ms: int | None = None
+    node_acmp_rx_autolevel_9600: int | None = None
+    node_invalid_meter_readings_count: int | None = None
+    hub_meter_pkg_count_recv: int | None = None
+    hub_meter_reading_count_recv: int | None = None
+    hub_meter_corrupt_reading_count_recv: int | None = None
+    hub_compression_error_readings_count: int | None = None
+
+    @classmethod
+    def from_json(cls, data: dict) -> "BridgeMetrics":
+        values = {}
+        for a_field in fields(cls):
+            for a_prefix, a_section in METRICS_SECTIONS.items():
+                if a_field.name.startswith(a_prefix):
+                    obj = data.get(a_section)
+                    if isinstance(obj, dict):
+                        values[a_field.name] = obj.get(a_field.name[len(a_prefix):], obj.get(a_field.name, None))
+                    break
+        return cls(**values)
+
+
+METRICS_FIELDS: Final = frozenset(a_field.name for a_field in fields(BridgeMetrics))
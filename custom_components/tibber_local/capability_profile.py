@@ -0,0 +1,48 @@
+from dataclasses import dataclass, field, asdict, fields
+from typing import Final
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+
+# a profile with another major version is dropped (and will be discovered again)
+PROFILE_STORAGE_VERSION: Final = 1
+PROFILE_STORAGE_MINOR_VERSION: Final = 1
+
+
+@dataclass(slots=True)
+class BridgeCapabilityProfile:
+    """What has been discovered about a node of a bridge - so the next start does not have to wait for the bridge."""
+    host: str
+    node_num: int
+    device_id: str | None = None
+    com_mode: int | None = None
+    ws_supported: bool = True
+    # e.g. the bridge firmware without websocket support (HTTP:404 on '/ws')
+    firmware_hints: dict = field(default_factory=dict)
+    obis_codes: list[str] = field(default_factory=list)
+    parse_strategy: str | None = None
+    # the average time between two meter readings (in seconds)
+    frame_interval: float | None = None
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "BridgeCapabilityProfile | None":
+        try:
+            names = {a_field.name for a_field in fields(cls)}
+            return cls(**{k: v for k, v in data.items() if k in names})
+        except (TypeError, AttributeError):
+            return None
+
+
+class BridgeCapabilityProfileStore(Store):
+    def __init__(self, hass: HomeAssistant, entry_id: str):
+        super().__init__(hass, PROFILE_STORAGE_VERSION, f"{DOMAIN}.profile.{entry_id}", minor_version=PROFILE_STORAGE_MINOR_VERSION)
+
+    async def _async_migrate_func(self, old_major_version: int, old_minor_version: int, old_data: dict) -> dict:
+        if old_major_version == PROFILE_STORAGE_VERSION:
+            return old_data
+        return {}
@@ -7,7 +7,7 @@ from aiohttp import ClientError
 from homeassistant import config_entries, data_entry_flow
 from homeassistant.config_entries import ConfigFlowResult, SOURCE_RECONFIGURE
 from homeassistant.const import CONF_ID, CONF_HOST, CONF_NAME, CONF_SCAN_INTERVAL, CONF_PASSWORD, CONF_MODE
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.util import slugify
 
@@ -28,7 +28,20 @@ from .const import (
     CONFIG_VERSION,
     CONFIG_MINOR_VERSION,
     DATA_KEY,
-    UNKNOWN_SERIAL
+    UNKNOWN_SERIAL,
+    PUBLISH_FILTER_CLASSES,
+    PUBLISH_FILTER_OPTIONS,
+    CONF_DEADBAND_REL,
+    CONF_MIN_PUBLISH_INTERVAL,
+    CONF_MAX_PUBLISH_INTERVAL,
+    CONF_NOTIFY_INTERVAL,
+    CONF_NOTIFY_LEADING_EDGE,
+    CONF_NOTIFY_TRAILING_EDGE,
+    DEFAULT_NOTIFY_INTERVAL,
+    DEFAULT_NOTIFY_LEADING_EDGE,
+    DEFAULT_NOTIFY_TRAILING_EDGE,
+    CONF_MAX_CONCURRENT_REQUESTS,
+    DEFAULT_MAX_CONCURRENT_REQUESTS
 )
 from .tibber_client import TibberLocalBridge
 
@@ -226,75 +239,53 @@ class TibberLocalConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             errors=self._errors,
         )
 
-    # @staticmethod
-    # @callback
-    # def async_get_options_flow(config_entry):
-    #     return TibberLocalOptionsFlowHandler(config_entry)
-
-
-# class TibberLocalOptionsFlowHandler(config_entries.OptionsFlow):
-#
-#     def __init__(self, config_entry):
-#         """Initialize HACS options flow."""
-#         self.data = dict(config_entry.data);
-#         if len(dict(config_entry.options)) == 0:
-#             self.options = {}
-#         else:
-#             self.options = dict(config_entry.options)
-#
-#     async def async_step_init(self, user_input=None):  # pylint: disable=unused-argument
-#         """Manage the options."""
-#         return await self.async_step_user()
-#
-#     async def async_step_user(self, user_input=None):
-#         """Handle a flow initialized by the user."""
-#         self._errors = {}
-#         if user_input is not None:
-#
-#             # verify the entered host...
-#             host_entry = user_input.get(CONF_HOST, DEFAULT_HOST).lower()
-#             # make sure we just handle host/ip's - removing http/https
-#             if host_entry.startswith("http://"):
-#                 host_entry = host_entry.replace("http://", "")
-#             if host_entry.startswith('https://'):
-#                 host_entry = host_entry.replace("https://", "")
-#             user_input[CONF_HOST] = host_entry
-#
-#             node_num = user_input[CONF_NODE_NUMBER]
-#             self.options.update(user_input)
-#             if self.data.get(CONF_HOST) != self.options.get(CONF_HOST) or self.data.get(CONF_NODE_NUMBER) != self.options.get(CONF_NODE_NUMBER):
-#                 # ok looks like the host has been changed... we need to do some things...
-#                 if _host_in_configuration_exists(host_entry, node_num, self.hass):
-#                     self._errors[CONF_HOST] = "already_configured"
-#                     self._errors[CONF_NODE_NUMBER] = "already_configured"
-#                 else:
-#                     return self._update_options()
-#             else:
-#                 # host/node-number did not change...
-#                 return self._update_options()
-#
-#         return self.async_show_form(
-#             step_id="user",
-#             data_schema=vol.Schema({
-#                 vol.Required(CONF_NAME,
-#                              default=self.options.get(CONF_NAME, self.data.get(CONF_NAME, DEFAULT_NAME))): str,
-#                 vol.Required(CONF_HOST,
-#                              default=self.options.get(CONF_HOST, self.data.get(CONF_HOST, DEFAULT_HOST))): str,
-#                 vol.Required(CONF_PASSWORD,
-#                              default=self.options.get(CONF_PASSWORD, self.data.get(CONF_PASSWORD, DEFAULT_PWD))): str,
-#                 vol.Required(CONF_SCAN_INTERVAL, default=self.options.get(CONF_SCAN_INTERVAL,
-#                                                                           self.data.get(CONF_SCAN_INTERVAL,
-#                                                                                         DEFAULT_SCAN_INTERVAL))): int,
-#                 vol.Required(CONF_NODE_NUMBER, default=self.options.get(CONF_NODE_NUMBER,
-#                                                                         self.data.get(CONF_NODE_NUMBER,
-#                                                                                       DEFAULT_NODE_NUMBER))): int,
-#                 vol.Required(CONF_IGNORE_READING_ERRORS, default=self.options.get(CONF_IGNORE_READING_ERRORS,
-#                                                                                   self.data.get(
-#                                                                                       CONF_IGNORE_READING_ERRORS,
-#                                                                                       False))): bool
-#             }),
-#         )
-#
-#     def _update_options(self):
-#         """Update config entry options."""
-#         return self.async_create_entry(data=self.options)
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry):
+        return TibberLocalOptionsFlowHandler(config_entry)
+
+
+class TibberLocalOptionsFlowHandler(config_entries.OptionsFlow):
+
+    def __init__(self, config_entry):
+        self._options = dict(config_entry.options)
+        self._errors = {}
+
+    async def async_step_init(self, user_input=None):
+        self._errors = {}
+        if user_input is not None:
+            for a_class in PUBLISH_FILTER_CLASSES.values():
+                min_interval = user_input.get(f"{a_class}_{CONF_MIN_PUBLISH_INTERVAL}", 0)
+                max_interval = user_input.get(f"{a_class}_{CONF_MAX_PUBLISH_INTERVAL}", 0)
+                if 0 < max_interval < min_interval:
+                    self._errors[f"{a_class}_{CONF_MAX_PUBLISH_INTERVAL}"] = "max_below_min"
+
+            if not user_input.get(CONF_NOTIFY_LEADING_EDGE, True) and not user_input.get(CONF_NOTIFY_TRAILING_EDGE, True):
+                self._errors[CONF_NOTIFY_TRAILING_EDGE] = "no_notify_edge"
+
+            if len(self._errors) == 0:
+                self._options.update(user_input)
+                return self.async_create_entry(data=self._options)
+
+        schema = {}
+        for a_class in PUBLISH_FILTER_CLASSES.values():
+            for an_option in PUBLISH_FILTER_OPTIONS:
+                key = f"{a_class}_{an_option}"
+                if an_option in (CONF_MIN_PUBLISH_INTERVAL, CONF_MAX_PUBLISH_INTERVAL):
+                    validator = vol.All(vol.Coerce(int), vol.Range(min=0))
+                elif an_option == CONF_DEADBAND_REL:
+                    validator = vol.All(vol.Coerce(float), vol.Range(min=0, max=100))
+                else:
+                    validator = vol.All(vol.Coerce(float), vol.Range(min=0))
+                schema[vol.Required(key, default=self._options.get(key, 0))] = validator
+
+        schema[vol.Required(CONF_NOTIFY_INTERVAL, default=self._options.get(CONF_NOTIFY_INTERVAL, DEFAULT_NOTIFY_INTERVAL))] = vol.All(vol.Coerce(float), vol.Range(min=0))
+        schema[vol.Required(CONF_NOTIFY_LEADING_EDGE, default=self._options.get(CONF_NOTIFY_LEADING_EDGE, DEFAULT_NOTIFY_LEADING_EDGE))] = bool
+        schema[vol.Required(CONF_NOTIFY_TRAILING_EDGE, default=self._options.get(CONF_NOTIFY_TRAILING_EDGE, DEFAULT_NOTIFY_TRAILING_EDGE))] = bool
+        schema[vol.Required(CONF_MAX_CONCURRENT_REQUESTS, default=self._options.get(CONF_MAX_CONCURRENT_REQUESTS, DEFAULT_MAX_CONCURRENT_REQUESTS))] = vol.All(vol.Coerce(int), vol.Range(min=1, max=4))
+
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(schema),
+            errors=self._errors,
+        )
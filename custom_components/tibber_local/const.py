@@ -36,6 +36,33 @@ CONF_OBIS_CODES: Final = "obis_codes"
 CONF_IGNORE_READING_ERRORS: Final = "ignore_errors"
 DEFAULT_NODE_NUMBER: Final = 1
 
+# publish filter options (per sensor class) - the option key is '<class>_<option>' (e.g. 'power_deadband_abs'),
+# a value of 0 disables the filter
+PUBLISH_FILTER_CLASSES: Final = {
+    SensorDeviceClass.POWER: "power",
+    SensorDeviceClass.VOLTAGE: "voltage",
+    SensorDeviceClass.CURRENT: "current",
+    SensorDeviceClass.FREQUENCY: "frequency",
+}
+CONF_DEADBAND_ABS: Final = "deadband_abs"
+CONF_DEADBAND_REL: Final = "deadband_rel"
+CONF_MIN_PUBLISH_INTERVAL: Final = "min_publish_interval"
+CONF_MAX_PUBLISH_INTERVAL: Final = "max_publish_interval"
+PUBLISH_FILTER_OPTIONS: Final = [CONF_DEADBAND_ABS, CONF_DEADBAND_REL, CONF_MIN_PUBLISH_INTERVAL, CONF_MAX_PUBLISH_INTERVAL]
+
+# how often the coordinator will be notified about new websocket data (at most once per interval) - and if the
+# notification happens at the leading and/or trailing edge of the interval
+CONF_NOTIFY_INTERVAL: Final = "notify_interval"
+CONF_NOTIFY_LEADING_EDGE: Final = "notify_leading_edge"
+CONF_NOTIFY_TRAILING_EDGE: Final = "notify_trailing_edge"
+DEFAULT_NOTIFY_INTERVAL: Final = 1.0
+DEFAULT_NOTIFY_LEADING_EDGE: Final = True
+DEFAULT_NOTIFY_TRAILING_EDGE: Final = True
+
+# how many HTTP requests (of all config entries) can be made at the same time to one bridge
+CONF_MAX_CONCURRENT_REQUESTS: Final = "max_concurrent_requests"
+DEFAULT_MAX_CONCURRENT_REQUESTS: Final = 1
+
 MODE_UNKNOWN: Final = -1
 MODE_0_AutoScanMode: Final = 0
 MODE_1_IEC_62056_21: Final = 1
@@ -60,6 +87,18 @@ METRICS_KEY: Final = "metrics"
 
 UNKNOWN_SERIAL: Final = "UNKNOWN_SERIAL"
 
+# the (string) OBIS codes that are not sensors, but are used to build the serial number of the meter
+STRING_OBIS_CODES: Final = ["010060320101", "0100600100ff", "0100605a0201", "010000020000"]
+
+# the power sensors are provided by the meters with different OBIS codes - when the main code is not available, we
+# search for: SUM (0), POS (0), POS (255), NEG (0), ABS (0)
+OBIS_ALIASES: Final = {
+    "0100100700ff": ["0100010700ff",  "01000107ffff",  "0100020700ff", "01000f0700ff"],
+    "0100240700ff": ["0100150700ff", "01001507ffff", "0100160700ff", "0100230700ff"],
+    "0100380700ff": ["0100290700ff", "01002907ffff", "01002a0700ff", "0100370700ff"],
+    "01004c0700ff": ["01003d0700ff", "01003d07ffff", "01003e0700ff", "01004b0700ff"],
+}
+
 @dataclass(frozen=True)
 class ExtSensorEntityDescription(SensorEntityDescription):
     aliases: list[str] | None = None
@@ -263,7 +302,7 @@ SENSOR_TYPES = [
     # aktuelle Wirkleistung
     ExtSensorEntityDescription(
         key="0100100700ff",
-        aliases=["0100010700ff",  "01000107ffff",  "0100020700ff", "01000f0700ff"],
+        aliases=OBIS_ALIASES["0100100700ff"],
         name="Power (actual)",
         native_unit_of_measurement=UnitOfPower.WATT,
         icon="mdi:meter-electric",
@@ -273,7 +312,7 @@ SENSOR_TYPES = [
     # Wirkleistung L1
     ExtSensorEntityDescription(
         key="0100240700ff",
-        aliases=["0100150700ff", "01001507ffff", "0100160700ff", "0100230700ff"],
+        aliases=OBIS_ALIASES["0100240700ff"],
         name="Power L1",
         native_unit_of_measurement=UnitOfPower.WATT,
         icon="mdi:meter-electric",
@@ -283,7 +322,7 @@ SENSOR_TYPES = [
     # Wirkleistung L2
     ExtSensorEntityDescription(
         key="0100380700ff",
-        aliases=["0100290700ff", "01002907ffff", "01002a0700ff", "0100370700ff"],
+        aliases=OBIS_ALIASES["0100380700ff"],
         name="Power L2",
         native_unit_of_measurement=UnitOfPower.WATT,
         icon="mdi:meter-electric",
@@ -293,7 +332,7 @@ SENSOR_TYPES = [
     # Wirkleistung L3
     ExtSensorEntityDescription(
         key="01004c0700ff",
-        aliases=["01003d0700ff", "01003d07ffff", "01003e0700ff", "01004b0700ff"],
+        aliases=OBIS_ALIASES["01004c0700ff"],
         name="Power L3",
         native_unit_of_measurement=UnitOfPower.WATT,
         icon="mdi:meter-electric",
@@ -583,3 +622,10 @@ SENSOR_TYPES = [
         entity_category=EntityCategory.DIAGNOSTIC
     ),
 ]
+
+# all OBIS codes our sensors (incl. their aliases) and the serial number are made of
+KNOWN_OBIS_CODES: Final = frozenset(
+    [a_desc.key.removesuffix("_in_k") for a_desc in SENSOR_TYPES if a_desc.entity_category != EntityCategory.DIAGNOSTIC] +
+    [an_alias for a_list in OBIS_ALIASES.values() for an_alias in a_list] +
+    STRING_OBIS_CODES
+)
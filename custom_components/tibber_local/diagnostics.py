@@ -0,0 +1,15 @@
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from . import mask_map
+from .const import DOMAIN
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, config_entry: ConfigEntry) -> dict:
+    """Return diagnostics for a config entry."""
+    a_dict = {"config_entry": mask_map(dict(config_entry.as_dict()))}
+    coordinator = hass.data.get(DOMAIN, {}).get(config_entry.entry_id)
+    if coordinator is not None:
+        a_dict["bridge"] = coordinator.bridge.get_diagnostics()
+        a_dict["coordinator"] = coordinator.get_diagnostics()
+    return a_dict
@@ -2,6 +2,7 @@ import logging
 
 from awesomeversion import AwesomeVersion
 from homeassistant.const import ATTR_FRIENDLY_NAME, __version__ as HA_VERSION
+from homeassistant.core import callback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 USE_NEW_FRIENDLY_NAME = AwesomeVersion(HA_VERSION) >= AwesomeVersion("2026.2.0")
@@ -9,9 +10,45 @@ USE_NEW_FRIENDLY_NAME = AwesomeVersion(HA_VERSION) >= AwesomeVersion("2026.2.0")
 _LOGGER = logging.getLogger(__name__)
 #_LOGGER.debug(f"HA Version: {HA_VERSION}, USE_NEW_FRIENDLY_NAME: {USE_NEW_FRIENDLY_NAME}")
 
+_NOT_CACHED = object()
+
 
 class CustomFriendlyNameEntity(CoordinatorEntity):
 
+    # the friendly name only depends on the entity & device registry entries - so it will be calculated once and
+    # cleared, when one of the registries has been updated
+    _friendly_name_cache = _NOT_CACHED
+    _friendly_name_attr_index = None
+
+    def _friendly_name_internal(self) -> str | None:
+        name = self._friendly_name_cache
+        if name is _NOT_CACHED:
+            name = self._compute_friendly_name()
+            self._friendly_name_cache = name
+        return name
+
+    def _compute_friendly_name(self) -> str | None:
+        # child classes can implement their own friendly name here
+        return super()._friendly_name_internal()
+
+    def _clear_friendly_name_cache(self):
+        self._friendly_name_cache = _NOT_CACHED
+
+    async def async_added_to_hass(self) -> None:
+        # the registry entries are (re)assigned when the entity is added to the platform
+        self._clear_friendly_name_cache()
+        await super().async_added_to_hass()
+
+    @callback
+    def async_registry_entry_updated(self) -> None:
+        self._clear_friendly_name_cache()
+        super().async_registry_entry_updated()
+
+    @callback
+    def _async_device_registry_updated(self, event) -> None:
+        self._clear_friendly_name_cache()
+        super()._async_device_registry_updated(event)
+
     # This is a SYNCHRONOUS method that returns a tuple, not async!
     def _Entity__async_calculate_state(self):
         """Calculate state and override ATTR_FRIENDLY_NAME."""
@@ -22,33 +59,26 @@ class CustomFriendlyNameEntity(CoordinatorEntity):
         if not USE_NEW_FRIENDLY_NAME or self._attr_has_entity_name == False:
             return result
 
-        # Check if child class implements _friendly_name_internal
-        if not hasattr(self, '_friendly_name_internal') or not callable(getattr(self, '_friendly_name_internal', None)):
-            return result
-
-        # Check if we have a cached friendly name that matches what we would generate
         custom_friendly_name = self._friendly_name_internal()
+        if custom_friendly_name is None:
+            return result
 
-        # Only modify if we have a custom name and it differs from cache
-        if custom_friendly_name is not None:
-            result_list = list(result)
-            attr = None
-            attr_index = None
-
-            for i, item in enumerate(result_list):
+        # the position of the attribute dict in the state tuple will not change - so we only search it once
+        attr_index = self._friendly_name_attr_index
+        if attr_index is None:
+            for i, item in enumerate(result):
                 if isinstance(item, dict) and ATTR_FRIENDLY_NAME in item:
-                    attr = item
                     attr_index = i
                     break
 
-            if attr is None:
+            if attr_index is None:
                 _LOGGER.warning(f"Could not find friendly name attribute in state result for {self.entity_id}")
                 return result
+            self._friendly_name_attr_index = attr_index
 
-            # Only modify if we found the attr dict and it differs
-            if attr.get(ATTR_FRIENDLY_NAME) != custom_friendly_name:
-                attr[ATTR_FRIENDLY_NAME] = custom_friendly_name
-                result_list[attr_index] = attr
-                return tuple(result_list)
+        # the attr dict is modified in place - so the tuple itself can be returned
+        attr = result[attr_index]
+        if attr.get(ATTR_FRIENDLY_NAME) != custom_friendly_name:
+            attr[ATTR_FRIENDLY_NAME] = custom_friendly_name
 
-        return result
\ No newline at end of file
+        return result
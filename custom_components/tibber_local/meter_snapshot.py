@@ -0,0 +1,203 @@
+from array import array
+from numbers import Number
+from typing import Final, Iterator
+
+from smllib.sml import ObisCode
+
+from .const import KNOWN_OBIS_CODES, OBIS_ALIASES
+from .obis_codes import intern_obis_code
+
+# unknown codes will get a slot too (e.g. when the payload should be logged) - but the index must not grow endless,
+# when the bridge is sending garbage
+MAX_SNAPSHOT_SLOTS: Final = 256
+
+# the known codes get the same (first) slots in every index - so the sensor accessors can be bound to their slot
+KNOWN_OBIS_SLOTS: Final = {a_code: a_slot for a_slot, a_code in enumerate(sorted(KNOWN_OBIS_CODES))}
+
+NO_UNIT: Final = -1
+NO_VALUE: Final = float('nan')
+
+
+class MeterSnapshotIndex:
+    """The OBIS code -> slot mapping of a bridge - a slot will never be reassigned, so all snapshots of the bridge
+    can store their values in flat arrays. Codes that are not known upfront get the next free slot.
+
+    The index also caches which of the OBIS_ALIASES codes provides the value of a sensor - this is resolved against
+    the snapshot that is published, and only again when the set of codes the meter reports changes."""
+    __slots__ = ("slots", "codes", "alias_slots", "_alias_codes")
+
+    def __init__(self):
+        self.slots: dict[str, int] = {}
+        self.codes: list[ObisCode] = []
+        self.alias_slots: dict[str, int | None] = {}
+        self._alias_codes = b''
+        for a_code in KNOWN_OBIS_SLOTS:
+            self.slot_for(intern_obis_code(a_code))
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def check_reported_codes(self, snapshot: "MeterSnapshot"):
+        # comparing the presence flags of the slots does not create any objects (as long as nothing changed)
+        if snapshot._present != self._alias_codes:
+            self._alias_codes = bytes(snapshot._present)
+            # the first code (the sensor key itself - then its aliases) with a numeric value wins
+            self.alias_slots.clear()
+            for an_obis, aliases in OBIS_ALIASES.items():
+                self.alias_slots[an_obis] = None
+                for a_code in [an_obis] + aliases:
+                    if snapshot.get_number(a_code) is not None:
+                        self.alias_slots[an_obis] = self.slots[a_code]
+                        break
+
+    def slot_for(self, obis: ObisCode) -> int | None:
+        slot = self.slots.get(obis)
+        if slot is None and len(self.codes) < MAX_SNAPSHOT_SLOTS:
+            slot = len(self.codes)
+            self.slots[obis] = slot
+            self.codes.append(obis)
+        return slot
+
+
+class MeterSnapshot:
+    """The values of one meter reading. Numeric values are stored already scaled (and divided by 1000 for the
+    '_in_k' sensors) in flat arrays - all other values (like the serial) in a small side table. Slots without a
+    numeric value hold NaN. Snapshots are meant to be reused by the parsers (clear() and fill them again), so no
+    objects must be created per entry."""
+    __slots__ = ("index", "_filled", "_present", "_values", "_kilo_values", "_units", "_strings", "_status")
+
+    def __init__(self, index: MeterSnapshotIndex):
+        self.index = index
+        self._filled: list[int] = []
+        self._present = bytearray(len(index))
+        self._values = array('d', [NO_VALUE]) * len(index)
+        self._kilo_values = array('d', [NO_VALUE]) * len(index)
+        self._units = array('h', [NO_UNIT]) * len(index)
+        self._strings: dict[int, str] = {}
+        self._status: dict[int, int] = {}
+
+    def clear(self):
+        for slot in self._filled:
+            self._present[slot] = 0
+            self._values[slot] = NO_VALUE
+            self._kilo_values[slot] = NO_VALUE
+            self._units[slot] = NO_UNIT
+        self._filled.clear()
+        self._strings.clear()
+        self._status.clear()
+
+    def set_entry(self, obis: ObisCode, value, unit: int | None = None, scaler: int | None = None, status: int | None = None):
+        if value is None:
+            return
+        slot = self.index.slots.get(obis)
+        if slot is None:
+            slot = self.index.slot_for(obis)
+            if slot is None:
+                return
+
+        # the index might have been extended (by this or another snapshot of the bridge)
+        if slot >= len(self._present):
+            missing = len(self.index) - len(self._present)
+            self._present.extend(bytes(missing))
+            self._values.extend(array('d', [NO_VALUE]) * missing)
+            self._kilo_values.extend(array('d', [NO_VALUE]) * missing)
+            self._units.extend(array('h', [NO_UNIT]) * missing)
+
+        if self._present[slot]:
+            self._strings.pop(slot, None)
+            self._status.pop(slot, None)
+        else:
+            self._present[slot] = 1
+            self._filled.append(slot)
+
+        value_type = type(value)
+        if value_type is int or value_type is float or (value_type is not bool and isinstance(value, Number)):
+            value = value * 10 ** scaler if scaler else value
+            self._values[slot] = value
+            self._kilo_values[slot] = value / 1000
+        else:
+            self._values[slot] = NO_VALUE
+            self._kilo_values[slot] = NO_VALUE
+            self._strings[slot] = value
+        self._units[slot] = unit if unit is not None and 0 <= unit <= 255 else NO_UNIT
+        if status is not None:
+            self._status[slot] = status
+
+    def _slot_of(self, obis: str) -> int | None:
+        slot = self.index.slots.get(obis)
+        if slot is not None and slot < len(self._present) and self._present[slot]:
+            return slot
+        return None
+
+    def __len__(self) -> int:
+        return len(self._filled)
+
+    def __contains__(self, obis: str) -> bool:
+        return self._slot_of(obis) is not None
+
+    def __iter__(self) -> Iterator[ObisCode]:
+        return iter(self.keys())
+
+    def keys(self) -> list[ObisCode]:
+        codes = self.index.codes
+        return [codes[slot] for slot in self._filled]
+
+    def as_list(self) -> list[list]:
+        # [obis, value, unit, status] of each entry (the values are already scaled) - see 'restore_obis_values()'
+        codes = self.index.codes
+        return [[str(codes[slot]), self._strings.get(slot, self._values[slot]),
+                 None if self._units[slot] == NO_UNIT else self._units[slot], self._status.get(slot)] for slot in self._filled]
+
+    def get_number(self, obis: str) -> float | None:
+        slot = self.index.slots.get(obis)
+        if slot is not None and slot < len(self._values):
+            value = self._values[slot]
+            # NaN: not present or not a number
+            if value == value:
+                return value
+        return None
+
+    def get_number_in_k(self, obis: str) -> float | None:
+        slot = self.index.slots.get(obis)
+        if slot is not None and slot < len(self._kilo_values):
+            value = self._kilo_values[slot]
+            if value == value:
+                return value
+        return None
+
+    def get_number_at(self, slot: int) -> float | None:
+        value = self._values[slot]
+        return value if value == value else None
+
+    def get_number_in_k_at(self, slot: int) -> float | None:
+        value = self._kilo_values[slot]
+        return value if value == value else None
+
+    def get_aliased_number(self, obis: str) -> float | None:
+        # the winner has been resolved by 'MeterSnapshotIndex.check_reported_codes()'
+        slot = self.index.alias_slots.get(obis)
+        if slot is not None and slot < len(self._values):
+            value = self._values[slot]
+            if value == value:
+                return value
+        return None
+
+    def get_value(self, obis: str) -> float | str | None:
+        slot = self._slot_of(obis)
+        if slot is None:
+            return None
+        if slot in self._strings:
+            return self._strings[slot]
+        return self._values[slot]
+
+    def get_unit(self, obis: str) -> int | None:
+        slot = self._slot_of(obis)
+        if slot is None or self._units[slot] == NO_UNIT:
+            return None
+        return self._units[slot]
+
+    def get_status(self, obis: str) -> int | None:
+        slot = self._slot_of(obis)
+        if slot is None:
+            return None
+        return self._status.get(slot)
@@ -0,0 +1,45 @@
+from typing import Final
+
+from smllib.const import UNITS
+from smllib.sml import ObisCode
+
+from .const import KNOWN_OBIS_CODES
+
+# unknown codes will be interned too - but the table must not grow endless, when the bridge is sending garbage
+MAX_INTERNED_OBIS_CODES: Final = 1024
+
+# hex string (or tuple of the six code values) -> the shared ObisCode object
+_OBIS_CODES: Final[dict[str | tuple, ObisCode]] = {a_code: ObisCode(a_code) for a_code in KNOWN_OBIS_CODES}
+
+# smllib unit name -> unit int [some names (e.g. 'm³') are used for more than one unit - like the previous
+# linear scan over 'UNITS' we keep the first one]
+UNIT_INTS_BY_NAME: Final[dict[str, int]] = {}
+for a_unit_int, a_unit_name in UNITS.items():
+    UNIT_INTS_BY_NAME.setdefault(a_unit_name, a_unit_int)
+
+
+def intern_obis_code(code: str | tuple[int, ...]) -> ObisCode:
+    """Return the shared ObisCode for a hex string like '0100010800ff' or a tuple like (1, 0, 1, 8, 0, 255)."""
+    obis = _OBIS_CODES.get(code)
+    if obis is not None:
+        return obis
+
+    if isinstance(code, str):
+        hex_code = code.lower()
+    else:
+        # raises a ValueError when one of the values is > 255
+        hex_code = bytes(code).hex()
+
+    obis = _OBIS_CODES.get(hex_code)
+    if obis is None:
+        obis = ObisCode(hex_code)
+        if len(_OBIS_CODES) < MAX_INTERNED_OBIS_CODES:
+            _OBIS_CODES[hex_code] = obis
+
+    if code is not hex_code and len(_OBIS_CODES) < MAX_INTERNED_OBIS_CODES:
+        _OBIS_CODES[code] = obis
+    return obis
+
+
+def find_unit_int_from_string(unit_str: str) -> int | None:
+    return UNIT_INTS_BY_NAME.get(unit_str)
@@ -8,6 +8,7 @@ from homeassistant.helpers.typing import StateType
 from homeassistant.util import slugify
 
 from . import TibberLocalDataUpdateCoordinator, TibberLocalEntity
+from .sensor_accessors import SENSOR_ACCESSORS
 from .const import (
     DOMAIN,
     SENSOR_TYPES,
@@ -35,6 +36,10 @@ async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry, asyn
                     _LOGGER.info(f"Updated obis codes stored in config_entry: {new_data[CONF_OBIS_CODES]}")
                 else:
                     _LOGGER.debug(f"Stored obis codes in config_entry: {config_entry.data.get(CONF_OBIS_CODES, [])}")
+            elif len(coordinator.get_profile_obis_codes()) > 0:
+                # the bridge has not been requested yet - the codes are from the profile of a previous run
+                available_sensors = coordinator.get_profile_obis_codes()
+                _LOGGER.info(f"available obis codes from the stored profile: {available_sensors}")
             else:
                 available_sensors = config_entry.data.get(CONF_OBIS_CODES, [])
                 _LOGGER.warning(f"no sensors found @ bridge [we check, if we have stored obis codes in our config_entry: {available_sensors}]")
@@ -75,6 +80,7 @@ class TibberLocalSensor(TibberLocalEntity, SensorEntity):
     ):
         """Initialize a singular value sensor."""
         super().__init__(coordinator=coordinator, description=description)
+        self._value_accessor = SENSOR_ACCESSORS[description.key]
         if (hasattr(self.entity_description, 'entity_registry_enabled_default')):
             self._attr_entity_registry_enabled_default = self.entity_description.entity_registry_enabled_default
         else:
@@ -93,8 +99,9 @@ class TibberLocalSensor(TibberLocalEntity, SensorEntity):
 
     @property
     def native_value(self) -> StateType:
-        if self.coordinator.data is not None:
-            return getattr(self.coordinator, 'attr' + self.entity_description.key, None)
+        data = self.coordinator.data
+        if data is not None:
+            return self._value_accessor(data)
         return None
 
     # @property
@@ -0,0 +1,52 @@
+from typing import Any, Callable, Final
+
+from .bridge_metrics import METRICS_FIELDS
+from .const import SENSOR_TYPES, OBIS_ALIASES, DATA_KEY, METRICS_KEY
+from .meter_snapshot import KNOWN_OBIS_SLOTS
+
+
+def _obis_number(slot: int) -> Callable[[dict], Any]:
+    def accessor(data: dict):
+        obis_values = data.get(DATA_KEY)
+        return obis_values.get_number_at(slot) if obis_values is not None else None
+    return accessor
+
+
+def _obis_number_in_k(slot: int) -> Callable[[dict], Any]:
+    def accessor(data: dict):
+        obis_values = data.get(DATA_KEY)
+        return obis_values.get_number_in_k_at(slot) if obis_values is not None else None
+    return accessor
+
+
+def _obis_aliased_number(obis: str) -> Callable[[dict], Any]:
+    def accessor(data: dict):
+        obis_values = data.get(DATA_KEY)
+        return obis_values.get_aliased_number(obis) if obis_values is not None else None
+    return accessor
+
+
+def _metrics_value(field: str) -> Callable[[dict], Any]:
+    # the alternative field names of the bridge firmware versions are already resolved in 'BridgeMetrics'
+    def accessor(data: dict):
+        metrics = data.get(METRICS_KEY)
+        return getattr(metrics, field) if metrics is not None else None
+    return accessor
+
+
+def _build_accessor(key: str) -> Callable[[dict], Any]:
+    if key in METRICS_FIELDS:
+        return _metrics_value(key)
+    elif key.endswith("_in_k"):
+        return _obis_number_in_k(KNOWN_OBIS_SLOTS[key[:-5]])
+    elif key in OBIS_ALIASES:
+        return _obis_aliased_number(key)
+    else:
+        return _obis_number(KNOWN_OBIS_SLOTS[key])
+
+
+# sensor key -> function that reads the value of the sensor from the coordinator data
+SENSOR_ACCESSORS: Final[dict[str, Callable[[dict], Any]]] = {a_desc.key: _build_accessor(a_desc.key) for a_desc in SENSOR_TYPES}
+
+# the sensors that will only change, when new metrics have been fetched
+METRICS_SENSOR_KEYS: Final = frozenset(a_key for a_key in SENSOR_ACCESSORS if a_key in METRICS_FIELDS)
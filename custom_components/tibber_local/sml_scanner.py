@@ -0,0 +1,130 @@
+import logging
+from typing import Final
+
+from smllib.errors import SmlLibException
+
+from .const import KNOWN_OBIS_CODES
+from .meter_snapshot import MeterSnapshot
+from .obis_codes import intern_obis_code
+
+_LOGGER = logging.getLogger(__name__)
+
+# a SmlListEntry is a list with 7 fields, where the first one is the 6 byte long objName (OBIS code) - and all
+# the OBIS codes we are interested in, start with '01' [same search pattern as 'SmlFrame.get_obis()' uses]
+SML_LIST_ENTRY_START: Final = b'\x77\x07\x01'
+
+# the raw 6 bytes of an OBIS code -> the (shared) ObisCode object
+WANTED_OBIS_CODES: Final = {bytes.fromhex(a_code): intern_obis_code(a_code) for a_code in KNOWN_OBIS_CODES}
+
+
+class SmlScanError(SmlLibException):
+    pass
+
+
+def _skip_field(buf: memoryview, pos: int, buf_len: int) -> int:
+    if pos >= buf_len:
+        raise SmlScanError(f"Start pos bigger than buffer: {pos} > {buf_len}")
+
+    v = buf[pos]
+    # 'no value' or 'end of message'
+    if v == 0x01 or v == 0x00:
+        return pos + 1
+    # bool
+    if v == 0x42:
+        return pos + 2
+
+    _type = v & 0x70
+    _size = v & 0x0F
+    start = pos + 1
+    while v & 0x80:
+        v = buf[start]
+        _size = _size << 4 | v & 0x0F
+        start += 1
+
+    # a list - we have to skip all the child elements
+    if _type == 0x70:
+        for _ in range(_size):
+            start = _skip_field(buf, start, buf_len)
+        return start
+
+    end = pos + _size
+    if end > buf_len or _type not in (0x00, 0x50, 0x60):
+        raise SmlScanError(f"Unexpected field type 0x{_type:02x} (size: {_size}) at pos: {pos}")
+    return end
+
+
+def _read_scalar_field(buf: memoryview, pos: int, buf_len: int) -> tuple[int | str | bytes | None, int]:
+    if pos >= buf_len:
+        raise SmlScanError(f"Start pos bigger than buffer: {pos} > {buf_len}")
+
+    v = buf[pos]
+    if v == 0x01:
+        return None, pos + 1
+
+    _type = v & 0x70
+    _size = v & 0x0F
+    start = pos + 1
+    while v & 0x80:
+        v = buf[start]
+        _size = _size << 4 | v & 0x0F
+        start += 1
+
+    end = pos + _size
+    if end > buf_len or end < start:
+        raise SmlScanError(f"Invalid field size {_size} at pos: {pos}")
+
+    # 0x50: signed integer, 0x60 unsigned integer
+    if _type == 0x50 or _type == 0x60:
+        return int.from_bytes(buf[start:end], byteorder='big', signed=_type == 0x50), end
+
+    # 0x00: octet string (will be converted by the caller)
+    if _type == 0x00:
+        return bytes(buf[start:end]), end
+
+    raise SmlScanError(f"Unexpected field type 0x{_type:02x} at pos: {pos}")
+
+
+def scan_obis_entries(frame_bytes: bytes, snapshot: MeterSnapshot) -> int:
+    """Extract the entries of the known OBIS codes directly from the (unescaped) frame bytes into the snapshot.
+
+    Instead of building the complete smllib object tree, the SmlListEntry records are located in place and
+    only the status, unit, scaler and value of the known OBIS codes are decoded. Everything that does not look
+    like a valid SmlListEntry raises a 'SmlScanError' - so the caller can fall back to the smllib
+    implementation. Returns the number of entries that have been found."""
+    buf = memoryview(frame_bytes)
+    buf_len = len(buf)
+    count = 0
+    pos = 0
+    while (pos := frame_bytes.find(SML_LIST_ENTRY_START, pos)) != -1:
+        if pos + 8 > buf_len:
+            raise SmlScanError(f"Truncated OBIS code at pos: {pos}")
+
+        # a readonly memoryview is hashable - so no copy is required for the lookup
+        obis = WANTED_OBIS_CODES.get(buf[pos + 2:pos + 8])
+        next_pos = pos + 8
+        if obis is None:
+            # an entry that we are not interested in: status, val_time, unit, scaler, value & value_signature
+            for _ in range(6):
+                next_pos = _skip_field(buf, next_pos, buf_len)
+        else:
+            status, next_pos = _read_scalar_field(buf, next_pos, buf_len)
+            next_pos = _skip_field(buf, next_pos, buf_len)
+            unit, next_pos = _read_scalar_field(buf, next_pos, buf_len)
+            scaler, next_pos = _read_scalar_field(buf, next_pos, buf_len)
+            value, next_pos = _read_scalar_field(buf, next_pos, buf_len)
+            next_pos = _skip_field(buf, next_pos, buf_len)
+
+            if value is None or isinstance(status, bytes) or isinstance(unit, bytes) or isinstance(scaler, bytes):
+                raise SmlScanError(f"Unexpected SmlListEntry content for {obis} at pos: {pos}")
+
+            # same as smllib: maybe it's ascii, so we try to decode it
+            if isinstance(value, bytes):
+                a_text = value.decode(errors='ignore')
+                value = a_text if a_text.isalnum() else value.hex()
+
+            snapshot.set_entry(obis, value, unit, scaler, status)
+            count += 1
+
+        # don't search in the entry again, since the payload might contain '770701'
+        pos = next_pos
+    return count
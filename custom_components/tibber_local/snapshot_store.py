@@ -0,0 +1,59 @@
+import time
+from dataclasses import asdict, fields
+from typing import Final
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .bridge_metrics import BridgeMetrics
+from .const import DOMAIN
+
+SNAPSHOT_STORAGE_VERSION: Final = 1
+
+# an older snapshot will not be restored (the values of the meter would be misleading)
+SNAPSHOT_MAX_AGE: Final = 1800
+# how often the last snapshot will be written while running (in seconds)
+SNAPSHOT_SAVE_INTERVAL: Final = 300
+
+
+class MeterSnapshotStore(Store):
+    """The last reading & metrics of a node - so the sensors have their values right after the start."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str):
+        super().__init__(hass, SNAPSHOT_STORAGE_VERSION, f"{DOMAIN}.snapshot.{entry_id}")
+
+    async def _async_migrate_func(self, old_major_version: int, old_minor_version: int, old_data: dict) -> dict:
+        if old_major_version == SNAPSHOT_STORAGE_VERSION:
+            return old_data
+        return {}
+
+
+def build_snapshot_data(bridge) -> dict | None:
+    # only real readings of the bridge are stored (and never a restored snapshot again)
+    if not bridge.has_live_data:
+        return None
+    metrics = bridge._metrics_data
+    return {
+        "saved_at": time.time(),
+        "obis_values_time": bridge.get_obis_values_time(),
+        "obis_values": bridge._obis_values.as_list(),
+        "metrics_time": bridge._LAST_METRICS_UPDATE if metrics is not None else None,
+        "metrics": asdict(metrics) if metrics is not None else None,
+    }
+
+
+def restore_snapshot_data(bridge, data: dict, max_age: float = SNAPSHOT_MAX_AGE) -> float | None:
+    """Returns the age (in seconds) of the restored values - or None, when nothing has been restored."""
+    try:
+        age = time.time() - float(data.get("obis_values_time") or 0)
+        if age > max_age or not bridge.restore_obis_values(data.get("obis_values") or []):
+            return None
+
+        metrics = data.get("metrics")
+        metrics_time = float(data.get("metrics_time") or 0)
+        if isinstance(metrics, dict) and time.time() - metrics_time <= max_age:
+            names = {a_field.name for a_field in fields(BridgeMetrics)}
+            bridge.restore_metrics(BridgeMetrics(**{k: v for k, v in metrics.items() if k in names}), metrics_time)
+        return age
+    except (TypeError, ValueError, AttributeError):
+        return None
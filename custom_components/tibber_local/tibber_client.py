@@ -5,6 +5,8 @@ import random
 import re
 import time
 from asyncio import CancelledError
+from collections import deque
+from contextlib import asynccontextmanager
 from typing import Final
 
 import aiohttp
@@ -13,8 +15,9 @@ from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 from smllib import SmlStreamReader
 from smllib.const import UNITS
-from smllib.errors import CrcError, SmlLibException
-from smllib.sml import SmlListEntry, ObisCode
+from smllib.errors import CrcError
+from smllib.sml import ObisCode
+from smllib.sml_frame import SmlFrame
 
 from .const import (
     ENUM_MODES,
@@ -27,29 +30,72 @@ from .const import (
     ENUM_IMPLEMENTATIONS,
     DATA_KEY,
     METRICS_KEY,
+    CONF_NOTIFY_INTERVAL,
+    CONF_NOTIFY_LEADING_EDGE,
+    CONF_NOTIFY_TRAILING_EDGE,
+    DEFAULT_NOTIFY_INTERVAL,
+    DEFAULT_NOTIFY_LEADING_EDGE,
+    DEFAULT_NOTIFY_TRAILING_EDGE,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
 )
+from .bridge_metrics import BridgeMetrics
+from .meter_snapshot import MeterSnapshot, MeterSnapshotIndex
+from .obis_codes import intern_obis_code, find_unit_int_from_string
+from .sml_scanner import scan_obis_entries
 
 _LOGGER = logging.getLogger(__name__)
 
 MIN_RETRY_DELAY: Final = 2.5#0.2
 MAX_RETRY_DELAY: Final = 10 #1.2
+# all retries after an invalid payload must be completed within this time (in seconds)
+READ_RETRY_DEADLINE: Final = 30
 
-def gen_log_list(obis_values:dict)-> list:
+# we stop reading a response body, when there is still no complete telegram/frame after this amount of bytes
+MAX_SML_PAYLOAD_SIZE: Final = 32768
+MAX_PLAINTEXT_PAYLOAD_SIZE: Final = 32768
+# smllib's stream reader drops the oldest bytes, when it holds more than 50kB - so we must feed it in small chunks
+# to ensure that a frame is processed before any padding of the bridge can push it out of the buffer
+SML_READ_CHUNK_SIZE: Final = 4096
+
+# the metrics of the bridge are requested every 30 minutes
+METRICS_UPDATE_INTERVAL: Final = 1800
+METRICS_REQUEST_TIMEOUT: Final = 10.0
+
+# the 'nodes.json' and 'node_params.json' of a bridge are shared by all config entries (and the config flow) - they
+# are only requested again after this time (in seconds)
+BRIDGE_JSON_CACHE_TTL: Final = 300
+BRIDGE_JSON_REQUEST_TIMEOUT: Final = 10.0
+
+SML_START_SEQUENCE: Final = b'\x1b\x1b\x1b\x1b\x01\x01\x01\x01'
+
+# the codes that are used for the 'Impressions Ambient' json values
+OBIS_ACTIVE_POWER: Final = intern_obis_code('0100100700ff')
+OBIS_ENERGY_IMPORT: Final = intern_obis_code('0100010800ff')
+
+# the available strategies to extract the OBIS values from a SML frame (ordered by their expected costs)
+PARSE_STRATEGY_SCANNER: Final = "scanner"
+PARSE_STRATEGY_GET_OBIS: Final = "get_obis"
+PARSE_STRATEGY_PARSE_FRAME: Final = "parse_frame"
+PARSE_STRATEGIES: Final = [PARSE_STRATEGY_SCANNER, PARSE_STRATEGY_GET_OBIS, PARSE_STRATEGY_PARSE_FRAME]
+
+class TibberLocalPayloadError(Exception):
+    pass
+
+def gen_log_list(obis_values: MeterSnapshot)-> list:
     a_list = []
     try:
-        for a_obis in obis_values.values():
-            a_list.append(format_entry_short(a_obis))
+        for a_obis in obis_values.keys():
+            a_list.append(format_entry_short(a_obis, obis_values.get_value(a_obis), obis_values.get_unit(a_obis)))
     except BaseException:
         pass
     return a_list
 
-def format_entry_short(entry: SmlListEntry) -> str:
+def format_entry_short(obis: ObisCode, value, unit_int: int | None) -> str:
     try:
-        value = entry.get_value()
-        if entry.unit:
-            unit = UNITS.get(entry.unit, f' ?:{entry.unit}')
-            return f'{entry.obis.obis_short} ({entry.obis}): {value}{unit}'
-        return f'{entry.obis.obis_short} ({entry.obis}): {value}'
+        if unit_int:
+            unit = UNITS.get(unit_int, f' ?:{unit_int}')
+            return f'{obis.obis_short} ({obis}): {value}{unit}'
+        return f'{obis.obis_short} ({obis}): {value}'
     except Exception:
         return 'A_ERROR_OBIS_SHORT'
 
@@ -83,12 +129,6 @@ def ws_parse_header_bytes(sml_head: bytes):
         _LOGGER.info(f"ws_parse_header_bytes(): Failed to parse bytes header: {e}")
     return None
 
-def find_unit_int_from_string(unit_str: str):
-    for aUnit in UNITS.items():
-        if aUnit[1] == unit_str:
-            return aUnit[0]
-    return None
-
 def clean_host(host_input):
         # Ensure it looks like a URL so urlparse can handle it
         if "://" not in host_input:
@@ -104,31 +144,619 @@ def clean_host(host_input):
             return parsed.hostname
 
 
-class TibberLocalBridge:
-    ONLY_DIGITS: re.Pattern = re.compile("^[0-9]+$")
-    PLAIN_TEXT_LINE: re.Pattern = re.compile(r'(.*?)-(.*?):(.*?)\.(.*?)\.(.*?)(?:\*(.*?)|)\((.*?)\)')
-    # matches OBIS codes with only one dot ('1-0:1.8(...)' or '1-0:1.8*255(...)') - the optional
-    # '*f' part is kept in its own group, so the missing '.e' is inserted at the right position
-    TWO_DIGIT_CODE_PATTERN: re.Pattern = re.compile(r'^([^.]*\.[^.]*?)(\*[^.(]*)?(\(.*$)')
-
-    def obis_hex_from_parts(self, obis_src: list, do_log_output: bool) -> str | None:
-        """Convert the regex parts 'a-b:c.d.e*f' into the 12 char hex OBIS code smllib expects."""
+class TibberLocalSmlStream:
+    """A long living SML stream (one per websocket connection).
+
+    Incomplete frames are kept till the next websocket message arrives - and garbage will
+    only be dropped up to the next SML escape/start sequence."""
+
+    def __init__(self):
+        self._reader = SmlStreamReader()
+        self.crc_error_count = 0
+
+    def add(self, payload: bytes):
+        self._reader.add(payload)
+
+    def clear(self):
+        self._reader.clear()
+
+    def get_frames(self) -> list[SmlFrame]:
+        frames = []
+        while True:
+            try:
+                sml_frame = self._reader.get_frame()
+            except CrcError as crc_exc:
+                self.crc_error_count = self.crc_error_count + 1
+                # the reader has already removed the corrupt bytes from its buffer - but when the corrupt
+                # part contains another start sequence (e.g. a truncated frame followed by a complete one)
+                # then we must keep everything from this start sequence on
+                resync_pos = crc_exc.msg.find(SML_START_SEQUENCE, 1)
+                if resync_pos != -1:
+                    self._reader.bytes = crc_exc.msg[resync_pos:] + self._reader.bytes
+                _LOGGER.debug(f"TibberLocalSmlStream.get_frames(): CRC error - resync at: {resync_pos}")
+                continue
+
+            if sml_frame is None:
+                break
+            frames.append(sml_frame)
+
+        # without a start sequence in the buffer, there is only garbage left - we just keep the
+        # last bytes (since they could be the beginning of the next start sequence)
+        if self._reader.bytes.find(SML_START_SEQUENCE) == -1:
+            self._reader.bytes = self._reader.bytes[-(len(SML_START_SEQUENCE) - 1):]
+        return frames
+
+
+class TibberLocalCoalescingNotifier:
+    """Calls the callback at most once per 'interval' (seconds) - all notifications in between are coalesced.
+
+    With 'leading' the callback is called immediately when the interval since the last call has passed, with
+    'trailing' a coalesced notification is delivered at the end of the interval. There is never more than one
+    timer scheduled (and no task is created per notification)."""
+
+    def __init__(self, callback, interval: float = DEFAULT_NOTIFY_INTERVAL, leading: bool = DEFAULT_NOTIFY_LEADING_EDGE,
+                 trailing: bool = DEFAULT_NOTIFY_TRAILING_EDGE):
+        self._callback = callback
+        self.interval = max(0.0, float(interval))
+        self.leading = leading
+        # without any edge no notification would be delivered at all
+        self.trailing = trailing or not leading
+        self._timer: asyncio.TimerHandle | None = None
+        self._last_call = None
+        self.notify_count = 0
+        self.call_count = 0
+        self.coalesced_count = 0
+
+    def notify(self):
+        self.notify_count = self.notify_count + 1
+        if self._timer is not None:
+            # the already scheduled call will deliver this notification too
+            self.coalesced_count = self.coalesced_count + 1
+            return
+
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        window_end = self._last_call + self.interval if self._last_call is not None else now
+        if self.leading and window_end <= now:
+            self._call(now)
+        elif self.trailing:
+            if not self.leading:
+                window_end = max(window_end, now + self.interval)
+            self._timer = loop.call_at(window_end, self._call_from_timer)
+        else:
+            self.coalesced_count = self.coalesced_count + 1
+
+    def cancel(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def _call_from_timer(self):
+        self._timer = None
+        self._call(asyncio.get_running_loop().time())
+
+    def _call(self, now: float):
+        self._last_call = now
+        self.call_count = self.call_count + 1
+        try:
+            self._callback()
+        except BaseException as exc:
+            _LOGGER.warning(f"TibberLocalCoalescingNotifier._call(): callback caused {type(exc).__name__} - {exc}")
+
+    def as_dict(self) -> dict:
+        return {
+            "interval": self.interval,
+            "leading": self.leading,
+            "trailing": self.trailing,
+            "notifications": self.notify_count,
+            "calls": self.call_count,
+            "coalesced": self.coalesced_count,
+        }
+
+
+# all request schedulers - key is the host of the bridge
+_REQUEST_SCHEDULERS: dict[str, "TibberLocalRequestScheduler"] = {}
+
+
+def get_request_scheduler(host: str) -> "TibberLocalRequestScheduler":
+    # the limit of the concurrent requests is set by the config entries (see 'set_limit()') - a lookup (e.g. by
+    # the config flow) must not change it
+    scheduler = _REQUEST_SCHEDULERS.get(host)
+    if scheduler is None:
+        scheduler = TibberLocalRequestScheduler(host)
+        _REQUEST_SCHEDULERS[host] = scheduler
+    return scheduler
+
+
+class TibberLocalRequestScheduler:
+    """Limits the concurrent HTTP requests to one bridge (of all config entries) - the web server of the bridge
+    returns corrupted payloads, when it has to serve multiple requests at the same time. The requests will get
+    their slot in the order they have been made.
+
+    The scheduler also spreads the polling of the config entries of the bridge evenly over the scan interval."""
+
+    def __init__(self, host: str, max_concurrent: int = DEFAULT_MAX_CONCURRENT_REQUESTS):
+        self.host = host
+        self.max_concurrent = max(1, int(max_concurrent))
+        # the config entries that use the scheduler (it will be dropped, when the last one has been released)
+        self._entries: set[str] = set()
+        # config entry -> the limit that has been configured in the options of the entry
+        self._limits: dict[str, int] = {}
+        self._running = 0
+        self._waiters: deque[asyncio.Future] = deque()
+        # poll key -> scan interval & scan interval -> the (loop) second of the first slot of the interval
+        self._pollers: dict[str, int] = {}
+        self._poll_anchors: dict[int, int] = {}
+        self.request_count = 0
+        self.queued_count = 0
+        self.total_wait_time = 0.0
+        self.max_wait_time = 0.0
+
+    def add_entry(self, key: str):
+        self._entries.add(key)
+
+    def release(self, key: str):
+        """Remove the limit & the poll slot of the config entry - the scheduler of the bridge is dropped, when it
+        has been the last entry."""
+        self.remove_poller(key)
+        self.remove_limit(key)
+        self._entries.discard(key)
+        if len(self._entries) == 0 and _REQUEST_SCHEDULERS.get(self.host) is self:
+            _REQUEST_SCHEDULERS.pop(self.host)
+
+    def set_limit(self, key: str, max_concurrent: int):
+        self._limits[key] = max(1, int(max_concurrent))
+        self._apply_limits()
+
+    def remove_limit(self, key: str):
+        if self._limits.pop(key, None) is not None:
+            self._apply_limits()
+
+    def _apply_limits(self):
+        # when the entries of the bridge disagree, the most careful limit wins
+        self.max_concurrent = min(self._limits.values(), default=DEFAULT_MAX_CONCURRENT_REQUESTS)
+        self._wake_up()
+
+    @asynccontextmanager
+    async def slot(self):
+        start_time = time.monotonic()
+        if self._running < self.max_concurrent and len(self._waiters) == 0:
+            self._running = self._running + 1
+        else:
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except CancelledError:
+                if waiter.done() and not waiter.cancelled():
+                    # the slot has already been handed over to us
+                    self._release()
+                elif waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                raise
+            self.queued_count = self.queued_count + 1
+
+        wait_time = time.monotonic() - start_time
+        self.request_count = self.request_count + 1
+        self.total_wait_time = self.total_wait_time + wait_time
+        self.max_wait_time = max(self.max_wait_time, wait_time)
+        try:
+            yield wait_time
+        finally:
+            self._release()
+
+    def _release(self):
+        self._running = self._running - 1
+        self._wake_up()
+
+    def _wake_up(self):
+        while self._running < self.max_concurrent and len(self._waiters) > 0:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self._running = self._running + 1
+                waiter.set_result(True)
+
+    def register_poller(self, key: str, interval: int):
+        interval = max(1, int(interval))
+        self._pollers[key] = interval
+        if interval not in self._poll_anchors:
+            self._poll_anchors[interval] = int(asyncio.get_running_loop().time())
+
+    def remove_poller(self, key: str):
+        interval = self._pollers.pop(key, None)
+        if interval is not None and interval not in self._pollers.values():
+            self._poll_anchors.pop(interval, None)
+
+    def get_next_poll_delay(self, key: str) -> int:
+        """The seconds till the next poll of the key - the keys with the same scan interval get evenly spaced
+        slots (interval * i / n). Since this is asked before every poll, the slots will be rebalanced, when a key
+        has been added or removed."""
+        interval = self._pollers.get(key)
+        if interval is None:
+            return 0
+        group = [a_key for a_key, an_interval in self._pollers.items() if an_interval == interval]
+        phase = self._poll_anchors[interval] + (interval * group.index(key)) // len(group)
+        now = int(asyncio.get_running_loop().time())
+        # the next slot that is at least half an interval away - so a late poll will not be followed right away
+        delay = (phase - now) % interval
+        if delay < (interval + 1) // 2:
+            delay = delay + interval
+        return delay
+
+    def as_dict(self) -> dict:
+        return {
+            "max_concurrent": self.max_concurrent,
+            "pollers": len(self._pollers),
+            "requests": self.request_count,
+            "queued_requests": self.queued_count,
+            "total_wait_s": round(self.total_wait_time, 3),
+            "avg_wait_s": round(self.total_wait_time / self.request_count, 3) if self.request_count > 0 else None,
+            "max_wait_s": round(self.max_wait_time, 3),
+        }
+
+
+# key is the url and the credentials -> (monotonic time of the response, json response)
+_BRIDGE_JSON_CACHE: dict[tuple, tuple] = {}
+# the requests that are currently running - concurrent callers will wait for the same response
+_BRIDGE_JSON_REQUESTS: dict[tuple, asyncio.Task] = {}
+_BRIDGE_JSON_STATS = {"requests": 0, "cache_hits": 0, "shared_requests": 0}
+
+
+async def get_bridge_json_cached(web_session, url: str, basic_auth, scheduler: "TibberLocalRequestScheduler | None" = None):
+    key = (url, basic_auth)
+    cached = _BRIDGE_JSON_CACHE.get(key)
+    if cached is not None and cached[0] + BRIDGE_JSON_CACHE_TTL > time.monotonic():
+        _BRIDGE_JSON_STATS["cache_hits"] = _BRIDGE_JSON_STATS["cache_hits"] + 1
+        return cached[1]
+
+    request = _BRIDGE_JSON_REQUESTS.get(key)
+    if request is None:
+        request = asyncio.create_task(_get_bridge_json(web_session, url, basic_auth, scheduler))
+        _BRIDGE_JSON_REQUESTS[key] = request
+        request.add_done_callback(lambda a_task: _bridge_json_request_done(key, a_task))
+    else:
+        _BRIDGE_JSON_STATS["shared_requests"] = _BRIDGE_JSON_STATS["shared_requests"] + 1
+    # a cancelled caller must not cancel the request of the other callers
+    return await asyncio.shield(request)
+
+
+def _bridge_json_request_done(key: tuple, request: asyncio.Task):
+    _BRIDGE_JSON_REQUESTS.pop(key, None)
+    # when all callers have been cancelled, nobody would retrieve the exception of the request
+    if not request.cancelled() and request.exception() is not None:
+        _LOGGER.debug(f"_bridge_json_request_done(): request to {key[0]} failed: {type(request.exception()).__name__} - {request.exception()}")
+
+
+async def _get_bridge_json(web_session, url: str, basic_auth, scheduler: "TibberLocalRequestScheduler | None" = None):
+    if scheduler is not None:
+        async with scheduler.slot():
+            return await _get_bridge_json(web_session, url, basic_auth)
+
+    _BRIDGE_JSON_STATS["requests"] = _BRIDGE_JSON_STATS["requests"] + 1
+    async with web_session.get(url, auth=basic_auth, ssl=False, timeout=BRIDGE_JSON_REQUEST_TIMEOUT) as res:
+        res.raise_for_status()
+        if res.status == 200:
+            json_resp = await res.json()
+            # failed requests are not cached
+            _BRIDGE_JSON_CACHE[(url, basic_auth)] = (time.monotonic(), json_resp)
+            return json_resp
+    return None
+
+
+# all websocket hubs - key is the websocket url and the credentials (so all nodes of a bridge share one connection)
+_WS_HUBS: dict[tuple, "TibberLocalWebSocketHub"] = {}
+
+
+def get_ws_hub(url_ws: str, web_session, basic_auth) -> "TibberLocalWebSocketHub":
+    key = (url_ws, basic_auth)
+    hub = _WS_HUBS.get(key)
+    if hub is None or hub.web_session is not web_session:
+        hub = TibberLocalWebSocketHub(url_ws, web_session, basic_auth)
+        _WS_HUBS[key] = hub
+    return hub
+
+
+class TibberLocalWebSocketHub:
+    """One websocket connection to a bridge - shared by all nodes (config entries) of the bridge.
+
+    The header of each message is only parsed once, then the message is routed by its 'device:' (EUI) to the
+    attached nodes. Nodes without a known device will get all messages. The connection is opened with the
+    first attached node and closed, when the last node has been detached."""
+
+    def __init__(self, url_ws: str, web_session, basic_auth):
+        self.url_ws = url_ws
+        self.web_session = web_session
+        self.basic_auth = basic_auth
+        self.ws_obj = None
+        self.connected = False
+        self.supported = True
+        self.last_update = 0
+        self._nodes: dict[int, "TibberLocalBridge"] = {}
+        # device -> the nodes that will receive the messages of the device
+        self._routes: dict[str, tuple] = {}
+        self._default_route: tuple = ()
+        self._task: asyncio.Task | None = None
+        self._closing = False
+        self.connect_count = 0
+        self.message_count = 0
+        self.unrouted_count = 0
+
+    @property
+    def refcount(self) -> int:
+        return len(self._nodes)
+
+    def is_attached(self, node) -> bool:
+        return id(node) in self._nodes
+
+    def attach(self, node):
+        if id(node) not in self._nodes:
+            self._nodes[id(node)] = node
+            self._update_routes()
+            _LOGGER.debug(f"attach(): node with device '{node.node_device_id}' attached to {self.url_ws} [refcount: {self.refcount}]")
+
+    def reroute(self, node):
+        # the device of an attached node has changed - its messages will be routed by the new device
+        if id(node) in self._nodes:
+            self._update_routes()
+            _LOGGER.debug(f"reroute(): node with device '{node.node_device_id}' rerouted on {self.url_ws}")
+
+    async def detach(self, node):
+        if self._nodes.pop(id(node), None) is not None:
+            self._update_routes()
+            _LOGGER.debug(f"detach(): node with device '{node.node_device_id}' detached from {self.url_ws} [refcount: {self.refcount}]")
+            if self.refcount == 0:
+                if _WS_HUBS.get((self.url_ws, self.basic_auth)) is self:
+                    _WS_HUBS.pop((self.url_ws, self.basic_auth))
+                await self.close()
+                if self.refcount > 0:
+                    # a node has been attached (again) while closing - it will start its own connection
+                    return
+                if self._task is not None and not self._task.done():
+                    # the connection might not be established yet
+                    self._task.cancel()
+                self._task = None
+
+    def _update_routes(self):
+        # nodes without a device (the EUI could not be read from the bridge) get all messages
+        self._default_route = tuple(a_node for a_node in self._nodes.values() if a_node.node_device_id is None)
+        routes = {}
+        for a_node in self._nodes.values():
+            if a_node.node_device_id is not None:
+                routes[a_node.node_device_id] = routes.get(a_node.node_device_id, ()) + (a_node,)
+        self._routes = {a_device: a_route + self._default_route for a_device, a_route in routes.items()}
+
+    async def connect_and_wait(self, node):
+        """Attach the node and wait till the (shared) connection has been closed - cancelling the waiting node
+        will not close the connection for the other nodes."""
+        self.attach(node)
+        if self._task is not None and not self._task.done() and self._closing:
+            # the previous connection is still shutting down (e.g. it was stale) - we must not join it
+            await asyncio.wait((self._task,))
+        if self._task is None or self._task.done():
+            self._closing = False
+            self._task = asyncio.create_task(self._ws_run())
+        await asyncio.shield(self._task)
+
+    async def _ws_run(self):
+        ws = None
         try:
-            values = [int(part) for part in obis_src[1:6]]
-            values.append(int(obis_src[6]) if obis_src[6] else 255)
-            return bytes(values).hex()
-        except (ValueError, TypeError) as e:
-            if do_log_output:
-                _LOGGER.warning(f"could not parse a value as int from list {obis_src} - ... - Exception: {e}")
+            async with self.web_session.ws_connect(self.url_ws, auth=self.basic_auth, compress=0) as ws:
+                self.connected = True
+                self.ws_obj = ws
+                self.connect_count = self.connect_count + 1
+                _LOGGER.info(f"ws_connect(): connected to websocket: {self.url_ws} - for {self.refcount} node(s)")
+                async for msg in ws:
+                    self.last_update = time.time()
+                    self.message_count = self.message_count + 1
+
+                    if msg.type == aiohttp.WSMsgType.BINARY:
+                        try:
+                            binary_data = msg.data
+                            # Find the position of '>' and extract everything after it
+                            separator_pos = binary_data.index(b'>')
+                            if separator_pos > 0:
+                                binary_head = binary_data[:separator_pos + 1]
+                                _LOGGER.debug(f"ws_connect(): WSMsgType.BINARY head: {binary_head}")
+                                topic, device_id = ws_parse_header_bytes(binary_head)
+                                self._route(topic, device_id, binary_data[separator_pos + 1:], "WSMsgType.BINARY")
+                            else:
+                                _LOGGER.debug(f"ws_connect(): WSMsgType.BINARY invalid data (NO '>' FOUND) in: {binary_data}")
+
+                        except Exception as e:
+                            _LOGGER.debug(f"ws_connect(): Could not read WSMsgType.BINARY from: {msg} - caused {type(e).__name__} {e}")
+
+                    elif msg.type == aiohttp.WSMsgType.TEXT:
+                        try:
+                            # make sure we have a string text here - but to be honest, so far none there has been
+                            # no evidence that a TibberPuldeBridge would send `WSMsgType.TEXT` - so all this here
+                            # is really just a fallback...
+                            if hasattr(msg.data, "decode"):
+                                text_data = msg.data.decode('ascii', errors='ignore')
+                            elif isinstance(msg.data, str):
+                                text_data = msg.data
+                            else:
+                                text_data = str(msg.data)
+
+                            separator_pos = text_data.index('>')
+                            if separator_pos > 0:
+                                text_head = text_data[:separator_pos + 1]
+                                _LOGGER.debug(f"ws_connect(): WSMsgType.TEXT head: {text_head}")
+                                topic, device_id = ws_parse_header_string(text_head)
+                                self._route(topic, device_id, text_data[separator_pos + 1:], "WSMsgType.TEXT")
+                            else:
+                                _LOGGER.debug(f"ws_connect(): WSMsgType.TEXT invalid data (NO '>' FOUND) in: {text_data}")
+
+                        except Exception as e:
+                            _LOGGER.debug(f"ws_connect(): Could not read WSMsgType.TEXT from: {msg} - caused {type(e).__name__} {e}")
+
+                    elif msg.type in (aiohttp.WSMsgType.CLOSED, aiohttp.WSMsgType.ERROR):
+                        _LOGGER.debug(f"ws_connect(): received: {msg}")
+                        break
+
+        except ClientResponseError as cre:
+            if hasattr(cre, "status") and cre.status == 404:
+                _LOGGER.info(f"ws_connect(): Could not connect to websocket at {self.url_ws} - [HTTP:404] - looks like bridge firmware update '1428-6debbaf6/795-379a5e21' not installed")
+                self.supported = False
+            else:
+                _LOGGER.error(f"ws_connect(): Could not connect to websocket: {type(cre).__name__} - {cre}")
+        except ClientConnectionError as err:
+            _LOGGER.error(f"ws_connect(): Could not connect to websocket: {type(err).__name__} - {err}")
+        except asyncio.TimeoutError as time_exc:
+            _LOGGER.debug(f"ws_connect(): TimeoutError: No WebSocket message received within timeout period: {type(time_exc).__name__} - {time_exc}")
+        except CancelledError as canceled:
+            _LOGGER.debug(f"ws_connect(): Terminated? - {type(canceled).__name__} - {canceled}")
+        except BaseException as x:
+            _LOGGER.error(f"ws_connect(): !!! {type(x).__name__} - {x}")
+
+        _LOGGER.debug(f"ws_connect(): -- END HAS REACHED -- {self.url_ws}")
+        self.connected = False
+        if ws is not None:
+            try:
+                await ws.close()
+            except BaseException as e:
+                _LOGGER.info(f"ws_connect(): Error closing WebSocket connection: {type(e).__name__} - {e}")
+        self.ws_obj = None
+
+    def _route(self, topic, device_id, body: bytes | str, source: str):
+        nodes = self._routes.get(device_id, self._default_route)
+        if len(nodes) == 0:
+            self.unrouted_count = self.unrouted_count + 1
+            _LOGGER.debug(f"ws_connect(): {source} no node attached for the device in the message {device_id}")
+            return
+        for a_node in nodes:
+            a_node.ws_handle_message(topic, body, source)
+
+    async def close(self):
+        """Close the shared WebSocket connection (for all nodes)."""
+        self.connected = False
+        self._closing = True
+        ws = self.ws_obj
+        if ws is not None:
+            try:
+                await ws.close()
+                _LOGGER.debug(f"ws_close(): connection to {self.url_ws} closed successfully")
+            except BaseException as e:
+                _LOGGER.info(f"ws_close(): Error closing WebSocket connection: {type(e).__name__} - {e}")
+            finally:
+                self.ws_obj = None
+
+    def check_last_update(self) -> bool:
+        return self.last_update + 50 > time.time()
+
+    def as_dict(self) -> dict:
+        return {
+            "connected": self.connected,
+            "nodes": self.refcount,
+            "connects": self.connect_count,
+            "messages": self.message_count,
+            "unrouted_messages": self.unrouted_count,
+        }
+
+
+class TibberLocalParseStrategySelector:
+    """Keeps track of the success rate & the parse time of each SML parse strategy (over a sliding window).
+
+    The cheapest strategy that works is tried first - and from time to time one of the other strategies will
+    be probed, so that a strategy that failed only for a burst of corrupted frames can be selected again."""
+    WINDOW_SIZE: Final = 20
+    MIN_SUCCESS_RATE: Final = 0.5
+    PROBE_INTERVAL: Final = 10
+    MIN_SAMPLES: Final = 3
+
+    def __init__(self, strategies: list[str] = PARSE_STRATEGIES):
+        self._strategies = list(strategies)
+        self._results = {a_strategy: deque(maxlen=self.WINDOW_SIZE) for a_strategy in self._strategies}
+        self._frame_counter = 0
+        self._probe_counter = 0
+
+    def _success_rate(self, strategy: str) -> float | None:
+        results = self._results[strategy]
+        if len(results) == 0:
+            return None
+        return sum(1 for a_result in results if a_result[0]) / len(results)
+
+    def _parse_time(self, strategy: str) -> float | None:
+        # the median - so a single slow parse (e.g. the very first one) will not disqualify a strategy
+        durations = sorted(a_result[1] for a_result in self._results[strategy] if a_result[0])
+        if len(durations) == 0:
             return None
+        return durations[len(durations) // 2]
+
+    def _rank(self, strategy: str) -> tuple:
+        # the working strategies are ranked by their average parse time - strategies without any results come after
+        # them (in the order of their expected costs, the probing will collect their samples) - and strategies that
+        # fail too often always at the end
+        success_rate = self._success_rate(strategy)
+        if success_rate is None:
+            return 0, float('inf'), self._strategies.index(strategy)
+        if success_rate < self.MIN_SUCCESS_RATE:
+            return 1, 1 - success_rate, self._strategies.index(strategy)
+        parse_time = self._parse_time(strategy)
+        return 0, 0 if parse_time is None else parse_time, self._strategies.index(strategy)
+
+    def get_order(self) -> list[str]:
+        self._frame_counter = self._frame_counter + 1
+        order = sorted(self._strategies, key=self._rank)
+        if self._frame_counter % self.PROBE_INTERVAL == 0:
+            # probing makes only sense for strategies that are (or could be) cheaper than the preferred one
+            preferred_time = self._parse_time(order[0])
+            candidates = [a_strategy for a_strategy in order[1:] if preferred_time is None or
+                          len(self._results[a_strategy]) < self.MIN_SAMPLES or
+                          self._parse_time(a_strategy) is None or self._parse_time(a_strategy) < preferred_time]
+            if len(candidates) > 0:
+                probe = candidates[self._probe_counter % len(candidates)]
+                self._probe_counter = self._probe_counter + 1
+                order.remove(probe)
+                order.insert(0, probe)
+        return order
+
+    def add_result(self, strategy: str, success: bool, parse_time: float):
+        self._results[strategy].append((success, parse_time))
+
+    def get_preferred(self) -> str:
+        return sorted(self._strategies, key=self._rank)[0]
+
+    def prefer(self, strategy: str):
+        # the strategy will be tried first - as long as there are no results (e.g. from a previous run)
+        if strategy in self._strategies:
+            self._strategies.remove(strategy)
+            self._strategies.insert(0, strategy)
+
+    def as_dict(self) -> dict:
+        a_dict = {"frames": self._frame_counter, "probes": self._probe_counter, "preferred_order": sorted(self._strategies, key=self._rank)}
+        for a_strategy in self._strategies:
+            success_rate = self._success_rate(a_strategy)
+            parse_time = self._parse_time(a_strategy)
+            a_dict[a_strategy] = {
+                "samples": len(self._results[a_strategy]),
+                "success_rate": None if success_rate is None else round(success_rate, 3),
+                "median_parse_time_ms": None if parse_time is None else round(parse_time * 1000, 3),
+            }
+        return a_dict
 
-    def check_first_six_parts_for_digits_or_last_is_none(self, parts: list[str]) -> bool:
-        return (self.ONLY_DIGITS.match(parts[1]) is not None and
-                self.ONLY_DIGITS.match(parts[2]) is not None and
-                self.ONLY_DIGITS.match(parts[3]) is not None and
-                self.ONLY_DIGITS.match(parts[4]) is not None and
-                self.ONLY_DIGITS.match(parts[5]) is not None and
-                (parts[6] is None or self.ONLY_DIGITS.match(parts[6]) is not None))
+
+class TibberLocalBridge:
+    # single pass over a plaintext/IEC 62056-21 line - the obis pattern is 'a-b:c.d.e*f(value*unit)' where:
+    # - the 'a-b:' prefix is missing in the format 'IEC-62056-21' [this is really a very DUMP implementation]
+    # - some meters provide codes with only one dot ('1-0:1.8(...)' or '1-0:1.8*255(...)') [see issue #73]
+    # - the '*f' part is optional, and the unit (with its possible 'kilo' prefix) too
+    PLAIN_TEXT_LINE: re.Pattern = re.compile(r'(?:(\d+)-(\d+):)?(\d+)\.(\d+)(?:\.(\d+))?(?:\*(\d+))?\(([^*)]*)(?:\*([kK]?)([^)]*))?\)')
+
+    def _plain_text_obis_code(self, a_match: re.Match) -> ObisCode | None:
+        key = a_match.group(1, 2, 3, 4, 5, 6)
+        if key in self._plain_text_obis_codes:
+            return self._plain_text_obis_codes[key]
+
+        a, b, c, d, e, f = key
+        values = (1 if a is None else int(a), 0 if b is None else int(b), int(c), int(d),
+                  0 if e is None else int(e), 255 if f is None else int(f))
+        obis = None
+        if max(values) <= 255:
+            obis = intern_obis_code(values)
+        # the cache must not grow endless, when the bridge is sending garbage
+        if len(self._plain_text_obis_codes) < 256:
+            self._plain_text_obis_codes[key] = obis
+        return obis
 
     # _communication_mode 'MODE_3_SML_1_04' is the initially implemented mode (reading binary sml data)...
     # 'all' other modes have to be implemented... also it could be that the bridge does
@@ -152,58 +780,85 @@ class TibberLocalBridge:
             # websocket stuff...
             self.url_ws = f"ws://{a_host}/ws"
 
+            # all HTTP requests to the bridge (of all nodes) are queued
+            self._request_scheduler = get_request_scheduler(a_host)
+
         # The 'self.node_device_id' will be needed if multiple pulses are connected to the
         # bridge - and the websocket does not include the node_id (node nummer), instead
         # there is a '<device ...' header that must be used to identify the actual node.
         # The value will be init by calling 'get_eui_for_node()'
         self.node_device_id = None
 
-        self.ws_connected = False
+        # the websocket connection is shared by all nodes of the bridge (see 'TibberLocalWebSocketHub')
+        self._ws_hub: TibberLocalWebSocketHub | None = None
         self.ws_supported = True
-        self.ws_obj = None
+        self._ws_sml_stream: TibberLocalSmlStream | None = None
         self._ws_LAST_UPDATE = 0
-        self._ws_debounced_update_task: asyncio.Task | None = None
-        self._ws_LAST_NEW_DATA_NOTIFY = 0
+        notify_options = options if options is not None else {}
+        self._ws_notifier = TibberLocalCoalescingNotifier(self._ws_notify_coordinator,
+                                                          interval=notify_options.get(CONF_NOTIFY_INTERVAL, DEFAULT_NOTIFY_INTERVAL),
+                                                          leading=notify_options.get(CONF_NOTIFY_LEADING_EDGE, DEFAULT_NOTIFY_LEADING_EDGE),
+                                                          trailing=notify_options.get(CONF_NOTIFY_TRAILING_EDGE, DEFAULT_NOTIFY_TRAILING_EDGE))
+
+        # one slot mailbox between receiving and parsing the websocket messages - only the latest message will be
+        # parsed (when the event loop was stalled, the older ones are superseded)
+        self._ws_mailbox: tuple | None = None
+        self._ws_mailbox_event: asyncio.Event | None = None
+        self._ws_process_task: asyncio.Task | None = None
+        self._ws_superseded_counter = 0
 
         self._com_mode = com_mode
         self.ignore_parse_errors = False
         if options is not None and "ignore_parse_errors" in options:
             self.ignore_parse_errors = options["ignore_parse_errors"]
-        self._metrics_update_is_running = False
+        self._metrics_lock = asyncio.Lock()
+        self._metrics_task: asyncio.Task | None = None
         self._LAST_METRICS_UPDATE = 0
-        self._metrics_data = {}
-        self._obis_values = {}
-        #self._obis_values_by_short = {}
-
-        self._fallback_usage_counter = 0
-        self._use_fallback_by_default = False
+        self._metrics_data: BridgeMetrics | None = None
+        # the parsers fill the spare snapshot - and when this was successful, it will become the current one. There
+        # are three snapshots, since the coordinator might still publish the previous one (see '_next_spare_obis_values()')
+        self._obis_index = MeterSnapshotIndex()
+        self._obis_snapshots = (MeterSnapshot(self._obis_index), MeterSnapshot(self._obis_index), MeterSnapshot(self._obis_index))
+        self._obis_values = self._obis_snapshots[0]
+        self._spare_obis_values = self._obis_snapshots[1]
+
+        # the last payload that has been successfully processed (as tuple of mode and raw payload)
+        self._last_payload = None
+        self._duplicate_payload_counter = 0
+        self._repaired_payload_counter = 0
+        self._closed_early_counter = 0
+
+        self._parse_strategy_selector = TibberLocalParseStrategySelector()
+
+        # the average time between two new meter readings (in seconds)
+        self.frame_interval: float | None = None
+        self._last_frame_time: float | None = None
+
+        # the OBIS codes that have been found in plaintext lines (key is the tuple of the six matched code groups)
+        self._plain_text_obis_codes: dict[tuple, ObisCode | None] = {}
         if com_mode == MODE_3_SML_1_04:
             self.MAX_READ_RETRIES = 5
         else:
             self.MAX_READ_RETRIES = 1
+        self._read_retry_task: asyncio.Task | None = None
+        self._read_retry_stats = {"runs": 0, "attempts": 0, "succeeded": 0, "failed": 0, "time_spent_s": 0.0, "last_run_s": None}
 
         self._coordinator = coordinator
 
     async def get_eui_for_node(self):
         # this must be called when we need a device_id... (when we receive data via websocket)
         try:
-            async with self.web_session.get(self.url_metadata, auth=self.basic_auth, ssl=False, timeout=10.0) as res:
-                try:
-                    res.raise_for_status()
-                    if res.status == 200:
-                        json_resp = await res.json()
-                        for a_node_obj in json_resp:
-                            if int(a_node_obj.get("node_id", -1)) == self.node_number:
-                                a_eui = a_node_obj.get("eui")
-                                if a_eui is not None:
-                                    self.node_device_id = a_eui.lower()
-                                else:
-                                    _LOGGER.warning(f"get_eui_for_node(): bridge does not provide a 'eui' for node {self.node_number}: {a_node_obj}")
-                                break
-                except Exception as exc:
-                    _LOGGER.warning(f"get_eui_for_node(): access to bridge failed with INNER exception: {type({exc}).__name__} - {exc}", stack_info=True)
+            json_resp = await get_bridge_json_cached(self.web_session, self.url_metadata, self.basic_auth, self._request_scheduler)
+            for a_node_obj in json_resp or []:
+                if int(a_node_obj.get("node_id", -1)) == self.node_number:
+                    a_eui = a_node_obj.get("eui")
+                    if a_eui is not None:
+                        self.node_device_id = a_eui.lower()
+                    else:
+                        _LOGGER.warning(f"get_eui_for_node(): bridge does not provide a 'eui' for node {self.node_number}: {a_node_obj}")
+                    break
         except Exception as exc:
-            _LOGGER.warning(f"get_eui_for_node(): access to bridge failed with OUTER exception: {type({exc}).__name__} - {exc}", stack_info=True)
+            _LOGGER.warning(f"get_eui_for_node(): access to bridge failed with exception: {type(exc).__name__} - {exc}", stack_info=True)
 
     async def detect_com_mode(self):
         await self.detect_com_mode_from_node_param27()
@@ -225,14 +880,14 @@ class TibberLocalBridge:
 
     async def _check_modes_internal(self, mode_1: int, mode_2: int):
         _LOGGER.debug(f"detect_com_mode is {self._com_mode}: will try to read {mode_1}")
-        await self.read_tibber_local(mode_1, retry_count=0, log_payload=True)
+        await self.read_tibber_local_with_retries(mode_1, log_payload=True)
         if len(self._obis_values) > 0:
             self._com_mode = mode_1
             _LOGGER.debug(f"detect_com_mode(): 1 SUCCESS -> _com_mode: {self._com_mode}")
         else:
             if (mode_2 != -1):
                 _LOGGER.debug(f"detect_com_mode(): 1 is {self._com_mode}: {mode_1} failed - will try to read {mode_2}")
-                await self.read_tibber_local(mode_2, retry_count=0, log_payload=True)
+                await self.read_tibber_local_with_retries(mode_2, log_payload=True)
                 if len(self._obis_values) > 0:
                     self._com_mode = mode_2
                     _LOGGER.debug(f"detect_com_mode(): 2 SUCCESS -> _com_mode: {self._com_mode}")
@@ -246,66 +901,157 @@ class TibberLocalBridge:
         # {'param_id': 27, 'name': 'meter_mode', 'size': 1, 'type': 'uint8', 'help': '0:IEC 62056-21, 1:Count impressions', 'value': [3]}
         self._com_mode = MODE_UNKNOWN
         try:
-            async with (self.web_session.get(self.url_mode, auth=self.basic_auth, ssl=False, timeout=10.0) as res):
-                try:
-                    res.raise_for_status()
-                    if res.status == 200:
-                        json_resp = await res.json()
-                        for a_parm_obj in json_resp:
-                            if a_parm_obj is not None:
-                                if a_parm_obj.a_parm_obj("param_id", -1) == 27 or a_parm_obj.get("name", "") == "meter_mode":
-                                    if 'value' in a_parm_obj:
-                                        self._com_mode = a_parm_obj['value'][0]
-                                        # check for known modes in the UI (http://YOUR-IP-HERE/nodes/1/config)
-                                        if self._com_mode not in ENUM_MODES:
-                                            self._com_mode = MODE_UNKNOWN
-                                        break
-                except Exception as exc:
-                    _LOGGER.warning(f"detect_com_mode_from_node_param27(): access to bridge failed with INNER exception: {type({exc}).__name__} - {exc}", stack_info=True)
+            json_resp = await get_bridge_json_cached(self.web_session, self.url_mode, self.basic_auth, self._request_scheduler)
+            for a_parm_obj in json_resp or []:
+                if a_parm_obj is not None:
+                    if a_parm_obj.a_parm_obj("param_id", -1) == 27 or a_parm_obj.get("name", "") == "meter_mode":
+                        if 'value' in a_parm_obj:
+                            self._com_mode = a_parm_obj['value'][0]
+                            # check for known modes in the UI (http://YOUR-IP-HERE/nodes/1/config)
+                            if self._com_mode not in ENUM_MODES:
+                                self._com_mode = MODE_UNKNOWN
+                            break
         except Exception as exc:
-            _LOGGER.warning(f"detect_com_mode_from_node_param27(): access to bridge failed with OUTER exception: {type({exc}).__name__} - {exc}", stack_info=True)
+            _LOGGER.warning(f"detect_com_mode_from_node_param27(): access to bridge failed with exception: {type(exc).__name__} - {exc}", stack_info=True)
 
     async def update(self):
-        await self.read_tibber_local(mode=self._com_mode, retry_count=0)
-        await self.updated_tibber_metrics_if_needed()
+        if self._read_retry_task is not None and not self._read_retry_task.done():
+            _LOGGER.debug(f"update(): skipped - since a retry of a previous read is still running")
+        elif not await self.read_tibber_local(mode=self._com_mode):
+            if len(self._obis_values) > 0 and self._coordinator is not None and hasattr(self._coordinator, "_config_entry"):
+                # we have already some data, that the coordinator can use - so we must not block the coordinator
+                # refresh, the retries will be done in the background (and push the data, when they succeed)
+                self._read_retry_task = self._coordinator._config_entry.async_create_background_task(
+                    self._coordinator.hass, self.read_tibber_local_with_retries(mode=self._com_mode, notify_coordinator=True), "read_retry")
+            else:
+                await self.read_tibber_local_with_retries(mode=self._com_mode, first_read_done=True)
 
     async def update_and_log(self):
-        await self.read_tibber_local(mode=self._com_mode, retry_count=0, log_payload=True)
+        await self.read_tibber_local_with_retries(mode=self._com_mode, log_payload=True)
+
+    async def read_tibber_local_with_retries(self, mode: int, log_payload: bool = False, first_read_done: bool = False, notify_coordinator: bool = False) -> bool:
+        if not first_read_done and not notify_coordinator:
+            if await self.read_tibber_local(mode, log_payload):
+                return True
+
+        # bounded & iterative retries - with an overall deadline and a jittered (exponential) backoff
+        start_time = time.monotonic()
+        deadline = start_time + READ_RETRY_DEADLINE
+        self._read_retry_stats["runs"] += 1
+        success = False
+        attempt = 0
+        try:
+            # the deadline includes the requests (each of them could take up to the request timeout)
+            async with asyncio.timeout(READ_RETRY_DEADLINE):
+                while attempt < self.MAX_READ_RETRIES:
+                    # the upper bound starts above MIN_RETRY_DELAY - so already the first retries of the bridges
+                    # that failed together are spread
+                    delay = random.uniform(MIN_RETRY_DELAY, min(MAX_RETRY_DELAY, MIN_RETRY_DELAY * 2 ** (attempt + 1)))
+                    if time.monotonic() + delay > deadline:
+                        _LOGGER.debug(f"read_tibber_local_with_retries(): deadline reached after {attempt} retries")
+                        break
 
-    async def read_tibber_local(self, mode: int, retry_count: int, log_payload: bool = False):
-        _LOGGER.debug(f"read_tibber_local(): start[{retry_count}] - mode: {mode} request: {self.url_data}")
+                    await asyncio.sleep(delay)
+                    attempt = attempt + 1
+                    self._read_retry_stats["attempts"] += 1
+                    try:
+                        success = await self.read_tibber_local(mode, log_payload)
+                    except Exception as exc:
+                        _LOGGER.debug(f"read_tibber_local_with_retries(): retry {attempt} caused: {type(exc).__name__} - {exc}")
+                    if success:
+                        break
+        except asyncio.TimeoutError:
+            _LOGGER.debug(f"read_tibber_local_with_retries(): deadline reached during retry {attempt}")
+        finally:
+            duration = time.monotonic() - start_time
+            self._read_retry_stats["time_spent_s"] = round(self._read_retry_stats["time_spent_s"] + duration, 3)
+            self._read_retry_stats["last_run_s"] = round(duration, 3)
+            self._read_retry_stats["succeeded" if success else "failed"] += 1
+
+        if success and notify_coordinator:
+            self._notify_coordinator()
+        return success
+
+    async def read_tibber_local(self, mode: int, log_payload: bool = False) -> bool:
+        """Reads the data once - returns False, if the bridge returned an invalid payload (and a retry makes sense)."""
         # on init we wait up to 60 seconds till we get a reply from the bridge (when HA is starting, plenty of
-        # requests are running...
-        async with self.web_session.get(self.url_data, auth=self.basic_auth, ssl=False, timeout=60.0 if len(self._obis_values) == 0 else 10.0) as res:
+        # requests are running... - the time waiting for the slot of the bridge is part of it
+        read_timeout = 60.0 if len(self._obis_values) == 0 else 10.0
+        async with asyncio.timeout(read_timeout):
+            async with self._request_scheduler.slot() as wait_time:
+                if wait_time > 0.5:
+                    _LOGGER.debug(f"read_tibber_local(): waited {wait_time:.3f} sec for the bridge")
+                return await self._read_tibber_local(mode, log_payload, read_timeout)
+
+    async def _read_tibber_local(self, mode: int, log_payload: bool = False, read_timeout: float = 10.0) -> bool:
+        _LOGGER.debug(f"read_tibber_local(): start - mode: {mode} request: {self.url_data}")
+        async with self.web_session.get(self.url_data, auth=self.basic_auth, ssl=False, timeout=read_timeout) as res:
             try:
                 res.raise_for_status()
                 if res.status == 200:
-                    if mode == MODE_3_SML_1_04:
-                        await self.mode_03_read_sml(await res.read(), retry_count, log_payload)
-
-                    elif mode == MODE_10_ImpressionsAmbient:
-                        await self.mode_10_read_json_impressions_ambient(await res.json(), retry_count, log_payload)
-
-                    elif mode == MODE_99_PLAINTEXT:
-                        await self.mode_99_read_plaintext(await res.text(), retry_count, log_payload)
+                    try:
+                        if mode == MODE_3_SML_1_04:
+                            await self.mode_03_read_sml(res.content, log_payload)
+
+                        elif mode == MODE_10_ImpressionsAmbient:
+                            await self.mode_10_read_json_impressions_ambient(await res.json(), log_payload)
+
+                        elif mode == MODE_99_PLAINTEXT:
+                            await self.mode_99_read_plaintext(await self.read_plaintext_telegram(res), log_payload)
+                    finally:
+                        # when we stopped reading before the end of the body, the connection can't be reused - but
+                        # when the body was already received completely, the connection is already back in the pool
+                        # (and the transport might be paused) - so we have to discard the buffered rest of the body
+                        if not res.content.at_eof():
+                            self._closed_early_counter = self._closed_early_counter + 1
+                            if res.connection is None:
+                                res.content.read_nowait()
+                            else:
+                                res.close()
 
                     if _LOGGER.isEnabledFor(logging.DEBUG):
-                        _LOGGER.debug(f"read_tibber_local: after[{retry_count}] read - found OBIS entries: '{gen_log_list(self._obis_values)}'")
+                        _LOGGER.debug(f"read_tibber_local: after read - found OBIS entries: '{gen_log_list(self._obis_values)}'")
+                    return True
                 else:
                     if res is not None:
                         _LOGGER.warning(f"access to bridge failed with code {res.status} - res: {res}")
                     else:
                         _LOGGER.warning(f"access to bridge failed (UNKNOWN reason - 'res' is None)")
 
+            except TibberLocalPayloadError as exc:
+                if not self.ignore_parse_errors:
+                    _LOGGER.info(f"{exc}")
+                return False
             except BaseException as exc:
                 _LOGGER.warning(f"access to bridge failed with exception: {type(exc).__name__} - {exc}")
-
-    async def mode_99_read_plaintext(self, plaintext: str, retry_count: int, log_payload: bool):
+        return True
+
+    @staticmethod
+    async def read_plaintext_telegram(res: aiohttp.ClientResponse) -> str:
+        # the telegram ends with a '!' line - everything after it is ignored (and not read at all)
+        lines = []
+        received = 0
+        charset = res.charset or 'utf-8'
+        async for a_line in res.content:
+            lines.append(a_line)
+            received = received + len(a_line)
+            a_line = a_line.rstrip()
+            # when there are no line breaks in the payload, then the entries are separated by a space
+            if a_line == b'!' or a_line.endswith(b' !') or received > MAX_PLAINTEXT_PAYLOAD_SIZE:
+                break
+        return b''.join(lines).decode(charset, errors='replace')
+
+    async def mode_99_read_plaintext(self, plaintext: str, log_payload: bool) -> bool:
         try:
-            temp_obis_values = []
             if log_payload:
                 _LOGGER.debug(f"mode_99_read_plaintext(): plaintext payload: {plaintext}")
 
+            if self._is_duplicate_payload(MODE_99_PLAINTEXT, plaintext):
+                return False
+            raw_plaintext = plaintext
+            snapshot = self._spare_obis_values
+            snapshot.clear()
+
             if '\r' not in plaintext:
                 plaintext = plaintext.replace(' ', '\r')
 
@@ -314,403 +1060,527 @@ class TibberLocalBridge:
                     # a patch for invalid reading?!
                     # a_line = a_line.replace('."55*', '.255*')
 
-                    # if there are not at least 2 dot's before the opening '(', we must insert a '.0' before
-                    # the opening '(' [see issue #73]
-                    if self.TWO_DIGIT_CODE_PATTERN.match(a_line):
-                        a_line = re.sub(self.TWO_DIGIT_CODE_PATTERN, r'\1.0\2\3', a_line, count=1)
-
-                    # it looks like that in the format 'IEC-62056-21' there are the '1-0:' is missing ?! [this is really
-                    # a very DUMP implementation] - but we check, if the line has at least
-                    # 1. '(' [value start]
-                    # 2. ')' [value end]
-                    # 3. '*' [the unit delimiter]
-                    if len(a_line) >= 4 and a_line[1] != '-' and a_line[3] != ':' and '*' in a_line and '(' in a_line and ')' in a_line:
-                        a_line = '1-0:' + a_line
-
-                    # obis pattern is 'a-b:c.d.e*f'
-                    parts = re.split(self.PLAIN_TEXT_LINE, a_line)
-                    if len(parts) == 9:
-                        if self.check_first_six_parts_for_digits_or_last_is_none(parts):
-                            obis_hex = self.obis_hex_from_parts(parts, not self.ignore_parse_errors)
-                            if obis_hex is None:
-                                if not self.ignore_parse_errors:
-                                    _LOGGER.debug(f"mode_99_read_plaintext(): ignore invalid code: {a_line}")
-                                continue
-
-                            value = parts[7]
-                            unit = None
-                            if '*' in value:
-                                val_with_unit = value.split("*")
-                                if '.' in val_with_unit[0]:
-                                    value = float(val_with_unit[0])
-                                else:
-                                    value = int(val_with_unit[0])
-
-                                # converting any "kilo" unit to base unit...
-                                # so kWh will be converted to Wh - or kV will be V
-                                if val_with_unit[1].lower()[0] == 'k':
-                                    value = value * 1000
-                                    val_with_unit[1] = val_with_unit[1][1:]
-
-                                unit = find_unit_int_from_string(val_with_unit[1])
-
-                            # creating finally the "right" object from the parsed information
-                            entry = SmlListEntry()
-                            entry.obis = ObisCode(obis_hex)
-                            entry.value = value
-                            entry.unit = unit
-                            # our plaintext values are not scaled - but 'SmlListEntry.get_value()' requires the attribute
-                            entry.scaler = 0
-                            temp_obis_values.append(entry)
-                        else:
-                            if not self.ignore_parse_errors:
-                                _LOGGER.debug(f"ignore none digits-only code: {a_line}")
-                    else:
-                        if parts[0] == '!':
+                    # when the '1-0:' prefix is missing, we accept the line only if there is a '*' in it (the unit
+                    # delimiter) - otherwise also codes like 'F.F(00)' would be read
+                    a_match = self.PLAIN_TEXT_LINE.match(a_line)
+                    if a_match is None or (a_match.group(1) is None and '*' not in a_line):
+                        if a_line == '!':
                             break
-                        elif len(parts[0]) > 0 and parts[0][0] != '/':
+                        elif len(a_line) > 0 and a_line[0] != '/':
                             if not self.ignore_parse_errors:
-                                _LOGGER.debug(f"mode_99_read_plaintext(): unknown entry: {parts[0]} (line: '{a_line}')")
-                        # else:
-                        #    print('ignore '+ parts[0])
+                                _LOGGER.debug(f"mode_99_read_plaintext(): unknown entry: {a_line}")
+                        continue
+
+                    obis = self._plain_text_obis_code(a_match)
+                    if obis is None:
+                        if not self.ignore_parse_errors:
+                            _LOGGER.debug(f"mode_99_read_plaintext(): ignore invalid code: {a_line}")
+                        continue
+
+                    value = a_match.group(7)
+                    unit = None
+                    unit_str = a_match.group(9)
+                    if unit_str is not None:
+                        if '.' in value:
+                            value = float(value)
+                        else:
+                            value = int(value)
+
+                        # converting any "kilo" unit to base unit...
+                        # so kWh will be converted to Wh - or kV will be V
+                        if a_match.group(8):
+                            value = value * 1000
+
+                        unit = find_unit_int_from_string(unit_str)
+
+                    # our plaintext values are not scaled
+                    snapshot.set_entry(obis, value, unit)
 
                 except Exception as e:
                     if not self.ignore_parse_errors:
                         _LOGGER.info(f"mode_99_read_plaintext(): {type(e).__name__} - {e}")
 
-            if len(temp_obis_values) > 0:
-                self._obis_values = {}
-                #self._obis_values_by_short = {}
-                for entry in temp_obis_values:
-                    self._obis_values[entry.obis] = entry
-                    #self._obis_values_by_short[entry.obis.obis_short] = entry
+            if len(snapshot) > 0:
+                self._swap_obis_values()
+                self._last_payload = (MODE_99_PLAINTEXT, raw_plaintext)
+                return True
 
         except Exception as exc:
-            if not self.ignore_parse_errors:
-                _LOGGER.warning(f"Exception {exc} while process data - plaintext: {plaintext}")
-            if retry_count < self.MAX_READ_RETRIES:
-                retry_count = retry_count + 1
-                await asyncio.sleep(random.uniform(MIN_RETRY_DELAY, MAX_RETRY_DELAY))
-                await self.read_tibber_local(mode=MODE_99_PLAINTEXT, retry_count=retry_count)
-
-    async def mode_10_read_json_impressions_ambient(self, data: dict, retry_count: int, log_payload: bool):
-        # {"$type": "imp_data", "timestamp_ms": 2122625,"delta_ms": 9879,"kw":0.364409, "kwh": 0.0040}
-        temp_obis_values = {}
+            raise TibberLocalPayloadError(f"Exception {exc} while process data - plaintext: {plaintext}") from exc
+        return False
 
+    async def mode_10_read_json_impressions_ambient(self, data: dict, log_payload: bool) -> bool:
+        # {"$type": "imp_data", "timestamp_ms": 2122625,"delta_ms": 9879,"kw":0.364409, "kwh": 0.0040}
         if log_payload:
             _LOGGER.debug(f"mode 10 payload: {data}")
 
+        if self._is_duplicate_payload(MODE_10_ImpressionsAmbient, data):
+            return False
+
+        snapshot = self._spare_obis_values
+        snapshot.clear()
+
         if "$type" in data and data["$type"] == "imp_data":
             if "kw" in data:
                 kw = data.get("kw")
                 if kw is not None:
                     # this is hardcoded '0100100700ff' (Wirkleistung) - but the value in kW... and the sensor
                     # is in W - so we have to multiply it with 1000
-                    entry = SmlListEntry()
-                    entry.obis = ObisCode('0100100700ff')
-                    entry.unit = 27 # 27 is the unit: Watt
-                    entry.scaler = 0
-                    entry.value = kw * 1000
-                    temp_obis_values[entry.obis] = entry
+                    # 27 is the unit: Watt
+                    snapshot.set_entry(OBIS_ACTIVE_POWER, kw * 1000, 27)
 
             if "kwh" in data:
                 # to do/implement...
                 kwh = data.get("kwh")
                 if kwh is not None:
-                    entry = SmlListEntry()
-                    entry.obis = ObisCode('0100010800ff')
-                    entry.unit = 30 # 30 is the unit: Wh
-                    entry.scaler = 0
-                    entry.value = kwh * 1000
-                    temp_obis_values[entry.obis] = entry
+                    # 30 is the unit: Wh
+                    snapshot.set_entry(OBIS_ENERGY_IMPORT, kwh * 1000, 30)
         else:
             _LOGGER.debug(f"mode_10_read_json_impressions_ambient(): unexpected payload: {data}")
 
-        if len(temp_obis_values) > 0:
-            self._obis_values = temp_obis_values
+        if len(snapshot) > 0:
+            self._swap_obis_values()
+            self._last_payload = (MODE_10_ImpressionsAmbient, data)
+            return True
+        return False
 
-    async def mode_03_read_sml(self, payload: bytes, retry_count: int, log_payload: bool):
+    async def mode_03_read_sml(self, content: aiohttp.StreamReader, log_payload: bool) -> bool:
         # for whatever reason, the data that can be read from the TibberPulse Webserver is
         # not always valid! [I guess there is an issue with an internal buffer in the webserver
         # implementation] - in any case, the bytes received contain sometimes invalid characters,
         # so the 'stream.get_frame()' method will not be able to parse the data...
-        if log_payload:
-            _LOGGER.debug(f"sml payload: {payload}")
-
-        stream = SmlStreamReader()
-        stream.add(payload)
-        try:
-            sml_frame = stream.get_frame()
-            if sml_frame is None:
-                if not self.ignore_parse_errors:
-                    _LOGGER.info(f"Bytes missing - payload: {payload}")
-                if retry_count < self.MAX_READ_RETRIES:
-                    retry_count = retry_count + 1
-                    await asyncio.sleep(random.uniform(MIN_RETRY_DELAY, MAX_RETRY_DELAY))
-                    await self.read_tibber_local(mode=MODE_3_SML_1_04, retry_count=retry_count)
-            else:
-                use_fallback_impl = self._use_fallback_by_default
-                sml_list = None
-                a_source_exc = None
-
-                if not use_fallback_impl:
+        #
+        # before we request the data again, we check if there is any valid frame in the payload: the stream
+        # checks the CRC of every '1b1b1b1b 01010101 ... 1b1b1b1b 1a' envelope and resyncs at the next start
+        # sequence when a frame is corrupt. The body is fed chunk by chunk into the stream, so we can stop
+        # reading as soon as a frame has been processed (the bridge might pad the response or send junk after
+        # the frame)
+        stream = TibberLocalSmlStream()
+        chunks = []
+        received = 0
+        first_exc = None
+        new_data_arrived = None
+        async for chunk in content.iter_chunked(SML_READ_CHUNK_SIZE):
+            chunks.append(chunk)
+            received = received + len(chunk)
+            stream.add(chunk)
+            sml_frames = stream.get_frames()
+            if len(sml_frames) > 0:
+                # the newest valid frame wins - older ones are only used, when the newer can't be parsed
+                for sml_frame in reversed(sml_frames):
                     try:
-                        # Shortcut to extract all values without parsing the whole frame
-                        sml_list = sml_frame.get_obis()
-
-                    except SmlLibException as source_exc:
-                        use_fallback_impl = True
-                        a_source_exc = source_exc
-
-                        # if we have multiple times the same exception, we switch to the fallback implementation
-                        self._fallback_usage_counter = self._fallback_usage_counter + 1
-                        if self._fallback_usage_counter > 20:
-                            self._use_fallback_by_default = True
-
-                if use_fallback_impl:
-                    # see issue https://github.com/marq24/ha-tibber-pulse-local/issues/64
-                    # there exist some devices that can't be parsed via 'get_obis()'
-                    # see also my issue @ https://github.com/spacemanspiff2007/SmlLib/issues/28
-                    sml_list = []
-                    for msg in sml_frame.parse_frame():
-                        # we simply get through all message bodies and check if we can find the 'val_list' - if so
-                        # we just add them to our result.
-                        for val in getattr(msg.message_body, 'val_list', []):
-                            sml_list.append(val)
-
-                    if a_source_exc is not None and len(sml_list) == 0 and not self.ignore_parse_errors:
-                        _LOGGER.debug(f"Exception {a_source_exc} while 'sml_frame.get_obis()' (frame parsing did not work either) - payload: {payload}")
-
-                # if we have a list of SML entries, we can process them
-                if sml_list is not None and len(sml_list) > 0:
-                    self._obis_values = {}
-                    for entry in sml_list:
-                        self._obis_values[entry.obis] = entry
-                        #self._obis_values_by_short[entry.obis.obis_short] = entry
-
-        except (CrcError, BaseException) as exc:
-            if not self.ignore_parse_errors:
-                if isinstance(exc, CrcError):
-                    _LOGGER.info(f"CRC while parse data - payload: {payload}")
-                else:
-                    _LOGGER.warning(f"Exception {type(exc).__name__} - {exc} while parse data - payload: {payload}")
+                        if self._is_duplicate_payload(MODE_3_SML_1_04, sml_frame.msg_ctx):
+                            new_data_arrived = False
+                            break
+                        if self._process_sml_frame(sml_frame, sml_frame.msg_ctx, log_payload):
+                            self._last_payload = (MODE_3_SML_1_04, sml_frame.msg_ctx)
+                            new_data_arrived = True
+                            break
+                    except Exception as frame_exc:
+                        if first_exc is None:
+                            first_exc = frame_exc
 
-            if retry_count < self.MAX_READ_RETRIES:
-                retry_count = retry_count + 1
-                await asyncio.sleep(random.uniform(MIN_RETRY_DELAY, MAX_RETRY_DELAY))
-                await self.read_tibber_local(mode=MODE_3_SML_1_04, retry_count=retry_count)
+                # when none of the frames could be parsed, we keep on reading - maybe there is another frame
+                if new_data_arrived is None and first_exc is None:
+                    new_data_arrived = False
+                if new_data_arrived is not None:
+                    break
 
-    async def updated_tibber_metrics_if_needed(self, log_payload: bool = False):
-        if not self._metrics_update_is_running:
-            self._metrics_update_is_running = True
-            try:
-                # only request every 30 minutes (= 30 * 60sec) for new meta_data...
-                to_wait_till = self._LAST_METRICS_UPDATE + 1800
-                if to_wait_till < time.time():
-                    _LOGGER.debug(f"updated_tibber_metrics_if_needed(): request: {self.url_metrics}")
-                    async with self.web_session.get(self.url_metrics, auth=self.basic_auth, ssl=False, timeout=10.0) as res:
-                        try:
-                            res.raise_for_status()
-                            if res.status == 200:
-                                try:
-                                    self._metrics_data = await res.json()
-                                    if log_payload:
-                                        _LOGGER.debug(f"updated_tibber_metrics_if_needed(): metrics response: {self._metrics_data}")
-                                except Exception as exc:
-                                    _LOGGER.warning(f"updated_tibber_metrics_if_needed(): failed to parse metrics JSON: {exc}")
-                            else:
-                                if res is not None:
-                                    _LOGGER.warning(f"updated_tibber_metrics_if_needed(): access to bridge failed with code {res.status} - res: {res}")
-                                else:
-                                    _LOGGER.warning(f"updated_tibber_metrics_if_needed(): access to bridge failed (UNKNOWN reason - 'res' is None)")
+            elif received > MAX_SML_PAYLOAD_SIZE:
+                break
 
-                        except BaseException as exc:
-                            _LOGGER.warning(f"updated_tibber_metrics_if_needed(): access to bridge failed with exception: {type(exc).__name__} - {exc}")
+        payload = b''.join(chunks)
+        if log_payload:
+            _LOGGER.debug(f"sml payload: {payload}")
 
-                        self._LAST_METRICS_UPDATE = time.time()
-                else:
-                    pass
-                    #_LOGGER.debug(f"updated_tibber_metrics_if_needed(): no update required [wait for: {round((to_wait_till - time.time())/60, 1)} min]")
+        if new_data_arrived is not None:
+            if stream.crc_error_count > 0:
+                self._repaired_payload_counter = self._repaired_payload_counter + 1
+                _LOGGER.debug(f"mode_03_read_sml(): skipped {stream.crc_error_count} corrupt frame(s) in payload")
+            return new_data_arrived
 
-            except BaseException as e:
-                _LOGGER.debug(f"updated_tibber_metrics_if_needed(): caused: {type(e).__name__} - {e}")
+        if first_exc is not None:
+            raise TibberLocalPayloadError(f"Exception {type(first_exc).__name__} - {first_exc} while parse data - payload: {payload}") from first_exc
+        elif stream.crc_error_count > 0:
+            raise TibberLocalPayloadError(f"CRC while parse data - payload: {payload}")
+        else:
+            raise TibberLocalPayloadError(f"Bytes missing - payload: {payload}")
+
+    def mode_03_read_sml_stream(self, payload: bytes | None, latest_only: bool = False) -> bool:
+        # the websocket does not always deliver a complete frame per message - so we feed all the bytes into
+        # the long living stream of the current connection and process every frame that is complete
+        if self._ws_sml_stream is None:
+            self._ws_sml_stream = TibberLocalSmlStream()
+        if payload is not None:
+            self._ws_sml_stream.add(payload)
+
+        frames = self._ws_sml_stream.get_frames()
+        if latest_only:
+            # only the newest frame matters - the older ones will only be parsed, when the newer ones are corrupt
+            frames.reverse()
+
+        new_data_arrived = False
+        handled_frames = 0
+        for sml_frame in frames:
+            handled_frames = handled_frames + 1
+            try:
+                if self._is_duplicate_payload(MODE_3_SML_1_04, sml_frame.msg_ctx):
+                    if latest_only:
+                        break
+                    continue
+                if self._process_sml_frame(sml_frame, payload):
+                    self._last_payload = (MODE_3_SML_1_04, sml_frame.msg_ctx)
+                    new_data_arrived = True
+                    if latest_only:
+                        break
+            except BaseException as exc:
+                if not self.ignore_parse_errors:
+                    _LOGGER.warning(f"mode_03_read_sml_stream(): Exception {type(exc).__name__} - {exc} while parse frame - payload: {payload}")
 
-            self._metrics_update_is_running = False
+        if handled_frames < len(frames):
+            self._ws_superseded_counter = self._ws_superseded_counter + len(frames) - handled_frames
+        return new_data_arrived
 
-    # websocket implementation from here...
-    async def ws_connect(self):
-        try:
-            #async with self.websession.ws_connect(self.url_ws, headers=self.REQ_HEADERS_WS, compress=0) as ws:
-            async with self.web_session.ws_connect(self.url_ws, auth=self.basic_auth, compress=0) as ws:
-                self.ws_connected = True
-                self.ws_obj = ws
-                _LOGGER.info(f"ws_connect(): connected to websocket: {self.url_ws} - in COM MODE: {self._com_mode}")
-                async for msg in ws:
-                    self._ws_LAST_UPDATE = time.time()
-                    new_data_arrived = False
+    def _is_duplicate_payload(self, mode: int, raw_payload) -> bool:
+        # many meters send the same frame multiple times (and the bridge serves an unchanged 'data.json' when
+        # we poll faster than the meter sends) - such a payload must not be parsed (and published) again
+        if len(self._obis_values) > 0 and self._last_payload is not None and self._last_payload == (mode, raw_payload):
+            self._duplicate_payload_counter = self._duplicate_payload_counter + 1
+            return True
+        return False
+
+    def _process_sml_frame(self, sml_frame: SmlFrame, payload: bytes, log_payload: bool = False) -> bool:
+        count = 0
+        a_source_exc = None
+        snapshot = self._spare_obis_values
+        for a_strategy in self._parse_strategy_selector.get_order():
+            # when the payload should be logged, we want to see ALL OBIS codes of the meter - and not only the
+            # ones the fast scanner is looking for
+            if a_strategy == PARSE_STRATEGY_SCANNER and log_payload:
+                continue
+
+            start_time = time.perf_counter()
+            a_source_exc = None
+            try:
+                snapshot.clear()
+                count = self._parse_sml_frame(a_strategy, sml_frame, snapshot)
+            except Exception as source_exc:
+                count = 0
+                a_source_exc = source_exc
+                _LOGGER.debug(f"_process_sml_frame(): strategy '{a_strategy}' caused: {type(source_exc).__name__} - {source_exc}")
+
+            success = count > 0
+            self._parse_strategy_selector.add_result(a_strategy, success, time.perf_counter() - start_time)
+            if success:
+                break
+
+        # if we have found SML entries, the filled snapshot becomes the current one
+        if count > 0:
+            self._swap_obis_values()
+            return True
 
-                    # self._com_mode == MODE_3_SML_1_04
-                    # self._com_mode == MODE_10_ImpressionsAmbient
-                    # self._com_mode == MODE_99_PLAINTEXT
+        # when the last strategy failed with an exception, the caller should handle it (e.g. retry)
+        if a_source_exc is not None:
+            raise a_source_exc
+        if not self.ignore_parse_errors:
+            _LOGGER.debug(f"_process_sml_frame(): no OBIS values found (with any parse strategy) - payload: {payload}")
+        return False
 
-                    if msg.type == aiohttp.WSMsgType.BINARY:
-                        try:
-                            binary_data = msg.data
-                            # Find the position of '>' and extract everything after it
-                            separator_pos = binary_data.index(b'>')
-                            if separator_pos > 0:
-                                binary_head = binary_data[:separator_pos + 1]
-                                _LOGGER.debug(f"ws_connect(): WSMsgType.BINARY head: {binary_head}")
-                                topic, device_id = ws_parse_header_bytes(binary_head)
+    @staticmethod
+    def _parse_sml_frame(strategy: str, sml_frame: SmlFrame, snapshot: MeterSnapshot) -> int:
+        if strategy == PARSE_STRATEGY_SCANNER:
+            return scan_obis_entries(sml_frame.bytes, snapshot)
 
-                                if self.node_device_id is None or self.node_device_id == device_id:
-                                    if topic is not None and "sml" in topic.lower() and self._com_mode == MODE_3_SML_1_04:
-                                        binary_body = binary_data[separator_pos + 1:]
-                                        _LOGGER.debug(f"ws_connect(): WSMsgType.BINARY body '{topic}' [len:{len(binary_body)}]: {binary_body if len(binary_body) <= 15 else binary_body[:15]}...")
-                                        try:
-                                            await self.mode_03_read_sml(binary_body, retry_count=self.MAX_READ_RETRIES, log_payload=False)
-                                            new_data_arrived = True
-                                        except Exception as e:
-                                            _LOGGER.warning(f"ws_connect(): WSMsgType.BINARY 'mode_03_read_sml' caused {type(e).__name__} [{binary_body}] {e}")
-
-                                    elif topic is not None and self._com_mode == MODE_99_PLAINTEXT:
-                                        text_body = binary_data[separator_pos + 1:].decode('ascii', errors='ignore')
-                                        _LOGGER.debug(f"ws_connect(): WSMsgType.BINARY body (as TEXT) '{topic}' [len:{len(text_body)}]: {text_body if len(text_body) <= 15 else text_body[:15]}...")
-                                        try:
-                                            await self.mode_99_read_plaintext(text_body, retry_count=self.MAX_READ_RETRIES, log_payload=False)
-                                            new_data_arrived = True
-                                        except Exception as e:
-                                            _LOGGER.warning(f"ws_connect(): WSMsgType.BINARY 'mode_99_read_plaintext' caused {type(e).__name__} [{text_body}] {e}")
-
-                                    elif topic is not None and self._com_mode == MODE_10_ImpressionsAmbient:
-                                        json_body = binary_data[separator_pos + 1:].decode('ascii', errors='ignore')
-                                        _LOGGER.debug(f"ws_connect(): WSMsgType.BINARY body (as JSON) '{topic}' [len:{len(json_body)}]: {json_body if len(json_body) <= 15 else json_body[:15]}...")
-                                        try:
-                                            await self.mode_10_read_json_impressions_ambient(json.loads(json_body), retry_count=self.MAX_READ_RETRIES, log_payload=False)
-                                            new_data_arrived = True
-                                        except Exception as e:
-                                            _LOGGER.warning(f"ws_connect(): WSMsgType.BINARY 'mode_10_read_json_impressions_ambient' caused {type(e).__name__} [{json_body}] {e}")
-
-                                    else:
-                                        _LOGGER.warning(f"ws_connect(): WSMsgType.BINARY topic '{topic}'/mode_'{self._com_mode}' in: {binary_data}")
-                                else:
-                                    _LOGGER.debug(f"ws_connect(): WSMsgType.BINARY device of node_num '{self.node_device_id}' not matching the device in the message {device_id}")
-                            else:
-                                _LOGGER.debug(f"ws_connect(): WSMsgType.BINARY invalid data (NO '>' FOUND) in: {binary_data}")
-
-                        except Exception as e:
-                            _LOGGER.debug(f"ws_connect(): Could not read WSMsgType.BINARY from: {msg} - caused {type(e).__name__} {e}")
+        elif strategy == PARSE_STRATEGY_GET_OBIS:
+            # Shortcut to extract all values without parsing the whole frame
+            sml_list = sml_frame.get_obis()
 
-                    elif msg.type == aiohttp.WSMsgType.TEXT:
-                        try:
-                            # make sure we have a string text here - but to be honest, so far none there has been
-                            # no evidence that a TibberPuldeBridge would send `WSMsgType.TEXT` - so all this here
-                            # is really just a fallback...
-                            if hasattr(msg.data, "decode"):
-                                text_data = msg.data.decode('ascii', errors='ignore')
-                            elif isinstance(msg.data, str):
-                                text_data = msg.data
+        else:
+            # see issue https://github.com/marq24/ha-tibber-pulse-local/issues/64
+            # there exist some devices that can't be parsed via 'get_obis()'
+            # see also my issue @ https://github.com/spacemanspiff2007/SmlLib/issues/28
+            sml_list = []
+            for msg in sml_frame.parse_frame():
+                # we simply get through all message bodies and check if we can find the 'val_list' - if so
+                # we just add them to our result.
+                for val in getattr(msg.message_body, 'val_list', []):
+                    sml_list.append(val)
+
+        for entry in sml_list:
+            snapshot.set_entry(intern_obis_code(entry.obis), entry.value, entry.unit, entry.scaler, entry.status)
+        return len(sml_list)
+
+    def _next_spare_obis_values(self) -> MeterSnapshot:
+        # the snapshot the coordinator currently publishes must never be filled again (e.g. while the notifier holds
+        # back the update of the coordinator) - the coordinator only takes the current snapshot
+        coordinator_data = getattr(self._coordinator, "data", None) if self._coordinator is not None else None
+        published = coordinator_data.get(DATA_KEY) if isinstance(coordinator_data, dict) else None
+        for a_snapshot in self._obis_snapshots:
+            if a_snapshot is not self._obis_values and a_snapshot is not published:
+                return a_snapshot
+
+    def _swap_obis_values(self):
+        self._obis_values = self._spare_obis_values
+        self._spare_obis_values = self._next_spare_obis_values()
+        self._obis_index.check_reported_codes(self._obis_values)
+        now = time.monotonic()
+        if self._last_frame_time is not None:
+            interval = now - self._last_frame_time
+            self.frame_interval = interval if self.frame_interval is None else self.frame_interval * 0.9 + interval * 0.1
+        self._last_frame_time = now
+
+    @property
+    def has_live_data(self) -> bool:
+        # a restored snapshot does not count
+        return self._last_frame_time is not None
+
+    def get_obis_values_time(self) -> float | None:
+        # the wall clock time of the last reading from the bridge
+        if self._last_frame_time is None:
+            return None
+        return time.time() - (time.monotonic() - self._last_frame_time)
+
+    def restore_obis_values(self, entries: list) -> bool:
+        snapshot = self._spare_obis_values
+        snapshot.clear()
+        for obis, value, unit, status in entries:
+            snapshot.set_entry(intern_obis_code(obis), value, unit, None, status)
+        if len(snapshot) == 0:
+            return False
+        # not via '_swap_obis_values()' - since this is not a new reading of the meter
+        self._obis_values = snapshot
+        self._spare_obis_values = self._next_spare_obis_values()
+        self._obis_index.check_reported_codes(self._obis_values)
+        return True
+
+    def restore_metrics(self, metrics: BridgeMetrics, metrics_time: float):
+        self._metrics_data = metrics
+        self._LAST_METRICS_UPDATE = metrics_time
+
+    def get_diagnostics(self) -> dict:
+        return {
+            "com_mode": self._com_mode,
+            "ws_supported": self.ws_supported,
+            "ws_connected": self.ws_connected,
+            "obis_codes": list(self._obis_values.keys()),
+            "duplicate_payloads": self._duplicate_payload_counter,
+            "repaired_payloads": self._repaired_payload_counter,
+            "closed_early_responses": self._closed_early_counter,
+            "ws_sml_crc_errors": self._ws_sml_stream.crc_error_count if self._ws_sml_stream is not None else None,
+            "ws_superseded_frames": self._ws_superseded_counter,
+            "ws_hub": self._ws_hub.as_dict() if self._ws_hub is not None else None,
+            "bridge_json_cache": dict(_BRIDGE_JSON_STATS),
+            "request_scheduler": self._request_scheduler.as_dict() if hasattr(self, "_request_scheduler") else None,
+            "ws_notifier": self._ws_notifier.as_dict(),
+            "frame_interval_s": round(self.frame_interval, 3) if self.frame_interval is not None else None,
+            "parse_strategies": self._parse_strategy_selector.as_dict(),
+            "read_retries": dict(self._read_retry_stats),
+        }
+
+    def start_metrics_refresher(self):
+        # the metrics are fetched by their own task - so the processing of the meter data will never wait for them
+        if self._coordinator is not None and hasattr(self._coordinator, "_config_entry"):
+            if self._metrics_task is None or self._metrics_task.done():
+                self._metrics_task = self._coordinator._config_entry.async_create_background_task(
+                    self._coordinator.hass, self._metrics_refresher(), "metrics_refresher")
+
+    def stop_metrics_refresher(self):
+        if self._metrics_task is not None and not self._metrics_task.done():
+            self._metrics_task.cancel()
+        self._metrics_task = None
+
+    async def _metrics_refresher(self):
+        while True:
+            if await self.refresh_metrics() and self._coordinator is not None and len(self._obis_values) > 0:
+                # let the diagnostic sensors know about the new metrics
+                self._notify_coordinator()
+            await asyncio.sleep(METRICS_UPDATE_INTERVAL)
+
+    async def refresh_metrics(self, log_payload: bool = False) -> bool:
+        if self._metrics_lock.locked():
+            _LOGGER.debug(f"refresh_metrics(): skipped - since a request is already running")
+            return False
+
+        async with self._metrics_lock:
+            new_metrics_data = None
+            try:
+                _LOGGER.debug(f"refresh_metrics(): request: {self.url_metrics}")
+                # the time waiting for the bridge is not part of the timeout
+                async with self._request_scheduler.slot():
+                    async with asyncio.timeout(METRICS_REQUEST_TIMEOUT):
+                        async with self.web_session.get(self.url_metrics, auth=self.basic_auth, ssl=False, timeout=METRICS_REQUEST_TIMEOUT) as res:
+                            res.raise_for_status()
+                            if res.status == 200:
+                                new_metrics_data = await res.json()
+                                if log_payload:
+                                    _LOGGER.debug(f"refresh_metrics(): metrics response: {new_metrics_data}")
                             else:
-                                text_data = str(msg.data)
-
-                            separator_pos = text_data.index('>')
-                            if separator_pos > 0:
-                                text_head = text_data[:separator_pos + 1]
+                                _LOGGER.warning(f"refresh_metrics(): access to bridge failed with code {res.status} - res: {res}")
 
-                                _LOGGER.debug(f"ws_connect(): WSMsgType.TEXT head: {text_head}")
-                                topic, device_id = ws_parse_header_string(text_head)
-
-                                if self.node_device_id is None or self.node_device_id == device_id:
-                                    if topic is not None and self._com_mode == MODE_99_PLAINTEXT:
-                                        text_body = text_data[separator_pos + 1:]
-                                        _LOGGER.debug(f"ws_connect(): WSMsgType.TEXT body '{topic}' [len:{len(text_body)}]: {text_body}")
-                                        try:
-                                            await self.mode_99_read_plaintext(text_body, retry_count=self.MAX_READ_RETRIES, log_payload=False)
-                                            new_data_arrived = True
-                                        except Exception as e:
-                                            _LOGGER.warning(f"ws_connect(): WSMsgType.TEXT 'mode_99_read_plaintext' caused {type(e).__name__} [{text_data}] {e}")
-                                    else:
-                                        _LOGGER.warning(f"ws_connect(): WSMsgType.TEXT 'UNHANDLED' topic '{topic}'/mode_'{self._com_mode}' in: {text_data}")
-                                else:
-                                    _LOGGER.debug(f"ws_connect(): WSMsgType.TEXT device of node_num '{self.node_device_id}' not matching the device in the message {device_id}")
-                            else:
-                                _LOGGER.debug(f"ws_connect(): WSMsgType.TEXT invalid data (NO '>' FOUND) in: {text_data}")
+            except asyncio.TimeoutError:
+                _LOGGER.warning(f"refresh_metrics(): no response from bridge within {METRICS_REQUEST_TIMEOUT} seconds")
+            except Exception as exc:
+                _LOGGER.warning(f"refresh_metrics(): access to bridge failed with exception: {type(exc).__name__} - {exc}")
 
-                        except Exception as e:
-                            _LOGGER.debug(f"ws_connect(): Could not read WSMsgType.TEXT from: {msg} - caused {type(e).__name__} {e}")
+            self._LAST_METRICS_UPDATE = time.time()
+            if isinstance(new_metrics_data, dict):
+                # the new metrics replace the previous ones as a whole (a reader will never see a partial update) - and
+                # as long as the object is the same, the metrics sensors have not changed
+                self._metrics_data = BridgeMetrics.from_json(new_metrics_data)
+                return True
+            return False
 
-                    elif msg.type in (aiohttp.WSMsgType.CLOSED, aiohttp.WSMsgType.ERROR):
-                        _LOGGER.debug(f"ws_connect(): received: {msg}")
-                        break
+    # websocket implementation from here...
+    @property
+    def ws_connected(self) -> bool:
+        return self._ws_hub is not None and self._ws_hub.connected and self._ws_hub.is_attached(self)
 
-                    # do we need to push new data event to the coordinator?
-                    if new_data_arrived:
-                        await self.updated_tibber_metrics_if_needed()
-                        self._ws_notify_for_new_data()
+    @property
+    def ws_obj(self):
+        return self._ws_hub.ws_obj if self.ws_connected else None
 
-        except ClientResponseError as cre:
-            if hasattr(cre, "status") and cre.status == 404:
-                _LOGGER.info(f"ws_connect(): Could not connect to websocket at {self.url_ws} - [HTTP:404] - looks like bridge firmware update '1428-6debbaf6/795-379a5e21' not installed")
+    async def ws_connect(self):
+        # all nodes of the bridge share one websocket connection - this will return, when the shared connection
+        # has been closed (or this node has been detached)
+        hub = get_ws_hub(self.url_ws, self.web_session, self.basic_auth)
+        self._ws_hub = hub
+        # the watchdog might start a new 'ws_connect()' while this one is still terminating - so the state of this
+        # connection is kept in locals, and it will be only cleared, when it has not been replaced in the meantime
+        sml_stream = TibberLocalSmlStream()
+        mailbox_event = asyncio.Event()
+        process_task = asyncio.create_task(self._ws_process_mailbox(mailbox_event))
+        try:
+            # partial SML frames must not survive a reconnect
+            self._ws_sml_stream = sml_stream
+            self._ws_mailbox = None
+            self._ws_mailbox_event = mailbox_event
+            self._ws_process_task = process_task
+            _LOGGER.info(f"ws_connect(): attach to websocket: {self.url_ws} - in COM MODE: {self._com_mode} for device: {self.node_device_id}")
+            await hub.connect_and_wait(self)
+            if not hub.supported:
                 self.ws_supported = False
-            else:
-                _LOGGER.error(f"ws_connect(): Could not connect to websocket: {type(cre).__name__} - {cre}")
-        except ClientConnectionError as err:
-            _LOGGER.error(f"ws_connect(): Could not connect to websocket: {type(err).__name__} - {err}")
-        except asyncio.TimeoutError as time_exc:
-            _LOGGER.debug(f"ws_connect(): TimeoutError: No WebSocket message received within timeout period: {type(time_exc).__name__} - {time_exc}")
+
         except CancelledError as canceled:
             _LOGGER.debug(f"ws_connect(): Terminated? - {type(canceled).__name__} - {canceled}")
+            # when there was no message for a while, the shared connection must be reconnected for all nodes
+            if hub.connected and not hub.check_last_update():
+                await hub.close()
         except BaseException as x:
             _LOGGER.error(f"ws_connect(): !!! {type(x).__name__} - {x}")
 
         _LOGGER.debug(f"ws_connect(): -- END HAS REACHED --")
+        if not process_task.done():
+            process_task.cancel()
+
+        if self._ws_process_task is not process_task:
+            _LOGGER.debug(f"ws_connect(): a new connection has been started in the meantime - keeping its state")
+            return None
+
+        self._ws_process_task = None
+        self._ws_mailbox = None
         try:
-            await self.ws_close(ws)
-        except UnboundLocalError as is_unbound:
-            _LOGGER.debug(f"ws_connect(): skipping ws_close() (since ws is unbound)")
+            await self.ws_close()
         except BaseException as e:
             _LOGGER.error(f"ws_connect(): Error while calling ws_close(): {type(e).__name__} - {e}")
 
-        self.ws_connected = False
-        self.ws_obj = None
+        # 'ws_close()' could have been interrupted by a new connection too
+        if self._ws_sml_stream is sml_stream:
+            self._ws_sml_stream = None
         return None
 
-    def _ws_notify_for_new_data(self):
-        if self._ws_debounced_update_task is not None and not self._ws_debounced_update_task.done():
-            self._ws_debounced_update_task.cancel()
-        self._ws_debounced_update_task = asyncio.create_task(self._ws_debounce_coordinator_update())
+    def ws_handle_message(self, topic: str | None, body: bytes | str, source: str):
+        # called by the 'TibberLocalWebSocketHub' for every message of the device of this node
+        self._ws_LAST_UPDATE = time.time()
+        if topic is None:
+            _LOGGER.warning(f"ws_handle_message(): {source} without topic/mode_'{self._com_mode}' in: {body}")
+
+        elif isinstance(body, bytes):
+            if "sml" in topic.lower() and self._com_mode == MODE_3_SML_1_04:
+                _LOGGER.debug(f"ws_handle_message(): {source} body '{topic}' [len:{len(body)}]: {body if len(body) <= 15 else body[:15]}...")
+                # the SML bytes must be added in order (a frame can be split over multiple
+                # messages) - only the parsing of the complete frames is deferred
+                self._ws_sml_stream.add(body)
+                self._ws_mailbox_put(MODE_3_SML_1_04, None, source)
+
+            elif self._com_mode == MODE_99_PLAINTEXT:
+                text_body = body.decode('ascii', errors='ignore')
+                _LOGGER.debug(f"ws_handle_message(): {source} body (as TEXT) '{topic}' [len:{len(text_body)}]: {text_body if len(text_body) <= 15 else text_body[:15]}...")
+                self._ws_mailbox_put(MODE_99_PLAINTEXT, text_body, source)
+
+            elif self._com_mode == MODE_10_ImpressionsAmbient:
+                json_body = body.decode('ascii', errors='ignore')
+                _LOGGER.debug(f"ws_handle_message(): {source} body (as JSON) '{topic}' [len:{len(json_body)}]: {json_body if len(json_body) <= 15 else json_body[:15]}...")
+                self._ws_mailbox_put(MODE_10_ImpressionsAmbient, json_body, source)
 
-    async def _ws_debounce_coordinator_update(self):
-        if self._coordinator is not None:
-            elapsed = time.time() - self._ws_LAST_NEW_DATA_NOTIFY
-            if elapsed < 1:
-                sec_to_sleep = 1 - elapsed
-                #_LOGGER.debug(f"_ws_debounce_coordinator_update(): sleeping for {sec_to_sleep} seconds before notifying for updated data")
-                await asyncio.sleep(sec_to_sleep)
+            else:
+                _LOGGER.warning(f"ws_handle_message(): {source} topic '{topic}'/mode_'{self._com_mode}' in: {body}")
 
+        elif self._com_mode == MODE_99_PLAINTEXT:
+            _LOGGER.debug(f"ws_handle_message(): {source} body '{topic}' [len:{len(body)}]: {body}")
+            self._ws_mailbox_put(MODE_99_PLAINTEXT, body, source)
+        else:
+            _LOGGER.warning(f"ws_handle_message(): {source} 'UNHANDLED' topic '{topic}'/mode_'{self._com_mode}' in: {body}")
+
+    def _ws_mailbox_put(self, mode: int, body: str | None, source: str):
+        # a pending SML message is not lost (the bytes are already in the stream) - superseded SML frames will be
+        # counted, when the stream is processed
+        if self._ws_mailbox is not None and self._ws_mailbox[0] != MODE_3_SML_1_04:
+            self._ws_superseded_counter = self._ws_superseded_counter + 1
+        self._ws_mailbox = (mode, body, source)
+        self._ws_mailbox_event.set()
+
+    async def _ws_process_mailbox(self, mailbox_event: asyncio.Event):
+        while True:
+            await mailbox_event.wait()
+            mailbox_event.clear()
+            if self._ws_mailbox is None:
+                continue
+
+            mode, body, source = self._ws_mailbox
+            self._ws_mailbox = None
+            new_data_arrived = False
+            try:
+                if mode == MODE_3_SML_1_04:
+                    new_data_arrived = self.mode_03_read_sml_stream(None, latest_only=True)
+                elif mode == MODE_99_PLAINTEXT:
+                    new_data_arrived = await self.mode_99_read_plaintext(body, log_payload=False)
+                elif mode == MODE_10_ImpressionsAmbient:
+                    new_data_arrived = await self.mode_10_read_json_impressions_ambient(json.loads(body), log_payload=False)
+            except Exception as e:
+                _LOGGER.warning(f"_ws_process_mailbox(): {source} (mode {mode}) caused {type(e).__name__} [{body}] {e}")
+
+            # do we need to push new data event to the coordinator?
+            if new_data_arrived:
+                self._ws_notifier.notify()
+
+    def _ws_notify_coordinator(self):
+        if self._coordinator is not None:
             if _LOGGER.isEnabledFor(logging.DEBUG):
                 _LOGGER.debug(f"{self.url_ws} received: {gen_log_list(self._obis_values)}")
+            self._notify_coordinator()
+
+    def _notify_coordinator(self):
+        if self._coordinator is not None:
             self._coordinator.async_set_updated_data({
                 DATA_KEY: self._obis_values,
                 METRICS_KEY: self._metrics_data
             })
-            self._ws_LAST_NEW_DATA_NOTIFY = time.time()
 
-    async def ws_close(self, ws):
-        """Close the WebSocket connection cleanly."""
+    def ws_update_route(self):
+        """Must be called, when the 'node_device_id' has been changed while attached to the shared connection."""
+        if self._ws_hub is not None:
+            self._ws_hub.reroute(self)
+
+    async def ws_close(self):
+        """Detach from the shared WebSocket connection - it will be closed, when this has been the last node."""
         _LOGGER.debug(f"ws_close(): called")
-        self.ws_connected = False
-        if ws is not None:
+        if self._ws_hub is not None:
             try:
-                await ws.close()
-                _LOGGER.debug(f"ws_close(): connection closed successfully")
+                await self._ws_hub.detach(self)
             except BaseException as e:
                 _LOGGER.info(f"ws_close(): Error closing WebSocket connection: {type(e).__name__} - {e}")
-            finally:
-                ws = None
-                self.ws_obj = None
         else:
-            _LOGGER.debug(f"ws_close(): No active WebSocket connection to close (ws is None)")
+            _LOGGER.debug(f"ws_close(): No active WebSocket connection to close (hub is None)")
 
         # we want to trigger the "ws-connection-state" update...
         if self._coordinator is not None:
@@ -719,14 +1589,12 @@ class TibberLocalBridge:
     async def ws_close_and_prepare_to_terminate(self):
         try:
             # a possibly scheduled coordinator update is not required any longer
-            if self._ws_debounced_update_task is not None and not self._ws_debounced_update_task.done():
-                self._ws_debounced_update_task.cancel()
-            self._ws_debounced_update_task = None
+            self._ws_notifier.cancel()
 
-            if self.ws_obj is not None:
-                await self.ws_close(self.ws_obj)
+            if self.ws_connected:
+                await self.ws_close()
                 await asyncio.sleep(4)
-                if not self.ws_connected and self.ws_obj is None:
+                if not self.ws_connected:
                     _LOGGER.debug(f"ws_close_and_prepare_to_terminate(): completed! -- ALL iS FINE --")
                 else:
                     _LOGGER.debug(f"ws_close_and_prepare_to_terminate(): completed, but ws_connected: {self.ws_connected} | ws_obj: {self.ws_obj}")
@@ -736,14 +1604,14 @@ class TibberLocalBridge:
                 #self.websession.detach()
                 #_LOGGER.debug(f"ws_close_and_prepare_to_terminate(): websession is detached!")
 
-        except UnboundLocalError as is_unbound:
-            _LOGGER.debug(f"ws_close_and_prepare_to_terminate(): skipping (since ws is unbound) {type(is_unbound).__name__} - {is_unbound}")
         except BaseException as e:
             _LOGGER.error(f"ws_close_and_prepare_to_terminate(): Error: {type(e).__name__} - {e}")
 
     def ws_check_last_update(self) -> bool:
-        if self._ws_LAST_UPDATE + 50 > time.time():
-            _LOGGER.debug(f"ws_check_last_update(): all good! [last update: {int(time.time()-self._ws_LAST_UPDATE)} sec ago]")
+        # any message on the shared connection proves, that the connection is alive
+        last_update = max(self._ws_LAST_UPDATE, self._ws_hub.last_update if self._ws_hub is not None else 0)
+        if last_update + 50 > time.time():
+            _LOGGER.debug(f"ws_check_last_update(): all good! [last update: {int(time.time()-last_update)} sec ago]")
             return True
         else:
             _LOGGER.info(f"ws_check_last_update(): force reconnect...")
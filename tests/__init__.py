@@ -0,0 +1 @@
+"""Tests for the Tibber Pulse local integration."""
@@ -0,0 +1 @@
+"""Micro-benchmarks - run them with 'python -m tests.benchmarks.<name>' from the repository root."""
@@ -0,0 +1,100 @@
+"""A state write cycle of 50 OBIS sensors: the values precomputed in the MeterSnapshot vs the previous dict of
+SmlListEntry objects, that has been scaled (and divided for the '_in_k' sensors) on every read."""
+import math
+import time
+from numbers import Number
+
+from homeassistant.const import EntityCategory
+from smllib import SmlStreamReader
+
+from custom_components.tibber_local.bridge_metrics import METRICS_FIELDS
+from custom_components.tibber_local.const import DATA_KEY, METRICS_KEY, MODE_3_SML_1_04, OBIS_ALIASES, SENSOR_TYPES
+from custom_components.tibber_local.sensor_accessors import SENSOR_ACCESSORS
+from custom_components.tibber_local.tibber_client import TibberLocalBridge
+
+from tests.common import load_fixture_bytes
+
+ENTITY_COUNT = 50
+ROUNDS = 2000
+
+
+def dict_based_value(obis_values: dict, key, divisor: int = 1):
+    # the previous '_get_numeric_value_internal()' of the coordinator
+    if isinstance(key, list):
+        val = None
+        for a_key in key:
+            if val is None:
+                val = dict_based_value(obis_values, a_key, divisor)
+        return val
+
+    if key in obis_values:
+        a_obis_obj = obis_values.get(key)
+        if isinstance(a_obis_obj.value, Number):
+            if hasattr(a_obis_obj, 'scaler'):
+                try:
+                    return a_obis_obj.value * 10 ** int(a_obis_obj.scaler) / divisor
+                except (TypeError, ValueError):
+                    return None
+            else:
+                return a_obis_obj.value / divisor
+    return None
+
+
+def dict_based_reader(key: str):
+    if key.endswith("_in_k"):
+        return lambda obis_values: dict_based_value(obis_values, key[:-5], 1000)
+    elif key in OBIS_ALIASES:
+        codes = [key] + OBIS_ALIASES[key]
+        return lambda obis_values: dict_based_value(obis_values, codes)
+    return lambda obis_values: dict_based_value(obis_values, key)
+
+
+def best_cycle_time(a_cycle) -> float:
+    best = None
+    for _ in range(9):
+        start_time = time.perf_counter()
+        for _ in range(ROUNDS):
+            a_cycle()
+        duration = (time.perf_counter() - start_time) / ROUNDS
+        best = duration if best is None else min(best, duration)
+    return best
+
+
+def main():
+    payload = load_fixture_bytes("sml_frame.bin")
+    bridge = TibberLocalBridge("127.0.0.1", "pwd", None, com_mode=MODE_3_SML_1_04)
+    bridge.mode_03_read_sml_stream(payload)
+    snapshot_data = {DATA_KEY: bridge._obis_values, METRICS_KEY: None}
+
+    stream = SmlStreamReader()
+    stream.add(payload)
+    dict_values = {str(an_entry.obis): an_entry for an_entry in stream.get_frame().get_obis()}
+
+    # the sensors of the fixture meter first - and the rest of the OBIS sensors (without a value) till we have 50
+    keys = [a_desc.key for a_desc in SENSOR_TYPES if a_desc.key not in METRICS_FIELDS and a_desc.entity_category != EntityCategory.DIAGNOSTIC]
+    present = [a_key for a_key in keys if SENSOR_ACCESSORS[a_key](snapshot_data) is not None]
+    keys = ((present + [a_key for a_key in keys if a_key not in present]) * 2)[:ENTITY_COUNT]
+
+    accessors = [SENSOR_ACCESSORS[a_key] for a_key in keys]
+    readers = [dict_based_reader(a_key) for a_key in keys]
+    for a_key, an_accessor, a_reader in zip(keys, accessors, readers):
+        new_value, old_value = an_accessor(snapshot_data), a_reader(dict_values)
+        assert (new_value is None and old_value is None) or math.isclose(new_value, old_value), (a_key, new_value, old_value)
+
+    def snapshot_cycle():
+        for an_accessor in accessors:
+            an_accessor(snapshot_data)
+
+    def dict_cycle():
+        for a_reader in readers:
+            a_reader(dict_values)
+
+    snapshot_time = best_cycle_time(snapshot_cycle)
+    dict_time = best_cycle_time(dict_cycle)
+    print(f"{len(present)} sensors with a value, {len(keys)} entities per state write cycle")
+    print(f"dict of SmlListEntry: {dict_time * 1e6:8.1f} us/cycle")
+    print(f"MeterSnapshot:        {snapshot_time * 1e6:8.1f} us/cycle ({dict_time / snapshot_time:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
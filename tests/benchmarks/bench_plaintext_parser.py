@@ -0,0 +1,37 @@
+"""Parse time of the plaintext/IEC 62056-21 telegram fixtures (mode 99)."""
+import asyncio
+import time
+
+from custom_components.tibber_local.const import MODE_99_PLAINTEXT
+from custom_components.tibber_local.tibber_client import TibberLocalBridge
+
+from tests.common import load_fixture_text
+from tests.test_plaintext_parser import PLAINTEXT_FIXTURES
+
+ROUNDS = 2000
+
+
+async def bench(plaintext: str) -> float:
+    bridge = TibberLocalBridge("127.0.0.1", "pwd", None, com_mode=MODE_99_PLAINTEXT)
+    bridge.ignore_parse_errors = True
+    best = None
+    for _ in range(5):
+        start_time = time.perf_counter()
+        for _ in range(ROUNDS):
+            # otherwise the unchanged telegram would be skipped as duplicate
+            bridge._last_payload = None
+            await bridge.mode_99_read_plaintext(plaintext, False)
+        duration = (time.perf_counter() - start_time) / ROUNDS
+        best = duration if best is None else min(best, duration)
+    return best
+
+
+def main():
+    for filename in PLAINTEXT_FIXTURES:
+        plaintext = load_fixture_text(filename)
+        duration = asyncio.run(bench(plaintext))
+        print(f"{filename:30s} {len(plaintext.splitlines()):3d} lines {duration * 1e6:8.1f} us/telegram")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""Parse time of the SML fixtures: the zero-copy OBIS scanner vs 'SmlFrame.get_obis()' & 'SmlFrame.parse_frame()'."""
+import time
+
+from smllib import SmlStreamReader
+
+from custom_components.tibber_local.meter_snapshot import MeterSnapshot, MeterSnapshotIndex
+from custom_components.tibber_local.sml_scanner import scan_obis_entries
+
+from tests.common import load_fixture_bytes
+from tests.test_sml_scanner import SML_FIXTURES
+
+ROUNDS = 5000
+
+
+def best_time(a_func) -> float:
+    best = None
+    for _ in range(5):
+        start_time = time.perf_counter()
+        for _ in range(ROUNDS):
+            a_func()
+        duration = (time.perf_counter() - start_time) / ROUNDS
+        best = duration if best is None else min(best, duration)
+    return best
+
+
+def main():
+    for filename in SML_FIXTURES:
+        stream = SmlStreamReader()
+        stream.add(load_fixture_bytes(filename))
+        sml_frame = stream.get_frame()
+        snapshot = MeterSnapshot(MeterSnapshotIndex())
+
+        def scanner():
+            snapshot.clear()
+            scan_obis_entries(sml_frame.bytes, snapshot)
+
+        scanner_time = best_time(scanner)
+        print(f"{filename} ({len(sml_frame.bytes)} bytes)")
+        print(f"  scanner      {scanner_time * 1e6:8.1f} us/frame")
+        for name, a_func in (("get_obis", sml_frame.get_obis), ("parse_frame", sml_frame.parse_frame)):
+            a_time = best_time(a_func)
+            print(f"  {name:12s} {a_time * 1e6:8.1f} us/frame ({a_time / scanner_time:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
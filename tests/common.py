@@ -0,0 +1,81 @@
+"""Helpers for the tests (and benchmarks) of the Tibber Pulse local integration."""
+import asyncio
+import json
+import selectors
+import tempfile
+from pathlib import Path
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+
+def load_fixture_text(filename: str) -> str:
+    # the telegrams must keep their '\r\n' line endings
+    with open(FIXTURES_DIR / filename, encoding="ascii", newline="") as a_file:
+        return a_file.read()
+
+
+def load_fixture_bytes(filename: str) -> bytes:
+    return (FIXTURES_DIR / filename).read_bytes()
+
+
+def load_fixture_json(filename: str):
+    return json.loads(load_fixture_text(filename))
+
+
+class _VirtualClockSelector(selectors.DefaultSelector):
+    def __init__(self):
+        super().__init__()
+        self.loop: "VirtualClockEventLoop | None" = None
+
+    def select(self, timeout=None):
+        events = super().select(0 if timeout is not None else None)
+        if len(events) == 0 and timeout is not None and timeout > 0:
+            # instead of waiting, the clock jumps to the next scheduled callback
+            self.loop.virtual_time = self.loop.virtual_time + timeout
+        return events
+
+
+class VirtualClockEventLoop(asyncio.SelectorEventLoop):
+    """An event loop that does not wait for its timers - so the tests can use the real intervals & deadlines."""
+
+    def __init__(self):
+        self.virtual_time = 0.0
+        selector = _VirtualClockSelector()
+        super().__init__(selector)
+        selector.loop = self
+
+    def time(self) -> float:
+        return self.virtual_time
+
+
+def run_with_virtual_clock(coro):
+    loop = VirtualClockEventLoop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+class FakeMonotonicClock:
+    """Replaces the 'time' module of the integration - so the publish intervals can be stepped by the tests."""
+
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+async def async_create_coordinator(options: dict | None = None):
+    # a real coordinator (with a real HomeAssistant instance) - stop it with 'await coordinator.hass.async_stop(force=True)'
+    from homeassistant.config_entries import ConfigEntry
+    from homeassistant.const import CONF_HOST, CONF_PASSWORD
+    from homeassistant.core import HomeAssistant
+
+    from custom_components.tibber_local import TibberLocalDataUpdateCoordinator
+    from custom_components.tibber_local.const import DOMAIN
+
+    hass = HomeAssistant(tempfile.mkdtemp())
+    entry = ConfigEntry(version=2, minor_version=1, domain=DOMAIN, title="test",
+                        data={CONF_HOST: "127.0.0.1", CONF_PASSWORD: "pwd"}, source="user", options=options or {})
+    return TibberLocalDataUpdateCoordinator(hass, entry)
@@ -0,0 +1,108 @@
+"""The parsers must not create new ObisCode objects per message (they use the interned ones) - and parsing the
+same message again and again must not leave any allocations behind."""
+import asyncio
+import tracemalloc
+from pathlib import Path
+
+import pytest
+from smllib.const import UNITS
+from smllib.sml import ObisCode
+
+from custom_components.tibber_local.const import MODE_3_SML_1_04, MODE_10_ImpressionsAmbient, MODE_99_PLAINTEXT
+from custom_components.tibber_local.obis_codes import find_unit_int_from_string, intern_obis_code
+from custom_components.tibber_local.tibber_client import (
+    PARSE_STRATEGY_SCANNER,
+    TibberLocalBridge,
+    TibberLocalParseStrategySelector,
+)
+
+from tests.common import load_fixture_bytes, load_fixture_text
+
+PACKAGE_DIR = str(Path(__file__).parent.parent / "custom_components" / "tibber_local")
+IMPRESSIONS_AMBIENT_DATA = {"$type": "imp_data", "kw": 0.3644, "kwh": 0.004}
+
+MODES = [
+    (MODE_3_SML_1_04, "sml_frame.bin"),
+    (MODE_10_ImpressionsAmbient, None),
+    (MODE_99_PLAINTEXT, "plaintext_ebz.txt"),
+    (MODE_99_PLAINTEXT, "iec_62056_21_no_prefix.txt"),
+]
+
+
+def create_reader(mode: int, fixture: str | None):
+    bridge = TibberLocalBridge("127.0.0.1", "pwd", None, com_mode=mode)
+    bridge.ignore_parse_errors = True
+    if mode == MODE_3_SML_1_04:
+        payload = load_fixture_bytes(fixture)
+        # the smllib strategies (that are probed from time to time) build their own object tree
+        bridge._parse_strategy_selector = TibberLocalParseStrategySelector([PARSE_STRATEGY_SCANNER])
+
+        def read():
+            # otherwise the unchanged payload would be skipped as duplicate
+            bridge._last_payload = None
+            bridge.mode_03_read_sml_stream(payload)
+
+    elif mode == MODE_10_ImpressionsAmbient:
+        def read():
+            bridge._last_payload = None
+            asyncio.run(bridge.mode_10_read_json_impressions_ambient(IMPRESSIONS_AMBIENT_DATA, False))
+
+    else:
+        payload = load_fixture_text(fixture)
+
+        def read():
+            bridge._last_payload = None
+            asyncio.run(bridge.mode_99_read_plaintext(payload, False))
+
+    read()
+    assert len(bridge._obis_values) > 0
+    return read
+
+
+def count_package_blocks(a_snapshot: tracemalloc.Snapshot) -> int:
+    return sum(a_stat.count for a_stat in a_snapshot.statistics("filename") if a_stat.traceback[0].filename.startswith(PACKAGE_DIR))
+
+
+def test_unit_map_matches_smllib_units():
+    for a_unit_name in set(UNITS.values()):
+        # same result as the previous linear scan over 'UNITS' (the first unit int wins)
+        assert find_unit_int_from_string(a_unit_name) == next(an_int for an_int, a_name in UNITS.items() if a_name == a_unit_name)
+    assert find_unit_int_from_string("kWh") is None
+
+
+def test_obis_codes_are_interned():
+    obis = intern_obis_code("0100010800ff")
+    assert intern_obis_code((1, 0, 1, 8, 0, 255)) is obis
+    assert intern_obis_code("0100010800FF") is obis
+
+
+@pytest.mark.parametrize("mode, fixture", MODES)
+def test_no_obis_code_created_per_message(monkeypatch, mode, fixture):
+    read = create_reader(mode, fixture)
+    created = []
+
+    def counting_new(cls, *args):
+        created.append(args)
+        return str.__new__(cls, *args)
+
+    monkeypatch.setattr(ObisCode, "__new__", counting_new)
+    for _ in range(20):
+        read()
+    assert created == []
+
+
+@pytest.mark.parametrize("mode, fixture", MODES)
+def test_allocations_stay_flat(mode, fixture):
+    read = create_reader(mode, fixture)
+    tracemalloc.start()
+    try:
+        for _ in range(50):
+            read()
+        before = count_package_blocks(tracemalloc.take_snapshot())
+        for _ in range(500):
+            read()
+        after = count_package_blocks(tracemalloc.take_snapshot())
+    finally:
+        tracemalloc.stop()
+    # a leak of a single object per message would be 500 blocks
+    assert after - before < 20
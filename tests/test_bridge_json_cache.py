@@ -0,0 +1,108 @@
+"""The 'nodes.json' & 'node_params.json' of a bridge are fetched once for all config entries (and cached)."""
+import asyncio
+import gc
+
+import pytest
+
+import custom_components.tibber_local.tibber_client as tibber_client
+from custom_components.tibber_local.tibber_client import BRIDGE_JSON_CACHE_TTL, get_bridge_json_cached
+
+
+class FakeResponse:
+    def __init__(self, session):
+        self._session = session
+        self.status = 200
+
+    async def __aenter__(self):
+        self._session.request_count = self._session.request_count + 1
+        await self._session.release.wait()
+        if self._session.error is not None:
+            raise self._session.error
+        return self
+
+    async def __aexit__(self, *args):
+        return False
+
+    def raise_for_status(self):
+        pass
+
+    async def json(self):
+        return [{"node_id": 1, "eui": "aaaa"}]
+
+
+class FakeWebSession:
+    def __init__(self, error: Exception | None = None):
+        self.request_count = 0
+        self.error = error
+        self.release = asyncio.Event()
+
+    def get(self, url, **kwargs):
+        return FakeResponse(self)
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    tibber_client._BRIDGE_JSON_CACHE.clear()
+    yield
+    tibber_client._BRIDGE_JSON_CACHE.clear()
+
+
+def test_concurrent_callers_share_one_request():
+    async def run():
+        session = FakeWebSession()
+        callers = [asyncio.create_task(get_bridge_json_cached(session, "http://bridge/nodes.json", None)) for _ in range(3)]
+        await asyncio.sleep(0)
+        session.release.set()
+        results = await asyncio.gather(*callers)
+        assert session.request_count == 1
+        assert results[0] == results[1] == results[2] == [{"node_id": 1, "eui": "aaaa"}]
+
+        # and a later caller gets the cached response
+        await get_bridge_json_cached(session, "http://bridge/nodes.json", None)
+        assert session.request_count == 1
+
+    asyncio.run(run())
+
+
+def test_expired_response_is_fetched_again():
+    async def run():
+        session = FakeWebSession()
+        session.release.set()
+        await get_bridge_json_cached(session, "http://bridge/nodes.json", None)
+        key = ("http://bridge/nodes.json", None)
+        cached_time, cached_json = tibber_client._BRIDGE_JSON_CACHE[key]
+
+        tibber_client._BRIDGE_JSON_CACHE[key] = (cached_time - BRIDGE_JSON_CACHE_TTL + 1, cached_json)
+        await get_bridge_json_cached(session, "http://bridge/nodes.json", None)
+        assert session.request_count == 1
+
+        tibber_client._BRIDGE_JSON_CACHE[key] = (cached_time - BRIDGE_JSON_CACHE_TTL - 1, cached_json)
+        await get_bridge_json_cached(session, "http://bridge/nodes.json", None)
+        assert session.request_count == 2
+
+    asyncio.run(run())
+
+
+def test_failed_request_of_cancelled_callers_is_retrieved():
+    unhandled = []
+
+    async def run():
+        asyncio.get_running_loop().set_exception_handler(lambda a_loop, context: unhandled.append(context))
+        session = FakeWebSession(error=ValueError("bridge not reachable"))
+        callers = [asyncio.create_task(get_bridge_json_cached(session, "http://bridge/node_params.json", None)) for _ in range(2)]
+        await asyncio.sleep(0)
+        for a_caller in callers:
+            a_caller.cancel()
+        await asyncio.gather(*callers, return_exceptions=True)
+
+        session.release.set()
+        for _ in range(3):
+            await asyncio.sleep(0)
+        assert len(tibber_client._BRIDGE_JSON_REQUESTS) == 0
+        gc.collect()
+
+        # failed requests are not cached
+        assert ("http://bridge/node_params.json", None) not in tibber_client._BRIDGE_JSON_CACHE
+
+    asyncio.run(run())
+    assert unhandled == []
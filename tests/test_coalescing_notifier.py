@@ -0,0 +1,89 @@
+"""The coalescing notifier calls the callback at most once per interval - at the leading and/or the trailing edge."""
+import asyncio
+
+from custom_components.tibber_local.tibber_client import TibberLocalCoalescingNotifier
+
+from tests.common import run_with_virtual_clock
+
+
+def create_notifier(interval: float, leading: bool, trailing: bool) -> tuple[TibberLocalCoalescingNotifier, list]:
+    calls = []
+    notifier = TibberLocalCoalescingNotifier(lambda: calls.append(asyncio.get_running_loop().time()),
+                                             interval=interval, leading=leading, trailing=trailing)
+    return notifier, calls
+
+
+async def async_notify_at(notifier: TibberLocalCoalescingNotifier, times: list[float]):
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    for a_time in times:
+        await asyncio.sleep(start + a_time - loop.time())
+        notifier.notify()
+
+
+def test_leading_edge_only():
+    async def run():
+        notifier, calls = create_notifier(1.0, leading=True, trailing=False)
+        start = asyncio.get_running_loop().time()
+        await async_notify_at(notifier, [0.0, 0.2, 0.5, 1.1, 1.5, 3.0])
+        await asyncio.sleep(5)
+        assert [round(a_time - start, 6) for a_time in calls] == [0.0, 1.1, 3.0]
+        assert notifier.coalesced_count == 3
+
+    run_with_virtual_clock(run())
+
+
+def test_trailing_edge_only():
+    async def run():
+        notifier, calls = create_notifier(1.0, leading=False, trailing=True)
+        start = asyncio.get_running_loop().time()
+        await async_notify_at(notifier, [0.0, 0.2, 0.5, 1.1, 1.5, 3.0])
+        await asyncio.sleep(5)
+        # every call is delayed by the interval - the notifications in between are delivered with it
+        assert [round(a_time - start, 6) for a_time in calls] == [1.0, 2.1, 4.0]
+        assert notifier.coalesced_count == 3
+
+    run_with_virtual_clock(run())
+
+
+def test_leading_and_trailing_edge():
+    async def run():
+        notifier, calls = create_notifier(1.0, leading=True, trailing=True)
+        start = asyncio.get_running_loop().time()
+        await async_notify_at(notifier, [0.0, 0.2, 0.5, 2.5, 4.0, 4.1])
+        await asyncio.sleep(5)
+        # 0.2 & 0.5 are coalesced into the trailing call at 1.0 - the quiet notification at 2.5 is delivered at once
+        assert [round(a_time - start, 6) for a_time in calls] == [0.0, 1.0, 2.5, 4.0, 5.0]
+        assert notifier.notify_count == 6
+        assert notifier.call_count == 5
+        assert notifier.coalesced_count == 1
+
+    run_with_virtual_clock(run())
+
+
+def test_at_most_one_call_per_interval():
+    async def run():
+        notifier, calls = create_notifier(0.5, leading=True, trailing=True)
+        await async_notify_at(notifier, [a_step * 0.01 for a_step in range(1000)])
+        await asyncio.sleep(1)
+        assert all(b - a >= 0.5 - 1e-9 for a, b in zip(calls, calls[1:]))
+        assert len(calls) == 21
+        assert notifier.coalesced_count == notifier.notify_count - notifier.call_count
+
+    run_with_virtual_clock(run())
+
+
+def test_cancel_drops_the_pending_call():
+    async def run():
+        notifier, calls = create_notifier(1.0, leading=True, trailing=True)
+        await async_notify_at(notifier, [0.0, 0.5])
+        notifier.cancel()
+        await asyncio.sleep(5)
+        assert len(calls) == 1
+
+    run_with_virtual_clock(run())
+
+
+def test_without_any_edge_the_trailing_edge_is_used():
+    notifier, _ = create_notifier(1.0, leading=False, trailing=False)
+    assert notifier.trailing
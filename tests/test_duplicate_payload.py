@@ -0,0 +1,55 @@
+"""A payload that is identical to the last processed one (same mode & same raw bytes) is neither parsed nor published
+again - but it is counted."""
+import asyncio
+
+from custom_components.tibber_local.const import MODE_3_SML_1_04, MODE_99_PLAINTEXT
+from custom_components.tibber_local.tibber_client import TibberLocalBridge
+
+from tests.common import load_fixture_bytes, load_fixture_text
+
+
+def test_repeated_plaintext_payload_is_skipped():
+    async def run():
+        bridge = TibberLocalBridge("127.0.0.1", "pwd", None, com_mode=MODE_99_PLAINTEXT)
+        telegram = load_fixture_text("plaintext_ebz.txt")
+        assert await bridge.mode_99_read_plaintext(telegram, False)
+        snapshot = bridge._obis_values
+
+        assert not await bridge.mode_99_read_plaintext(telegram, False)
+        assert not await bridge.mode_99_read_plaintext(telegram, False)
+        assert bridge._duplicate_payload_counter == 2
+        assert bridge._obis_values is snapshot
+
+        assert await bridge.mode_99_read_plaintext(telegram.replace("(000254.19*W)", "(000300.00*W)"), False)
+        assert bridge._obis_values is not snapshot
+        assert bridge._duplicate_payload_counter == 2
+
+    asyncio.run(run())
+
+
+def test_repeated_sml_frame_is_skipped():
+    bridge = TibberLocalBridge("127.0.0.1", "pwd", None, com_mode=MODE_3_SML_1_04)
+    payload = load_fixture_bytes("sml_frame.bin")
+    assert bridge.mode_03_read_sml_stream(payload)
+    assert not bridge.mode_03_read_sml_stream(payload)
+    assert bridge._duplicate_payload_counter == 1
+
+
+def test_same_bytes_in_another_mode_are_no_duplicate():
+    async def run():
+        bridge = TibberLocalBridge("127.0.0.1", "pwd", None, com_mode=MODE_99_PLAINTEXT)
+        telegram = load_fixture_text("plaintext_ebz.txt")
+        assert await bridge.mode_99_read_plaintext(telegram, False)
+        assert bridge._is_duplicate_payload(MODE_99_PLAINTEXT, telegram)
+        assert not bridge._is_duplicate_payload(MODE_3_SML_1_04, telegram)
+        assert bridge._duplicate_payload_counter == 1
+
+    asyncio.run(run())
+
+
+def test_nothing_is_a_duplicate_without_data():
+    bridge = TibberLocalBridge("127.0.0.1", "pwd", None, com_mode=MODE_99_PLAINTEXT)
+    telegram = load_fixture_text("plaintext_ebz.txt")
+    bridge._last_payload = (MODE_99_PLAINTEXT, telegram)
+    assert not bridge._is_duplicate_payload(MODE_99_PLAINTEXT, telegram)
+    assert bridge._duplicate_payload_counter == 0
@@ -0,0 +1,121 @@
+"""The sensors are registered with their key as context - only the listeners of the keys whose value has changed are
+called, and the metrics sensors are skipped as long as the metrics object is the same."""
+import asyncio
+
+from custom_components.tibber_local.bridge_metrics import BridgeMetrics
+from custom_components.tibber_local.const import DATA_KEY, METRICS_KEY
+
+from tests.common import async_create_coordinator, load_fixture_text
+
+KEY_POWER = "0100100700ff"
+KEY_VOLTAGE_L1 = "0100200700ff"
+KEY_BATTERY = "node_battery_voltage"
+KEY_RSSI = "node_avg_rssi"
+
+
+def build_telegram(power: str = "000254.19", voltage: str = "232.4") -> str:
+    telegram = load_fixture_text("plaintext_ebz.txt")
+    return telegram.replace("(000254.19*W)", f"({power}*W)").replace("(232.4*V)", f"({voltage}*V)")
+
+
+async def async_publish(coordinator, telegram: str, metrics: BridgeMetrics | None):
+    await coordinator.bridge.mode_99_read_plaintext(telegram, False)
+    coordinator.async_set_updated_data({DATA_KEY: coordinator.bridge._obis_values, METRICS_KEY: metrics})
+
+
+def add_listeners(coordinator, keys) -> list:
+    calls = []
+    for a_key in keys:
+        coordinator.async_add_listener(lambda a_key=a_key: calls.append(a_key), a_key)
+    return calls
+
+
+def test_only_the_listeners_of_changed_keys_are_called():
+    async def run():
+        coordinator = await async_create_coordinator()
+        try:
+            calls = add_listeners(coordinator, [KEY_POWER, KEY_VOLTAGE_L1])
+            await async_publish(coordinator, build_telegram(), None)
+            assert sorted(calls) == [KEY_POWER, KEY_VOLTAGE_L1]
+
+            calls.clear()
+            await async_publish(coordinator, build_telegram(power="000300.00"), None)
+            assert calls == [KEY_POWER]
+
+            calls.clear()
+            await async_publish(coordinator, build_telegram(power="000300.00", voltage="231.0"), None)
+            assert calls == [KEY_VOLTAGE_L1]
+            assert coordinator.get_diagnostics()["skipped_state_writes"] == 2
+        finally:
+            coordinator._async_unsub_refresh()
+            await coordinator.hass.async_stop(force=True)
+
+    asyncio.run(run())
+
+
+def test_listeners_of_one_key_share_the_diff():
+    async def run():
+        coordinator = await async_create_coordinator()
+        try:
+            calls = add_listeners(coordinator, [KEY_POWER, KEY_POWER])
+            await async_publish(coordinator, build_telegram(), None)
+            assert calls == [KEY_POWER, KEY_POWER]
+
+            calls.clear()
+            await async_publish(coordinator, build_telegram(power="000300.00"), None)
+            assert calls == [KEY_POWER, KEY_POWER]
+        finally:
+            coordinator._async_unsub_refresh()
+            await coordinator.hass.async_stop(force=True)
+
+    asyncio.run(run())
+
+
+def test_metrics_listeners_are_skipped_while_the_metrics_object_is_unchanged():
+    async def run():
+        coordinator = await async_create_coordinator()
+        try:
+            calls = add_listeners(coordinator, [KEY_POWER, KEY_BATTERY, KEY_RSSI])
+            metrics = BridgeMetrics(node_battery_voltage=3.1, node_avg_rssi=-70.0)
+            await async_publish(coordinator, build_telegram(), metrics)
+            assert sorted(calls) == sorted([KEY_POWER, KEY_BATTERY, KEY_RSSI])
+
+            # the same metrics object: the metrics sensors are not even compared
+            calls.clear()
+            object.__setattr__(metrics, "node_avg_rssi", -80.0)
+            await async_publish(coordinator, build_telegram(power="000300.00"), metrics)
+            assert calls == [KEY_POWER]
+
+            # a new metrics object: only the changed field is published
+            calls.clear()
+            await async_publish(coordinator, build_telegram(power="000300.00"),
+                                BridgeMetrics(node_battery_voltage=3.1, node_avg_rssi=-75.0))
+            assert calls == [KEY_RSSI]
+        finally:
+            coordinator._async_unsub_refresh()
+            await coordinator.hass.async_stop(force=True)
+
+    asyncio.run(run())
+
+
+def test_all_listeners_are_called_when_the_availability_changes():
+    async def run():
+        coordinator = await async_create_coordinator()
+        try:
+            calls = add_listeners(coordinator, [KEY_POWER, KEY_BATTERY])
+            metrics = BridgeMetrics(node_battery_voltage=3.1)
+            await async_publish(coordinator, build_telegram(), metrics)
+
+            calls.clear()
+            coordinator.last_update_success = False
+            coordinator.async_update_listeners()
+            assert sorted(calls) == [KEY_POWER, KEY_BATTERY]
+
+            calls.clear()
+            coordinator.async_set_updated_data(coordinator.data)
+            assert sorted(calls) == [KEY_POWER, KEY_BATTERY]
+        finally:
+            coordinator._async_unsub_refresh()
+            await coordinator.hass.async_stop(force=True)
+
+    asyncio.run(run())
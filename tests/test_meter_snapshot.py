@@ -0,0 +1,60 @@
+"""The alias winners (which of the OBIS_ALIASES codes provides the value of a power sensor) are resolved against the
+snapshot that is published - not against an older snapshot the coordinator might still hold."""
+from custom_components.tibber_local.meter_snapshot import MeterSnapshot, MeterSnapshotIndex
+from custom_components.tibber_local.obis_codes import intern_obis_code
+
+KEY_POWER = "0100100700ff"
+ALIAS_POS = "0100010700ff"
+ALIAS_ABS = "01000f0700ff"
+
+
+def fill_snapshot(snapshot: MeterSnapshot, entries: dict) -> MeterSnapshot:
+    snapshot.clear()
+    for obis, value in entries.items():
+        snapshot.set_entry(intern_obis_code(obis), value, 27, 0)
+    return snapshot
+
+
+def test_main_code_wins_over_the_aliases():
+    index = MeterSnapshotIndex()
+    snapshot = fill_snapshot(MeterSnapshot(index), {ALIAS_POS: 200, KEY_POWER: 100})
+    index.check_reported_codes(snapshot)
+    assert snapshot.get_aliased_number(KEY_POWER) == 100
+
+
+def test_first_available_alias_wins():
+    index = MeterSnapshotIndex()
+    snapshot = fill_snapshot(MeterSnapshot(index), {ALIAS_ABS: 300, ALIAS_POS: 200})
+    index.check_reported_codes(snapshot)
+    assert snapshot.get_aliased_number(KEY_POWER) == 200
+    assert index.alias_slots[KEY_POWER] == index.slots[ALIAS_POS]
+
+
+def test_winners_are_resolved_against_the_published_snapshot():
+    index = MeterSnapshotIndex()
+    published = fill_snapshot(MeterSnapshot(index), {KEY_POWER: 100})
+    index.check_reported_codes(published)
+    assert published.get_aliased_number(KEY_POWER) == 100
+
+    # the meter reports other codes now - while the coordinator still reads the older snapshot first
+    current = fill_snapshot(MeterSnapshot(index), {ALIAS_ABS: 300})
+    index.check_reported_codes(current)
+    assert published.get_aliased_number(KEY_POWER) is None
+    assert current.get_aliased_number(KEY_POWER) == 300
+
+
+def test_winners_are_kept_while_the_reported_codes_are_unchanged():
+    index = MeterSnapshotIndex()
+    snapshot = fill_snapshot(MeterSnapshot(index), {ALIAS_POS: 200})
+    index.check_reported_codes(snapshot)
+    alias_slots = dict(index.alias_slots)
+
+    fill_snapshot(snapshot, {ALIAS_POS: 250})
+    index.check_reported_codes(snapshot)
+    assert index.alias_slots == alias_slots
+    assert snapshot.get_aliased_number(KEY_POWER) == 250
+
+    fill_snapshot(snapshot, {})
+    index.check_reported_codes(snapshot)
+    assert index.alias_slots[KEY_POWER] is None
+    assert snapshot.get_aliased_number(KEY_POWER) is None
@@ -0,0 +1,83 @@
+"""The selector prefers the cheapest working parse strategy - it falls back after a burst of failures and the periodic
+probe brings the strategy back, once it works again."""
+from custom_components.tibber_local.tibber_client import (
+    PARSE_STRATEGIES,
+    PARSE_STRATEGY_SCANNER,
+    TibberLocalParseStrategySelector,
+)
+
+PARSE_TIMES = {a_strategy: a_time for a_strategy, a_time in zip(PARSE_STRATEGIES, [0.001, 0.005, 0.010])}
+FALLBACK_STRATEGY = PARSE_STRATEGIES[1]
+
+
+def get_preferred(selector: TibberLocalParseStrategySelector) -> str:
+    return selector.as_dict()["preferred_order"][0]
+
+
+def parse_frames(selector: TibberLocalParseStrategySelector, count: int, failing=()) -> list[str]:
+    # like '_process_sml_frame()': the strategies are tried in the selected order till one succeeds
+    tried = []
+    for _ in range(count):
+        for a_strategy in selector.get_order():
+            success = a_strategy not in failing
+            selector.add_result(a_strategy, success, PARSE_TIMES[a_strategy])
+            tried.append(a_strategy)
+            if success:
+                break
+    return tried
+
+
+def test_cheapest_strategy_is_preferred():
+    selector = TibberLocalParseStrategySelector()
+    tried = parse_frames(selector, TibberLocalParseStrategySelector.PROBE_INTERVAL - 1)
+    assert set(tried) == {PARSE_STRATEGY_SCANNER}
+    assert get_preferred(selector) == PARSE_STRATEGY_SCANNER
+
+
+def test_probes_stop_once_the_other_strategies_have_enough_samples():
+    selector = TibberLocalParseStrategySelector()
+    parse_frames(selector, 200)
+    # every other strategy is probed MIN_SAMPLES times - after that they are known to be slower
+    other_strategies = len(PARSE_STRATEGIES) - 1
+    assert selector.as_dict()["probes"] == other_strategies * TibberLocalParseStrategySelector.MIN_SAMPLES
+    assert get_preferred(selector) == PARSE_STRATEGY_SCANNER
+
+
+def test_fallback_after_a_burst_of_failures():
+    selector = TibberLocalParseStrategySelector()
+    parse_frames(selector, TibberLocalParseStrategySelector.WINDOW_SIZE)
+
+    # the scanner is still tried first - till its success rate in the window drops below MIN_SUCCESS_RATE
+    frames = 0
+    while get_preferred(selector) == PARSE_STRATEGY_SCANNER:
+        parse_frames(selector, 1, failing=(PARSE_STRATEGY_SCANNER,))
+        frames = frames + 1
+    assert get_preferred(selector) == FALLBACK_STRATEGY
+    # (one of the frames has been a probe of another strategy)
+    min_failures = int(TibberLocalParseStrategySelector.WINDOW_SIZE * (1 - TibberLocalParseStrategySelector.MIN_SUCCESS_RATE))
+    assert min_failures <= frames <= min_failures + 2
+
+    # after the fallback, the failing scanner is only tried by the probe (at most once per PROBE_INTERVAL)
+    tried = parse_frames(selector, 2 * TibberLocalParseStrategySelector.PROBE_INTERVAL, failing=(PARSE_STRATEGY_SCANNER,))
+    assert 1 <= tried.count(PARSE_STRATEGY_SCANNER) <= 2
+    assert get_preferred(selector) == FALLBACK_STRATEGY
+
+
+def test_recovery_through_the_periodic_probe():
+    selector = TibberLocalParseStrategySelector()
+    parse_frames(selector, TibberLocalParseStrategySelector.WINDOW_SIZE)
+    parse_frames(selector, 2 * TibberLocalParseStrategySelector.WINDOW_SIZE, failing=(PARSE_STRATEGY_SCANNER,))
+    assert get_preferred(selector) == FALLBACK_STRATEGY
+
+    # the scanner works again - every probe adds a success, till half of its window has been successful
+    frames = 0
+    while get_preferred(selector) != PARSE_STRATEGY_SCANNER:
+        parse_frames(selector, 1)
+        frames = frames + 1
+        assert frames <= TibberLocalParseStrategySelector.WINDOW_SIZE * TibberLocalParseStrategySelector.PROBE_INTERVAL
+
+    window = TibberLocalParseStrategySelector.WINDOW_SIZE
+    needed_probes = int(window * TibberLocalParseStrategySelector.MIN_SUCCESS_RATE)
+    assert frames > (needed_probes - 1) * TibberLocalParseStrategySelector.PROBE_INTERVAL
+    tried = parse_frames(selector, TibberLocalParseStrategySelector.PROBE_INTERVAL - 1)
+    assert set(tried) == {PARSE_STRATEGY_SCANNER}
@@ -0,0 +1,44 @@
+"""The single pass plaintext/IEC 62056-21 parser must produce the same OBIS values as the previous regex based
+implementation - 'plaintext_expected.json' has been recorded with that implementation."""
+import asyncio
+
+import pytest
+
+from custom_components.tibber_local.const import MODE_99_PLAINTEXT
+from custom_components.tibber_local.tibber_client import TibberLocalBridge
+
+from tests.common import load_fixture_json, load_fixture_text
+
+PLAINTEXT_FIXTURES = ["plaintext_ebz.txt", "iec_62056_21_esy.txt", "iec_62056_21_no_prefix.txt"]
+
+
+def read_plaintext(plaintext: str) -> dict:
+    bridge = TibberLocalBridge("127.0.0.1", "pwd", None, com_mode=MODE_99_PLAINTEXT)
+    bridge.ignore_parse_errors = True
+    asyncio.run(bridge.mode_99_read_plaintext(plaintext, False))
+    snapshot = bridge._obis_values
+    return {str(a_code): [snapshot.get_value(a_code), snapshot.get_unit(a_code)] for a_code in snapshot.keys()}
+
+
+def expected_values(variant: str) -> dict:
+    # the previous implementation did not scale the plaintext values (the scaler is always 0)
+    return {a_code: [value * 10 ** scaler if scaler else value, unit]
+            for a_code, (value, unit, scaler) in load_fixture_json("plaintext_expected.json")[variant].items()}
+
+
+@pytest.mark.parametrize("filename", PLAINTEXT_FIXTURES)
+def test_parser_output_is_unchanged(filename):
+    assert read_plaintext(load_fixture_text(filename)) == expected_values(filename)
+
+
+@pytest.mark.parametrize("filename", PLAINTEXT_FIXTURES)
+def test_parser_output_is_unchanged_for_single_line_telegrams(filename):
+    # some bridges send the telegram without line breaks
+    plaintext = load_fixture_text(filename).replace("\r\n", " ")
+    assert read_plaintext(plaintext) == expected_values(f"{filename}:single_line")
+
+
+def test_kilo_units_are_converted():
+    values = read_plaintext(load_fixture_text("iec_62056_21_no_prefix.txt"))
+    # '16.7.0(000.123*kW)'
+    assert values["0100100700ff"] == [123.0, 27]
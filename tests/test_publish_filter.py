@@ -0,0 +1,131 @@
+"""The publish filters of the options flow: the abs/rel deadband, the min publish interval and the heartbeat of the
+max publish interval."""
+import asyncio
+
+import pytest
+
+import custom_components.tibber_local as tibber_local
+
+from tests.common import FakeMonotonicClock, async_create_coordinator
+from tests.test_listeners import KEY_POWER, KEY_VOLTAGE_L1, add_listeners, async_publish, build_telegram
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    a_clock = FakeMonotonicClock()
+    monkeypatch.setattr(tibber_local, "time", a_clock)
+    return a_clock
+
+
+def run_with_coordinator(options: dict, test):
+    async def run():
+        coordinator = await async_create_coordinator(options)
+        try:
+            await test(coordinator)
+        finally:
+            coordinator._async_unsub_refresh()
+            await coordinator.hass.async_stop(force=True)
+
+    asyncio.run(run())
+
+
+def test_get_publish_filters():
+    filters = tibber_local.get_publish_filters({"power_deadband_abs": 5, "power_deadband_rel": 10,
+                                                "voltage_max_publish_interval": 60})
+    assert filters[KEY_POWER] == (5.0, 0.1, 0.0, 0.0)
+    assert filters[KEY_VOLTAGE_L1] == (0.0, 0.0, 0.0, 60.0)
+    assert tibber_local.get_publish_filters({"power_deadband_abs": 0}) == {}
+
+
+def test_abs_deadband(clock):
+    async def test(coordinator):
+        calls = add_listeners(coordinator, [KEY_POWER, KEY_VOLTAGE_L1])
+        await async_publish(coordinator, build_telegram(power="000250.00"), None)
+        calls.clear()
+
+        await async_publish(coordinator, build_telegram(power="000254.00", voltage="231.0"), None)
+        assert calls == [KEY_VOLTAGE_L1]
+
+        # the deadband is measured against the last published value - not the last received one
+        await async_publish(coordinator, build_telegram(power="000256.00", voltage="231.0"), None)
+        assert calls == [KEY_VOLTAGE_L1, KEY_POWER]
+        assert coordinator.get_diagnostics()["filtered_state_writes"] == 1
+
+    run_with_coordinator({"power_deadband_abs": 5}, test)
+
+
+def test_rel_deadband(clock):
+    async def test(coordinator):
+        calls = add_listeners(coordinator, [KEY_POWER])
+        await async_publish(coordinator, build_telegram(power="001000.00"), None)
+        calls.clear()
+
+        await async_publish(coordinator, build_telegram(power="001019.00"), None)
+        assert calls == []
+        await async_publish(coordinator, build_telegram(power="000979.00"), None)
+        assert calls == [KEY_POWER]
+
+    run_with_coordinator({"power_deadband_abs": 1, "power_deadband_rel": 2}, test)
+
+
+def test_min_publish_interval(clock):
+    async def test(coordinator):
+        calls = add_listeners(coordinator, [KEY_POWER])
+        await async_publish(coordinator, build_telegram(power="000250.00"), None)
+        calls.clear()
+
+        clock.now = clock.now + 9
+        await async_publish(coordinator, build_telegram(power="000300.00"), None)
+        assert calls == []
+
+        clock.now = clock.now + 1
+        await async_publish(coordinator, build_telegram(power="000310.00"), None)
+        assert calls == [KEY_POWER]
+
+        # the interval starts again with the last publish
+        clock.now = clock.now + 5
+        await async_publish(coordinator, build_telegram(power="000320.00"), None)
+        assert calls == [KEY_POWER]
+        assert coordinator.get_diagnostics()["filtered_state_writes"] == 2
+
+    run_with_coordinator({"power_min_publish_interval": 10}, test)
+
+
+def test_max_publish_interval_heartbeat(clock):
+    async def test(coordinator):
+        calls = add_listeners(coordinator, [KEY_POWER, KEY_VOLTAGE_L1])
+        await async_publish(coordinator, build_telegram(), None)
+        calls.clear()
+
+        clock.now = clock.now + 59
+        coordinator._async_publish_heartbeat()
+        assert calls == []
+
+        # the value is unchanged - but the sensor is written again after the max interval
+        clock.now = clock.now + 1
+        coordinator._async_publish_heartbeat()
+        assert calls == [KEY_POWER]
+
+        clock.now = clock.now + 30
+        coordinator._async_publish_heartbeat()
+        assert calls == [KEY_POWER]
+        assert coordinator.get_diagnostics()["heartbeat_state_writes"] == 1
+
+    run_with_coordinator({"power_max_publish_interval": 60}, test)
+
+
+def test_heartbeat_overrides_the_deadband(clock):
+    async def test(coordinator):
+        calls = add_listeners(coordinator, [KEY_POWER])
+        await async_publish(coordinator, build_telegram(power="000250.00"), None)
+        calls.clear()
+
+        clock.now = clock.now + 30
+        await async_publish(coordinator, build_telegram(power="000251.00"), None)
+        assert calls == []
+
+        clock.now = clock.now + 30
+        await async_publish(coordinator, build_telegram(power="000252.00"), None)
+        assert calls == [KEY_POWER]
+
+    run_with_coordinator({"power_deadband_abs": 5, "power_max_publish_interval": 60}, test)
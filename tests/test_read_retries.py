@@ -0,0 +1,138 @@
+"""The retries of a failed read are bounded by READ_RETRY_DEADLINE (incl. the requests) - and when there is
+already data, they run in the background and notify the coordinator."""
+import asyncio
+import time
+
+import pytest
+
+import custom_components.tibber_local.tibber_client as tibber_client
+from custom_components.tibber_local.const import MODE_3_SML_1_04, MODE_99_PLAINTEXT
+from custom_components.tibber_local.tibber_client import (
+    MAX_RETRY_DELAY,
+    MIN_RETRY_DELAY,
+    READ_RETRY_DEADLINE,
+    TibberLocalBridge,
+)
+
+from tests.common import VirtualClockEventLoop, load_fixture_text, run_with_virtual_clock
+
+
+class FakeConfigEntry:
+    def async_create_background_task(self, hass, target, name):
+        return asyncio.create_task(target, name=name)
+
+
+class FakeCoordinator:
+    def __init__(self):
+        self.hass = None
+        self._config_entry = FakeConfigEntry()
+        self.updates = []
+
+    def async_set_updated_data(self, data):
+        self.updates.append(data)
+
+
+@pytest.fixture
+def loop(monkeypatch):
+    a_loop = VirtualClockEventLoop()
+    # the retries measure their deadline with 'time.monotonic()'
+    monkeypatch.setattr(time, "monotonic", a_loop.time)
+    yield a_loop
+    a_loop.close()
+
+
+def test_first_retry_is_jittered(monkeypatch):
+    delays = []
+
+    def uniform(low, high):
+        delays.append((low, high))
+        return low
+
+    monkeypatch.setattr(tibber_client.random, "uniform", uniform)
+
+    async def run():
+        bridge = TibberLocalBridge("127.0.0.1", "pwd", None, com_mode=MODE_3_SML_1_04)
+
+        async def read_tibber_local(mode, log_payload=False):
+            return False
+
+        bridge.read_tibber_local = read_tibber_local
+        await bridge.read_tibber_local_with_retries(MODE_3_SML_1_04, first_read_done=True)
+
+    run_with_virtual_clock(run())
+    assert delays[0][0] == MIN_RETRY_DELAY and delays[0][1] > MIN_RETRY_DELAY
+    assert all(a_high <= MAX_RETRY_DELAY for _, a_high in delays)
+
+
+def test_retries_end_at_the_deadline_with_hanging_requests(loop):
+    async def run():
+        bridge = TibberLocalBridge("127.0.0.1", "pwd", None, com_mode=MODE_3_SML_1_04)
+
+        async def read_tibber_local(mode, log_payload=False):
+            # a bridge that does not answer (the request timeout is longer than the deadline)
+            await asyncio.sleep(60)
+            return True
+
+        bridge.read_tibber_local = read_tibber_local
+        start_time = loop.time()
+        success = await bridge.read_tibber_local_with_retries(MODE_3_SML_1_04, first_read_done=True)
+        return success, loop.time() - start_time, bridge._read_retry_stats
+
+    success, duration, stats = loop.run_until_complete(run())
+    assert not success
+    assert duration == pytest.approx(READ_RETRY_DEADLINE)
+    assert stats["failed"] == 1 and stats["attempts"] == 1
+
+
+def test_retries_end_at_the_deadline_with_failing_requests(loop):
+    async def run():
+        bridge = TibberLocalBridge("127.0.0.1", "pwd", None, com_mode=MODE_3_SML_1_04)
+        bridge.MAX_READ_RETRIES = 100
+        calls = []
+
+        async def read_tibber_local(mode, log_payload=False):
+            calls.append(loop.time())
+            await asyncio.sleep(1)
+            return False
+
+        bridge.read_tibber_local = read_tibber_local
+        start_time = loop.time()
+        success = await bridge.read_tibber_local_with_retries(MODE_3_SML_1_04, first_read_done=True)
+        return success, loop.time() - start_time, calls
+
+    success, duration, calls = loop.run_until_complete(run())
+    assert not success
+    assert len(calls) > 1
+    assert duration <= READ_RETRY_DEADLINE
+
+
+def test_retries_run_in_the_background_when_there_is_data(loop):
+    async def run():
+        coordinator = FakeCoordinator()
+        bridge = TibberLocalBridge("127.0.0.1", "pwd", None, com_mode=MODE_99_PLAINTEXT, coordinator=coordinator)
+        await bridge.mode_99_read_plaintext(load_fixture_text("plaintext_ebz.txt"), False)
+        results = [False, False, True]
+
+        async def read_tibber_local(mode, log_payload=False):
+            await asyncio.sleep(1)
+            return results.pop(0)
+
+        bridge.read_tibber_local = read_tibber_local
+        bridge.MAX_READ_RETRIES = 5
+        start_time = loop.time()
+        await bridge.update()
+        # the coordinator refresh is not blocked by the retries
+        assert loop.time() - start_time == pytest.approx(1)
+        assert bridge._read_retry_task is not None and not bridge._read_retry_task.done()
+        assert coordinator.updates == []
+
+        # while the retries are running, no other read is started
+        await bridge.update()
+        assert results == [False, True]
+
+        assert await bridge._read_retry_task
+        assert len(coordinator.updates) == 1
+        assert results == []
+        assert loop.time() - start_time <= READ_RETRY_DEADLINE + 1
+
+    loop.run_until_complete(run())
@@ -0,0 +1,259 @@
+"""The HTTP requests to a bridge are queued (FIFO, limited by the options of the entries) - and the polling
+entries of a bridge get evenly spaced slots."""
+import asyncio
+import time
+
+import pytest
+
+import custom_components.tibber_local.tibber_client as tibber_client
+from custom_components.tibber_local.const import DEFAULT_MAX_CONCURRENT_REQUESTS, MODE_3_SML_1_04
+from custom_components.tibber_local.tibber_client import TibberLocalBridge, TibberLocalRequestScheduler, get_request_scheduler
+
+from tests.common import VirtualClockEventLoop, run_with_virtual_clock
+
+
+async def request(scheduler: TibberLocalRequestScheduler, name: str, log: list, duration: float = 1):
+    async with scheduler.slot():
+        log.append(("start", name))
+        await asyncio.sleep(duration)
+        log.append(("end", name))
+
+
+def test_requests_get_their_slot_in_order():
+    async def run():
+        scheduler = TibberLocalRequestScheduler("bridge")
+        log = []
+        requests = []
+        for a_name in "abcd":
+            requests.append(asyncio.create_task(request(scheduler, a_name, log)))
+            await asyncio.sleep(0)
+        await asyncio.gather(*requests)
+        return log, scheduler
+
+    log, scheduler = run_with_virtual_clock(run())
+    assert log == [("start", "a"), ("end", "a"), ("start", "b"), ("end", "b"),
+                   ("start", "c"), ("end", "c"), ("start", "d"), ("end", "d")]
+    assert scheduler.request_count == 4
+    assert scheduler.queued_count == 3
+
+
+def test_cancelled_waiter_does_not_block_the_queue():
+    async def run():
+        scheduler = TibberLocalRequestScheduler("bridge")
+        log = []
+        first = asyncio.create_task(request(scheduler, "a", log))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(request(scheduler, "b", log))
+        third = asyncio.create_task(request(scheduler, "c", log))
+        await asyncio.sleep(0.5)
+        second.cancel()
+        await asyncio.gather(first, second, third, return_exceptions=True)
+        return log, scheduler
+
+    log, scheduler = run_with_virtual_clock(run())
+    assert log == [("start", "a"), ("end", "a"), ("start", "c"), ("end", "c")]
+    assert scheduler._running == 0
+    assert len(scheduler._waiters) == 0
+
+
+def test_cancelled_waiter_that_got_the_slot_releases_it():
+    async def run():
+        scheduler = TibberLocalRequestScheduler("bridge")
+        log = []
+        tasks = {}
+
+        async def first_request():
+            async with scheduler.slot():
+                await asyncio.sleep(1)
+            # the slot has been handed over to 'b' - but 'b' is cancelled before it could run
+            tasks["b"].cancel()
+
+        first = asyncio.create_task(first_request())
+        await asyncio.sleep(0)
+        tasks["b"] = asyncio.create_task(request(scheduler, "b", log))
+        third = asyncio.create_task(request(scheduler, "c", log))
+        await asyncio.gather(first, tasks["b"], third, return_exceptions=True)
+        return log, scheduler
+
+    log, scheduler = run_with_virtual_clock(run())
+    assert log == [("start", "c"), ("end", "c")]
+    assert scheduler._running == 0
+
+
+def test_the_smallest_limit_of_the_entries_wins():
+    async def run():
+        scheduler = TibberLocalRequestScheduler("bridge")
+        assert scheduler.max_concurrent == DEFAULT_MAX_CONCURRENT_REQUESTS
+        scheduler.set_limit("entry_1", 3)
+        assert scheduler.max_concurrent == 3
+        scheduler.set_limit("entry_2", 2)
+        assert scheduler.max_concurrent == 2
+        scheduler.set_limit("entry_1", 4)
+        assert scheduler.max_concurrent == 2
+        scheduler.remove_limit("entry_2")
+        assert scheduler.max_concurrent == 4
+        scheduler.remove_limit("entry_1")
+        assert scheduler.max_concurrent == DEFAULT_MAX_CONCURRENT_REQUESTS
+
+        # with the limit of 2, two requests run at the same time
+        scheduler.set_limit("entry_1", 2)
+        log = []
+        await asyncio.gather(*(request(scheduler, a_name, log) for a_name in "abc"))
+        return log
+
+    log = run_with_virtual_clock(run())
+    assert log[:2] == [("start", "a"), ("start", "b")]
+
+
+def test_raising_the_limit_wakes_up_waiters():
+    async def run():
+        scheduler = TibberLocalRequestScheduler("bridge")
+        log = []
+        requests = [asyncio.create_task(request(scheduler, a_name, log)) for a_name in "ab"]
+        await asyncio.sleep(0.1)
+        assert log == [("start", "a")]
+        scheduler.set_limit("entry_1", 2)
+        await asyncio.sleep(0)
+        assert log == [("start", "a"), ("start", "b")]
+        await asyncio.gather(*requests)
+
+    run_with_virtual_clock(run())
+
+
+def test_a_lookup_does_not_change_the_limit():
+    scheduler = get_request_scheduler("bridge-lookup")
+    try:
+        scheduler.set_limit("entry_1", 3)
+        # e.g. the bridge of the config flow
+        TibberLocalBridge("bridge-lookup", "pwd", object(), com_mode=MODE_3_SML_1_04)
+        assert get_request_scheduler("bridge-lookup") is scheduler
+        assert scheduler.max_concurrent == 3
+    finally:
+        tibber_client._REQUEST_SCHEDULERS.pop("bridge-lookup", None)
+
+
+def test_scheduler_is_dropped_with_the_last_entry():
+    scheduler = get_request_scheduler("bridge-release")
+    scheduler.add_entry("entry_1")
+    scheduler.add_entry("entry_2")
+    scheduler.set_limit("entry_2", 2)
+    scheduler.release("entry_2")
+    assert scheduler.max_concurrent == DEFAULT_MAX_CONCURRENT_REQUESTS
+    assert get_request_scheduler("bridge-release") is scheduler
+    scheduler.release("entry_1")
+    assert "bridge-release" not in tibber_client._REQUEST_SCHEDULERS
+
+
+def test_the_wait_for_the_slot_is_part_of_the_read_timeout(monkeypatch):
+    loop = VirtualClockEventLoop()
+    monkeypatch.setattr(time, "monotonic", loop.time)
+
+    async def run():
+        bridge = TibberLocalBridge("bridge-timeout", "pwd", object(), com_mode=MODE_3_SML_1_04)
+        reads = []
+
+        async def _read_tibber_local(mode, log_payload=False, read_timeout=10.0):
+            reads.append(loop.time())
+            return True
+
+        bridge._read_tibber_local = _read_tibber_local
+        # another entry of the bridge is blocking the slot
+        blocking = asyncio.create_task(request(bridge._request_scheduler, "blocking", [], duration=120))
+        await asyncio.sleep(0)
+        start_time = loop.time()
+        with pytest.raises(asyncio.TimeoutError):
+            await bridge.read_tibber_local(MODE_3_SML_1_04)
+        duration = loop.time() - start_time
+        blocking.cancel()
+        await asyncio.gather(blocking, return_exceptions=True)
+        return reads, duration, bridge._request_scheduler
+
+    try:
+        reads, duration, scheduler = loop.run_until_complete(run())
+    finally:
+        loop.close()
+        tibber_client._REQUEST_SCHEDULERS.pop("bridge-timeout", None)
+    # without any data, the read timeout is 60 sec
+    assert reads == []
+    assert duration == pytest.approx(60)
+    assert len(scheduler._waiters) == 0 and scheduler._running == 0
+
+
+def poll_times(scheduler: TibberLocalRequestScheduler, keys: list[str], until: int, changes: dict | None = None) -> list:
+    # simulates the coordinators - each one asks for the delay to its next slot after each poll
+    loop = asyncio.get_running_loop()
+    next_polls = {a_key: int(loop.time()) + scheduler.get_next_poll_delay(a_key) for a_key in keys}
+    polls = []
+    while len(next_polls) > 0:
+        a_key, a_time = min(next_polls.items(), key=lambda an_item: an_item[1])
+        if a_time > until:
+            break
+        loop.virtual_time = a_time + 0.3
+        polls.append((a_time, a_key))
+        for a_change_time, a_change in list((changes or {}).items()):
+            if a_time >= a_change_time:
+                a_change(next_polls)
+                changes.pop(a_change_time)
+        if a_key in next_polls:
+            next_polls[a_key] = int(loop.time()) + scheduler.get_next_poll_delay(a_key)
+    return polls
+
+
+def test_pollers_get_evenly_spaced_slots():
+    async def run():
+        scheduler = TibberLocalRequestScheduler("bridge")
+        loop = asyncio.get_running_loop()
+        loop.virtual_time = 1000.0
+        for a_key in ("a", "b", "c"):
+            scheduler.register_poller(a_key, 30)
+            loop.virtual_time = loop.virtual_time + 1
+        return poll_times(scheduler, ["a", "b", "c"], until=1200)
+
+    polls = run_with_virtual_clock(run())
+    phases = {a_key: {a_time % 30 for a_time, another_key in polls[3:] if another_key == a_key} for a_key in "abc"}
+    assert phases == {"a": {10}, "b": {20}, "c": {0}}
+    # each poller keeps its interval
+    a_times = [a_time for a_time, a_key in polls if a_key == "a"]
+    assert {b - a for a, b in zip(a_times[1:], a_times[2:])} == {30}
+
+
+def test_slots_are_rebalanced_after_a_poller_has_been_removed():
+    async def run():
+        scheduler = TibberLocalRequestScheduler("bridge")
+        loop = asyncio.get_running_loop()
+        loop.virtual_time = 1000.0
+        for a_key in ("a", "b", "c"):
+            scheduler.register_poller(a_key, 30)
+
+        def remove_b(next_polls):
+            scheduler.remove_poller("b")
+            next_polls.pop("b")
+
+        return poll_times(scheduler, ["a", "b", "c"], until=1400, changes={1200: remove_b})
+
+    polls = run_with_virtual_clock(run())
+    late_polls = [(a_time, a_key) for a_time, a_key in polls if a_time > 1300]
+    assert {a_key for _, a_key in late_polls} == {"a", "c"}
+    distances = {(a_time - another_time) for (another_time, _), (a_time, _) in zip(late_polls, late_polls[1:])}
+    assert distances == {15}
+
+
+def test_pollers_with_other_intervals_have_their_own_slots():
+    async def run():
+        scheduler = TibberLocalRequestScheduler("bridge")
+        loop = asyncio.get_running_loop()
+        loop.virtual_time = 1000.0
+        scheduler.register_poller("a", 30)
+        scheduler.register_poller("b", 30)
+        scheduler.register_poller("slow", 60)
+        assert scheduler.get_next_poll_delay("unknown") == 0
+        polls = poll_times(scheduler, ["a", "b", "slow"], until=1300)
+        scheduler.remove_poller("slow")
+        assert 60 not in scheduler._poll_anchors
+        return polls
+
+    polls = run_with_virtual_clock(run())
+    slow_times = [a_time for a_time, a_key in polls if a_key == "slow"]
+    assert {b - a for a, b in zip(slow_times, slow_times[1:])} == {60}
+    a_b_times = sorted(a_time for a_time, a_key in polls if a_key != "slow")
+    assert {b - a for a, b in zip(a_b_times[1:], a_b_times[2:])} == {15}
@@ -0,0 +1,81 @@
+"""The fast path scanner must extract the same entries as the smllib 'SmlFrame.get_obis()' - but only for the
+known OBIS codes (the others are skipped)."""
+import pytest
+from smllib import SmlStreamReader
+
+from custom_components.tibber_local.const import KNOWN_OBIS_CODES
+from custom_components.tibber_local.meter_snapshot import MeterSnapshot, MeterSnapshotIndex
+from custom_components.tibber_local.sml_scanner import SmlScanError, scan_obis_entries
+
+from tests.common import load_fixture_bytes
+
+# 'sml_frame_unknown_codes.bin' contains entries with unknown codes (one with '770701' in its value)
+SML_FIXTURES = ["sml_frame.bin", "sml_frame_unknown_codes.bin"]
+
+
+class RecordingMeterSnapshot(MeterSnapshot):
+    """Keeps the raw (not scaled) entries the snapshot has been filled with."""
+
+    def __init__(self, index: MeterSnapshotIndex):
+        super().__init__(index)
+        self.entries = {}
+
+    def set_entry(self, obis, value, unit=None, scaler=None, status=None):
+        self.entries[str(obis)] = (value, unit, scaler, status)
+        super().set_entry(obis, value, unit, scaler, status)
+
+
+def snapshot_entries(snapshot: MeterSnapshot) -> list:
+    return [(str(a_code), snapshot.get_value(a_code), snapshot.get_unit(a_code), snapshot.get_status(a_code))
+            for a_code in snapshot.keys()]
+
+
+def read_frame(filename: str):
+    stream = SmlStreamReader()
+    stream.add(load_fixture_bytes(filename))
+    return stream.get_frame()
+
+
+@pytest.mark.parametrize("filename", SML_FIXTURES)
+def test_scanner_matches_get_obis(filename):
+    sml_frame = read_frame(filename)
+    expected = {str(an_entry.obis): (an_entry.value, an_entry.unit, an_entry.scaler, an_entry.status)
+                for an_entry in sml_frame.get_obis() if an_entry.obis in KNOWN_OBIS_CODES}
+    assert len(expected) > 0
+
+    snapshot = RecordingMeterSnapshot(MeterSnapshotIndex())
+    assert scan_obis_entries(sml_frame.bytes, snapshot) == len(expected)
+    assert snapshot.entries == expected
+
+
+@pytest.mark.parametrize("filename", SML_FIXTURES)
+def test_scanner_snapshot_matches_get_obis_snapshot(filename):
+    sml_frame = read_frame(filename)
+    index = MeterSnapshotIndex()
+    expected = MeterSnapshot(index)
+    for an_entry in sml_frame.get_obis():
+        if an_entry.obis in KNOWN_OBIS_CODES:
+            expected.set_entry(an_entry.obis, an_entry.value, an_entry.unit, an_entry.scaler, an_entry.status)
+
+    snapshot = MeterSnapshot(index)
+    scan_obis_entries(sml_frame.bytes, snapshot)
+    assert snapshot_entries(snapshot) == snapshot_entries(expected)
+
+
+def test_scanner_skips_unknown_codes():
+    sml_frame = read_frame("sml_frame_unknown_codes.bin")
+    unknown = [str(an_entry.obis) for an_entry in sml_frame.get_obis() if an_entry.obis not in KNOWN_OBIS_CODES]
+    assert len(unknown) == 3
+    snapshot = MeterSnapshot(MeterSnapshotIndex())
+    scan_obis_entries(sml_frame.bytes, snapshot)
+    for a_code in unknown:
+        assert a_code not in snapshot
+
+
+def test_scanner_raises_on_unexpected_content():
+    frame_bytes = bytearray(read_frame("sml_frame.bin").bytes)
+    # the status of the first entry becomes a list (that is not expected in a SmlListEntry)
+    pos = frame_bytes.find(b'\x77\x07\x01')
+    frame_bytes[pos + 8] = 0x71
+    with pytest.raises(SmlScanError):
+        scan_obis_entries(bytes(frame_bytes), MeterSnapshot(MeterSnapshotIndex()))
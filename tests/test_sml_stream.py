@@ -0,0 +1,129 @@
+"""The SML stream keeps incomplete frames till the rest arrives, resyncs at the next start sequence after a CRC error -
+and when a payload contains more than one valid frame, the newest one wins."""
+import asyncio
+
+import pytest
+
+from custom_components.tibber_local.const import MODE_3_SML_1_04
+from custom_components.tibber_local.tibber_client import TibberLocalBridge, TibberLocalSmlStream
+
+from tests.common import load_fixture_bytes
+
+KEY_POWER = "0100100700ff"
+
+# 'sml_frame.bin' & the first frame of the other fixtures: power -49 W - the last (valid) frame: power 1234 W
+POWER_FIRST_FRAME = -49
+POWER_LAST_FRAME = 1234
+
+
+def split_frames(payload: bytes) -> list[bytes]:
+    stream = TibberLocalSmlStream()
+    stream.add(payload)
+    return [a_frame.msg_ctx for a_frame in stream.get_frames()]
+
+
+class FakeContent:
+    """The 'aiohttp.StreamReader' of a response - delivering the payload in chunks of the given size."""
+
+    def __init__(self, payload: bytes, chunk_size: int):
+        self._payload = payload
+        self._chunk_size = chunk_size
+
+    async def iter_chunked(self, n: int):
+        for pos in range(0, len(self._payload), self._chunk_size):
+            yield self._payload[pos:pos + self._chunk_size]
+
+
+def read_sml(bridge: TibberLocalBridge, payload: bytes, chunk_size: int = 4096) -> bool:
+    return asyncio.run(bridge.mode_03_read_sml(FakeContent(payload, chunk_size), False))
+
+
+def test_frame_split_across_chunks():
+    payload = load_fixture_bytes("sml_frame.bin")
+    for split_pos in range(1, len(payload)):
+        stream = TibberLocalSmlStream()
+        stream.add(payload[:split_pos])
+        assert stream.get_frames() == []
+        stream.add(payload[split_pos:])
+        assert [a_frame.msg_ctx for a_frame in stream.get_frames()] == [payload]
+        assert stream.crc_error_count == 0
+
+
+def test_frame_fed_byte_by_byte():
+    payload = load_fixture_bytes("sml_frames_concatenated.bin")
+    stream = TibberLocalSmlStream()
+    frames = []
+    for a_pos in range(len(payload)):
+        stream.add(payload[a_pos:a_pos + 1])
+        frames.extend(stream.get_frames())
+    assert b"".join(a_frame.msg_ctx for a_frame in frames) == payload
+    assert len(frames) == 2
+
+
+def test_concatenated_frames():
+    frames = split_frames(load_fixture_bytes("sml_frames_concatenated.bin"))
+    assert len(frames) == 2
+    assert frames[0] == load_fixture_bytes("sml_frame.bin")
+
+
+@pytest.mark.parametrize("filename", ["sml_frame_corrupt_then_valid.bin", "sml_frame_truncated_then_valid.bin"])
+def test_resync_after_crc_error(filename):
+    payload = load_fixture_bytes(filename)
+    stream = TibberLocalSmlStream()
+    stream.add(payload)
+    frames = stream.get_frames()
+    assert stream.crc_error_count == 1
+    assert [a_frame.msg_ctx for a_frame in frames] == split_frames(load_fixture_bytes("sml_frames_concatenated.bin"))[1:]
+
+
+def test_resync_after_crc_error_across_chunks():
+    payload = load_fixture_bytes("sml_frame_truncated_then_valid.bin")
+    stream = TibberLocalSmlStream()
+    frames = []
+    for pos in range(0, len(payload), 50):
+        stream.add(payload[pos:pos + 50])
+        frames.extend(stream.get_frames())
+    assert stream.crc_error_count == 1
+    assert len(frames) == 1
+
+
+def test_garbage_is_dropped_up_to_the_next_start_sequence():
+    payload = load_fixture_bytes("sml_frame.bin")
+    stream = TibberLocalSmlStream()
+    stream.add(b"\x00\x1b" * 500)
+    assert stream.get_frames() == []
+    assert len(stream._reader.bytes) < 8
+
+    stream.add(b"\x1b\x1b\x1b" + payload)
+    assert [a_frame.msg_ctx for a_frame in stream.get_frames()] == [payload]
+
+
+def test_newest_valid_frame_wins():
+    bridge = TibberLocalBridge("127.0.0.1", "pwd", None, com_mode=MODE_3_SML_1_04)
+    assert read_sml(bridge, load_fixture_bytes("sml_frames_concatenated.bin"))
+    assert bridge._obis_values.get_number(KEY_POWER) == POWER_LAST_FRAME
+    assert bridge._repaired_payload_counter == 0
+
+
+@pytest.mark.parametrize("filename", ["sml_frame_corrupt_then_valid.bin", "sml_frame_truncated_then_valid.bin"])
+def test_corrupt_payload_is_repaired(filename):
+    bridge = TibberLocalBridge("127.0.0.1", "pwd", None, com_mode=MODE_3_SML_1_04)
+    assert read_sml(bridge, load_fixture_bytes(filename), chunk_size=64)
+    assert bridge._obis_values.get_number(KEY_POWER) == POWER_LAST_FRAME
+    assert bridge._repaired_payload_counter == 1
+
+
+def test_single_frame_split_into_chunks():
+    bridge = TibberLocalBridge("127.0.0.1", "pwd", None, com_mode=MODE_3_SML_1_04)
+    assert read_sml(bridge, load_fixture_bytes("sml_frame.bin"), chunk_size=7)
+    assert bridge._obis_values.get_number(KEY_POWER) == POWER_FIRST_FRAME
+
+
+def test_ws_stream_keeps_incomplete_frames():
+    bridge = TibberLocalBridge("127.0.0.1", "pwd", None, com_mode=MODE_3_SML_1_04)
+    payload = load_fixture_bytes("sml_frames_concatenated.bin")
+    split_pos = len(payload) // 2 + 10
+    assert bridge.mode_03_read_sml_stream(payload[:split_pos])
+    assert bridge._obis_values.get_number(KEY_POWER) == POWER_FIRST_FRAME
+    assert bridge.mode_03_read_sml_stream(payload[split_pos:])
+    assert bridge._obis_values.get_number(KEY_POWER) == POWER_LAST_FRAME
@@ -0,0 +1,211 @@
+"""All nodes of a bridge share one websocket connection - the messages are routed by the device in their header."""
+import asyncio
+
+import aiohttp
+from aiohttp import web
+
+import custom_components.tibber_local.tibber_client as tibber_client
+from custom_components.tibber_local.const import MODE_3_SML_1_04
+from custom_components.tibber_local.tibber_client import TibberLocalBridge
+
+from tests.common import load_fixture_bytes
+
+
+class FakeBridgeServer:
+    """Sends the SML fixture for the devices 'AAAA', 'BBBB' & 'CCCC' (no node attached) every 10ms."""
+
+    def __init__(self):
+        self.connections = 0
+        self.open_connections = 0
+        self.port = None
+        self._runner = None
+
+    async def _handler(self, request):
+        self.connections = self.connections + 1
+        self.open_connections = self.open_connections + 1
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        sml_frame = load_fixture_bytes("sml_frame.bin")
+
+        async def sender():
+            while not ws.closed:
+                for a_device in (b"AAAA", b"BBBB", b"CCCC"):
+                    await ws.send_bytes(b'<device:' + a_device + b' topic:"sml/raw">' + sml_frame)
+                await asyncio.sleep(0.01)
+
+        sender_task = asyncio.create_task(sender())
+        try:
+            async for _ in ws:
+                pass
+        finally:
+            sender_task.cancel()
+            await asyncio.gather(sender_task, return_exceptions=True)
+            self.open_connections = self.open_connections - 1
+        return ws
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_get("/ws", self._handler)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        await self._runner.cleanup()
+
+
+def create_node(server: FakeBridgeServer, session, device_id: str | None) -> TibberLocalBridge:
+    bridge = TibberLocalBridge(f"127.0.0.1:{server.port}", "pwd", session, com_mode=MODE_3_SML_1_04)
+    bridge.ignore_parse_errors = True
+    bridge.node_device_id = device_id
+    bridge.received = 0
+    ws_handle_message = bridge.ws_handle_message
+
+    def counting_ws_handle_message(topic, body, source):
+        bridge.received = bridge.received + 1
+        ws_handle_message(topic, body, source)
+
+    bridge.ws_handle_message = counting_ws_handle_message
+    return bridge
+
+
+async def wait_for(condition, timeout: float = 5):
+    async with asyncio.timeout(timeout):
+        while not condition():
+            await asyncio.sleep(0.01)
+
+
+def run_with_server(test):
+    async def run():
+        server = FakeBridgeServer()
+        await server.start()
+        try:
+            async with aiohttp.ClientSession() as session:
+                async with asyncio.timeout(20):
+                    await test(server, session)
+        finally:
+            await server.stop()
+            tibber_client._WS_HUBS.clear()
+
+    asyncio.run(run())
+
+
+def test_nodes_share_one_connection():
+    async def test(server, session):
+        node_a = create_node(server, session, "aaaa")
+        node_b = create_node(server, session, "bbbb")
+        tasks = [asyncio.create_task(node_a.ws_connect()), asyncio.create_task(node_b.ws_connect())]
+        await wait_for(lambda: node_a.received > 5 and node_b.received > 5)
+
+        hub = node_a._ws_hub
+        assert hub is node_b._ws_hub
+        assert hub.refcount == 2
+        assert server.connections == 1
+        assert node_a.ws_connected and node_b.ws_connected
+        # 'CCCC' has no node
+        assert hub.unrouted_count > 0
+        assert node_a._obis_values.get_number("0100100700ff") is not None
+
+        for a_node in (node_a, node_b):
+            await a_node.ws_close()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    run_with_server(test)
+
+
+def test_detached_node_does_not_close_the_connection_for_the_others():
+    async def test(server, session):
+        node_a = create_node(server, session, "aaaa")
+        node_b = create_node(server, session, "bbbb")
+        task_a = asyncio.create_task(node_a.ws_connect())
+        task_b = asyncio.create_task(node_b.ws_connect())
+        await wait_for(lambda: node_a.received > 0 and node_b.received > 0)
+
+        # the watchdog of the entry cancels its connect task (or the entry is unloaded)
+        task_a.cancel()
+        await asyncio.gather(task_a, return_exceptions=True)
+        hub = node_b._ws_hub
+        assert not hub.is_attached(node_a)
+        assert hub.refcount == 1
+        assert not node_a.ws_connected
+
+        received_a = node_a.received
+        received_b = node_b.received
+        await wait_for(lambda: node_b.received > received_b + 5)
+        assert node_a.received == received_a
+        assert node_b.ws_connected
+        assert server.connections == 1 and server.open_connections == 1
+
+        await node_b.ws_close()
+        await asyncio.gather(task_b, return_exceptions=True)
+
+    run_with_server(test)
+
+
+def test_last_detach_closes_the_connection():
+    async def test(server, session):
+        node_a = create_node(server, session, "aaaa")
+        node_b = create_node(server, session, None)
+        tasks = [asyncio.create_task(node_a.ws_connect()), asyncio.create_task(node_b.ws_connect())]
+        await wait_for(lambda: node_a.received > 0 and node_b.received > 0)
+        # a node without a device gets the messages of all devices
+        assert node_b.received >= node_a.received
+        hub = node_a._ws_hub
+
+        await node_a.ws_close()
+        assert server.open_connections == 1
+        await node_b.ws_close()
+        await asyncio.wait_for(asyncio.gather(*tasks, return_exceptions=True), 5)
+
+        assert hub.refcount == 0
+        assert not hub.connected
+        assert len(tibber_client._WS_HUBS) == 0
+        await wait_for(lambda: server.open_connections == 0)
+
+    run_with_server(test)
+
+
+def test_reconnect_while_the_stale_connection_is_closing():
+    async def test(server, session):
+        node = create_node(server, session, "aaaa")
+        first = asyncio.create_task(node.ws_connect())
+        await wait_for(lambda: node.received > 0)
+        hub = node._ws_hub
+
+        # the watchdog: the connection is stale - the connect task is cancelled and a new one started right away
+        hub.last_update = 0
+        first.cancel()
+        second = asyncio.create_task(node.ws_connect())
+        await asyncio.gather(first, return_exceptions=True)
+
+        await wait_for(lambda: server.connections == 2 and node.ws_connected)
+        received = node.received
+        await wait_for(lambda: node.received > received + 5)
+        assert hub.is_attached(node)
+        assert node._ws_process_task is not None and not node._ws_process_task.done()
+
+        await node.ws_close()
+        await asyncio.gather(second, return_exceptions=True)
+
+    run_with_server(test)
+
+
+def test_reroute_after_the_device_changed():
+    async def test(server, session):
+        node = create_node(server, session, "dddd")
+        task = asyncio.create_task(node.ws_connect())
+        await wait_for(lambda: node.ws_connected)
+        await asyncio.sleep(0.1)
+        assert node.received == 0
+
+        node.node_device_id = "bbbb"
+        node.ws_update_route()
+        await wait_for(lambda: node.received > 0)
+        assert server.connections == 1
+
+        await node.ws_close()
+        await asyncio.gather(task, return_exceptions=True)
+
+    run_with_server(test)
@@ -0,0 +1,94 @@
+"""When the websocket messages arrive faster than they can be parsed, only the latest message is processed - the
+older ones are superseded (and counted)."""
+import asyncio
+
+from custom_components.tibber_local.const import (
+    CONF_NOTIFY_INTERVAL,
+    DATA_KEY,
+    MODE_3_SML_1_04,
+    MODE_99_PLAINTEXT,
+)
+from custom_components.tibber_local.tibber_client import TibberLocalBridge, TibberLocalSmlStream
+
+from tests.common import load_fixture_bytes
+from tests.test_listeners import build_telegram
+from tests.test_sml_stream import KEY_POWER, POWER_FIRST_FRAME, POWER_LAST_FRAME, split_frames
+
+
+class FakeCoordinator:
+    def __init__(self):
+        self.powers = []
+
+    def async_set_updated_data(self, data):
+        self.powers.append(data[DATA_KEY].get_number(KEY_POWER))
+
+
+async def async_start_bridge(com_mode: int) -> tuple[TibberLocalBridge, FakeCoordinator, asyncio.Task]:
+    # like 'ws_connect()' - but without the websocket hub (the messages are passed directly to the bridge)
+    coordinator = FakeCoordinator()
+    bridge = TibberLocalBridge("127.0.0.1", "pwd", None, com_mode=com_mode, options={CONF_NOTIFY_INTERVAL: 0},
+                               coordinator=coordinator)
+    bridge._ws_sml_stream = TibberLocalSmlStream()
+    mailbox_event = asyncio.Event()
+    bridge._ws_mailbox_event = mailbox_event
+    return bridge, coordinator, asyncio.create_task(bridge._ws_process_mailbox(mailbox_event))
+
+
+async def async_let_mailbox_run():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def test_only_the_latest_sml_frame_is_parsed():
+    async def run():
+        bridge, coordinator, process_task = await async_start_bridge(MODE_3_SML_1_04)
+        try:
+            for a_frame in split_frames(load_fixture_bytes("sml_frames_concatenated.bin")):
+                bridge.ws_handle_message("sml/raw", a_frame, "test")
+            await async_let_mailbox_run()
+            assert coordinator.powers == [POWER_LAST_FRAME]
+            assert bridge._ws_superseded_counter == 1
+        finally:
+            process_task.cancel()
+
+    asyncio.run(run())
+
+
+def test_sml_frame_split_over_messages_is_not_lost():
+    async def run():
+        bridge, coordinator, process_task = await async_start_bridge(MODE_3_SML_1_04)
+        try:
+            payload = load_fixture_bytes("sml_frame.bin")
+            bridge.ws_handle_message("sml/raw", payload[:100], "test")
+            await async_let_mailbox_run()
+            assert coordinator.powers == []
+
+            bridge.ws_handle_message("sml/raw", payload[100:], "test")
+            await async_let_mailbox_run()
+            assert coordinator.powers == [POWER_FIRST_FRAME]
+            assert bridge._ws_superseded_counter == 0
+        finally:
+            process_task.cancel()
+
+    asyncio.run(run())
+
+
+def test_only_the_latest_plaintext_message_is_parsed():
+    async def run():
+        bridge, coordinator, process_task = await async_start_bridge(MODE_99_PLAINTEXT)
+        try:
+            for a_power in ["000100.00", "000200.00", "000300.00"]:
+                bridge.ws_handle_message("plain", build_telegram(power=a_power), "test")
+            await async_let_mailbox_run()
+            assert coordinator.powers == [300.0]
+            assert bridge._ws_superseded_counter == 2
+
+            # a message that arrives after the mailbox has been processed will be parsed again
+            bridge.ws_handle_message("plain", build_telegram(power="000400.00"), "test")
+            await async_let_mailbox_run()
+            assert coordinator.powers == [300.0, 400.0]
+            assert bridge._ws_superseded_counter == 2
+        finally:
+            process_task.cancel()
+
+    asyncio.run(run())